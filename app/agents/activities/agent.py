@@ -0,0 +1,24 @@
+from langchain_core.language_models import BaseChatModel
+from langchain_core.tools import BaseTool
+
+from app.agents.base.agent import Assistant, RetryPolicy, SubAgent
+from app.agents.base.tools import CompleteOrEscalate
+from app.agents.activities.prompts import build_activities_prompt
+
+
+def create_activities_agent(
+    llm: BaseChatModel,
+    tools: list[BaseTool],
+    time_granularity: int = 300,
+    retry_policy: RetryPolicy = RetryPolicy(),
+) -> SubAgent:
+    """Excursion sub-agent: trip recommendations and their bookings."""
+    runnable = build_activities_prompt(time_granularity) | llm.bind_tools(
+        tools + [CompleteOrEscalate]
+    )
+    return SubAgent(
+        name="activities",
+        description="Trip Recommendation Assistant",
+        assistant=Assistant(runnable, retry_policy=retry_policy),
+        tools=tools,
+    )
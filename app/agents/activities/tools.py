@@ -1,12 +1,36 @@
 from typing import Callable, Optional
 import sqlite3
 from langchain_core.tools import tool
+from app.agents.base.tools import with_async_db_execution
+from app.services.database.fts import build_match, catalog_search_query
+from app.services.database.pagination import DEFAULT_PAGE_SIZE, empty_page, paginate
+from app.services.database.sqlite_pool import SQLitePool
 from app.utils.logger import get_logger
 
 logger = get_logger(name=__name__)
 
+TRIP_RECOMMENDATION_FIELDS = ["id", "name", "location", "keywords", "details", "booked"]
 
-def create_activities_tools(db_path: str) -> list[Callable]:
+BOOK_EXCURSION_QUERY = "UPDATE trip_recommendations SET booked = 1 WHERE id = ?"
+UPDATE_EXCURSION_QUERY = "UPDATE trip_recommendations SET details = ? WHERE id = ?"
+CANCEL_EXCURSION_QUERY = "UPDATE trip_recommendations SET booked = 0 WHERE id = ?"
+
+# Representative parameters for the excursion tool queries, see
+# `app.agents.flights.tools.QUERY_PLAN_CHECKS`.
+QUERY_PLAN_CHECKS = {
+    "search_trip_recommendations": catalog_search_query(
+        "trip_recommendations",
+        build_match({"location": "Basel"}, {"keywords": "art"}),
+    ),
+    "book_excursion": (BOOK_EXCURSION_QUERY, (1,)),
+    "update_excursion": (UPDATE_EXCURSION_QUERY, ("Guided tour", 1)),
+    "cancel_excursion": (CANCEL_EXCURSION_QUERY, (1,)),
+}
+
+
+def create_activities_tools(
+    pool: SQLitePool, use_async: bool = False
+) -> list[Callable]:
     """Create a tool to manage trip recommendations."""
 
     @tool
@@ -14,7 +38,9 @@ def create_activities_tools(db_path: str) -> list[Callable]:
         location: Optional[str] = None,
         name: Optional[str] = None,
         keywords: Optional[str] = None,
-    ) -> list[dict]:
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> dict | str:
         """
         Search for trip recommendations based on location, name, and keywords.
 
@@ -22,41 +48,34 @@ def create_activities_tools(db_path: str) -> list[Callable]:
             location (Optional[str]): The location of the trip recommendation. Defaults to None.
             name (Optional[str]): The name of the trip recommendation. Defaults to None.
             keywords (Optional[str]): The keywords associated with the trip recommendation. Defaults to None.
+            limit (int): Maximum number of trip recommendations to return, up to 50. Defaults to 10.
+            cursor (Optional[str]): The `next_cursor` of a previous search with the same filters,
+                to fetch the next page. Defaults to None.
 
         Returns:
-            list[dict]: A list of trip recommendation dictionaries matching the search criteria.
+            dict | str: `results` with the matching trip recommendations, the `total` number of matches
+                and `next_cursor` to fetch more, or None when there are no more results.
+                An error message instead when `cursor` is invalid or stale: search
+                again without it.
         """
         try:
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
-
-                query = "SELECT * FROM trip_recommendations WHERE 1=1"
-                params = []
-
-                if location:
-                    query += " AND location LIKE ?"
-                    params.append(f"%{location}%")
-                if name:
-                    query += " AND name LIKE ?"
-                    params.append(f"%{name}%")
-                if keywords:
-                    keyword_list = keywords.split(",")
-                    keyword_conditions = " OR ".join(
-                        ["keywords LIKE ?" for _ in keyword_list]
-                    )
-                    query += f" AND ({keyword_conditions})"
-                    params.extend([f"%{keyword.strip()}%" for keyword in keyword_list])
-
-                cursor.execute(query, params)
-                results = cursor.fetchall()
+            with pool.connection() as conn:
+                query, params = catalog_search_query(
+                    "trip_recommendations",
+                    build_match(
+                        {"location": location, "name": name}, {"keywords": keywords}
+                    ),
+                )
 
-                return [
-                    dict(zip([column[0] for column in cursor.description], row))
-                    for row in results
-                ]
+                return paginate(
+                    conn, query, params, TRIP_RECOMMENDATION_FIELDS, limit, cursor
+                )
         except sqlite3.Error as e:
             logger.error(f"Database error in search_trip_recommendations: {e}")
-            return []
+            return empty_page()
+        except ValueError as e:
+            # A malformed or stale cursor: tell the model to search again
+            return f"Error searching trip recommendations: {e}"
 
     @tool
     def book_excursion(recommendation_id: int) -> str:
@@ -70,11 +89,11 @@ def create_activities_tools(db_path: str) -> list[Callable]:
             str: A message indicating whether the trip recommendation was successfully booked or not.
         """
         try:
-            with sqlite3.connect(db_path) as conn:
+            with pool.connection() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
-                    "UPDATE trip_recommendations SET booked = 1 WHERE id = ?",
+                    BOOK_EXCURSION_QUERY,
                     (recommendation_id,),
                 )
                 conn.commit()
@@ -105,11 +124,11 @@ def create_activities_tools(db_path: str) -> list[Callable]:
             return "Details must be provided for update."
 
         try:
-            with sqlite3.connect(db_path) as conn:
+            with pool.connection() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
-                    "UPDATE trip_recommendations SET details = ? WHERE id = ?",
+                    UPDATE_EXCURSION_QUERY,
                     (details, recommendation_id),
                 )
                 conn.commit()
@@ -136,11 +155,11 @@ def create_activities_tools(db_path: str) -> list[Callable]:
             str: A message indicating whether the trip recommendation was successfully cancelled or not.
         """
         try:
-            with sqlite3.connect(db_path) as conn:
+            with pool.connection() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
-                    "UPDATE trip_recommendations SET booked = 0 WHERE id = ?",
+                    CANCEL_EXCURSION_QUERY,
                     (recommendation_id,),
                 )
                 conn.commit()
@@ -153,9 +172,10 @@ def create_activities_tools(db_path: str) -> list[Callable]:
             logger.error(f"Database error in cancel_excursion: {e}")
             return f"Error cancelling excursion: {str(e)}"
 
-    return [
+    tools = [
         search_trip_recommendations,
         book_excursion,
         update_excursion,
         cancel_excursion,
     ]
+    return with_async_db_execution(tools, pool) if use_async else tools
@@ -1,28 +1,336 @@
+import asyncio
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
 
 
 from app.agents.supervisor.state import TravelerAgentState
+from app.services.vectorstore.response_cache import SemanticResponseCache
 from app.utils.logger import get_logger
 
 logger = get_logger(name=__name__)
 
+FALLBACK_RESPONSE = (
+    "Sorry, I could not generate a response right now. Please try again."
+)
+# Identifier-like tokens of the injected profile: ticket numbers, booking
+# references, flight numbers
+PROFILE_IDENTIFIER_RE = re.compile(r"\b(?=[A-Z0-9]*\d)[A-Z0-9]{5,}\b")
+# Travel dates and fare classes of the injected profile
+PROFILE_DATE_RE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+PROFILE_FARE_RE = re.compile(r"'fare_conditions': '([^']+)'")
+# Questions about the passenger's own booking, answered from their profile
+OWN_BOOKING_RE = re.compile(
+    r"\b(my|our) (\w+ )?(flights?|tickets?|bookings?|reservations?|seats?|fare|trip)\b"
+    r"|\b(mis?|nuestr[oa]s?) (\w+ )?(vuelos?|billetes?|reservas?|asientos?|viajes?)\b",
+    re.IGNORECASE,
+)
+# Characters of each previous message summarized into a cache key
+CONTEXT_CHARS = 200
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Bounded re-prompting of empty model outputs with exponential backoff."""
+
+    max_attempts: int = 3
+    backoff: float = 0.5
+    backoff_factor: float = 2.0
+    max_backoff: float = 4.0
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after the failed `attempt` (1-based)."""
+        return min(
+            self.backoff * self.backoff_factor ** (attempt - 1), self.max_backoff
+        )
+
+
+@dataclass
+class AssistantMetrics:
+    calls: int = 0
+    attempts: int = 0
+    empty_responses: int = 0
+    exhausted: int = 0
+    cache_hits: int = 0
+    total_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+
+    @property
+    def avg_call_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+    @property
+    def cached_token_ratio(self) -> float:
+        """Share of input tokens served from the provider's prompt cache."""
+        return (
+            self.cached_input_tokens / self.input_tokens if self.input_tokens else 0.0
+        )
+
+    def usage(self) -> dict:
+        """Token counts reported by the provider, with the cached share."""
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "cached_token_ratio": round(self.cached_token_ratio, 4),
+        }
+
+
+def total_usage(metrics: dict[str, AssistantMetrics]) -> dict:
+    """
+    Token usage of every assistant of the graph, keyed by name, and their total
+    under `total`.
+    """
+    total = AssistantMetrics()
+    for m in metrics.values():
+        total.input_tokens += m.input_tokens
+        total.output_tokens += m.output_tokens
+        total.cached_input_tokens += m.cached_input_tokens
+    return {
+        **{name: m.usage() for name, m in metrics.items()},
+        "total": total.usage(),
+    }
+
+
+def is_empty_response(result) -> bool:
+    return not result.tool_calls and (
+        not result.content
+        or isinstance(result.content, list)
+        and not result.content[0].get("text")
+    )
+
+
+def current_turn(state: TravelerAgentState) -> tuple[Optional[str], list]:
+    """Return the text of the last user message and the messages after it."""
+    messages = state["messages"]
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], HumanMessage):
+            return messages[i].content, messages[i + 1 :]
+    return None, []
+
+
+def _text(message) -> str:
+    return message.content if isinstance(message.content, str) else ""
+
+
+def cache_key(state: TravelerAgentState) -> Optional[str]:
+    """
+    The user's question, preceded by the previous user message and answer so
+    that follow-ups such as "and for two people?" do not collide.
+    """
+    messages = state["messages"]
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], HumanMessage):
+            break
+    else:
+        return None
+    question = _text(messages[i])
+    if not question:
+        return None
+    context = [
+        m
+        for m in messages[:i]
+        if isinstance(m, HumanMessage)
+        or (isinstance(m, AIMessage) and not m.tool_calls and _text(m))
+    ][-2:]
+    lines = [
+        f"{'user' if isinstance(m, HumanMessage) else 'assistant'}: "
+        f"{_text(m)[:CONTEXT_CHARS]}"
+        for m in context
+    ]
+    return "\n".join(lines + [f"user: {question}"]) if lines else question
+
+
+def mentions_profile(state: TravelerAgentState, answer: str) -> bool:
+    """
+    Whether `answer` quotes an identifier, a travel date or the fare class of
+    the passenger's profile.
+    """
+    profile = state.get("user_info") or ""
+    values = (
+        PROFILE_IDENTIFIER_RE.findall(profile)
+        + PROFILE_DATE_RE.findall(profile)
+        + PROFILE_FARE_RE.findall(profile)
+    )
+    return any(value in answer for value in values)
+
+
+def asks_about_own_booking(question: str) -> bool:
+    """Whether `question` refers to the passenger's own flight or booking."""
+    return bool(OWN_BOOKING_RE.search(question))
+
 
 class Assistant:
-    def __init__(self, runnable: Runnable):
+    """
+    Graph node that calls the model, re-prompting when it returns an empty
+    output. Re-prompts are bounded by `retry_policy`; when they run out the
+    node answers with a fallback message instead of looping.
+
+    With a `response_cache`, the first call of a turn looks the user's question
+    up before calling the model, and final answers are stored only when every
+    tool the turn used is in `cacheable_tools`. Turns that touched any other
+    tool, or no tool at all, may depend on the passenger and are never cached;
+    neither are questions about the passenger's own booking or answers quoting
+    their profile, which is in the prompt of every turn. Keys include the
+    previous exchange (`cache_key`).
+    """
+
+    def __init__(
+        self,
+        runnable: Runnable,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        response_cache: Optional[SemanticResponseCache] = None,
+        cacheable_tools: frozenset[str] = frozenset(),
+    ):
         self.runnable = runnable
+        self.retry_policy = retry_policy
+        self.response_cache = response_cache
+        self.cacheable_tools = cacheable_tools
+        self.metrics = AssistantMetrics()
+        self._lock = threading.Lock()
+
+    def _cache_key(self, state: TravelerAgentState) -> Optional[str]:
+        """The key to look up, only on the first model call of a turn."""
+        if self.response_cache is None:
+            return None
+        _, after = current_turn(state)
+        return cache_key(state) if not after else None
+
+    def _cacheable_answer(self, state: TravelerAgentState, result) -> Optional[tuple]:
+        if self.response_cache is None or result.tool_calls:
+            return None
+        answer = _text(result)
+        _, after = current_turn(state)
+        tools = {m.name for m in after if isinstance(m, ToolMessage)}
+        key = cache_key(state)
+        if not answer or not key or not tools or not tools <= self.cacheable_tools:
+            return None
+        if asks_about_own_booking(key):
+            logger.info("Not caching an answer about the passenger's own booking")
+            return None
+        if mentions_profile(state, answer):
+            logger.info("Not caching an answer that quotes the passenger's profile")
+            return None
+        return key, answer
+
+    def _cache_hit(self, answer: str):
+        with self._lock:
+            self.metrics.cache_hits += 1
+        logger.info("Answered from the response cache")
+        return {"messages": AIMessage(content=answer)}
+
+    @staticmethod
+    def _reprompt(state: TravelerAgentState) -> TravelerAgentState:
+        # If the LLM happens to return an empty response, we will re-prompt it
+        # for an actual response.
+        messages = state["messages"] + [("user", "Respond with a real output.")]
+        return {**state, "messages": messages}
+
+    def _record_usage(self, result) -> None:
+        # Only providers that report `usage_metadata` are accounted for
+        usage = getattr(result, "usage_metadata", None)
+        if not usage:
+            return
+        details = usage.get("input_token_details") or {}
+        input_tokens = usage.get("input_tokens", 0)
+        cached = details.get("cache_read", 0)
+        with self._lock:
+            self.metrics.input_tokens += input_tokens
+            self.metrics.output_tokens += usage.get("output_tokens", 0)
+            self.metrics.cached_input_tokens += cached
+        logger.info(
+            f"Model call used {input_tokens} input tokens ({cached} cached) and "
+            f"{usage.get('output_tokens', 0)} output tokens"
+        )
+
+    def _record(self, attempts: int, empty: int, seconds: float) -> None:
+        with self._lock:
+            self.metrics.calls += 1
+            self.metrics.attempts += attempts
+            self.metrics.empty_responses += empty
+            self.metrics.total_seconds += seconds
+            if empty == attempts:
+                self.metrics.exhausted += 1
+        if empty:
+            logger.warning(f"Assistant re-prompted {empty} times in {seconds:.2f}s")
+
+    def _finish(self, result, attempts: int, empty: int, started: float):
+        self._record(attempts, empty, time.perf_counter() - started)
+        if empty == attempts:
+            logger.error(f"Assistant returned empty output {attempts} times")
+            result = AIMessage(content=FALLBACK_RESPONSE)
+        return {"messages": result}
+
+    def _lookup(self, state: TravelerAgentState) -> Optional[str]:
+        question = self._cache_key(state)
+        if not question:
+            return None
+        try:
+            return self.response_cache.lookup(question)
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+            return None
+
+    async def _alookup(self, state: TravelerAgentState) -> Optional[str]:
+        question = self._cache_key(state)
+        if not question:
+            return None
+        try:
+            return await self.response_cache.alookup(question)
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+            return None
 
     def __call__(self, state: TravelerAgentState):
-        while True:
+        if answer := self._lookup(state):
+            return self._cache_hit(answer)
+
+        started = time.perf_counter()
+        policy = self.retry_policy
+        for attempt in range(1, policy.max_attempts + 1):
             result = self.runnable.invoke(state)
-            # If the LLM happens to return an empty response, we will re-prompt it
-            # for an actual response.
-            if not result.tool_calls and (
-                not result.content
-                or isinstance(result.content, list)
-                and not result.content[0].get("text")
-            ):
-                messages = state["messages"] + [("user", "Respond with a real output.")]
-                state = {**state, "messages": messages}
-            else:
-                break
-        return {"messages": result}
+            self._record_usage(result)
+            if not is_empty_response(result):
+                if entry := self._cacheable_answer(state, result):
+                    self.response_cache.store(*entry)
+                return self._finish(result, attempt, attempt - 1, started)
+            if attempt < policy.max_attempts:
+                time.sleep(policy.delay(attempt))
+                state = self._reprompt(state)
+        return self._finish(result, policy.max_attempts, policy.max_attempts, started)
+
+    async def acall(self, state: TravelerAgentState):
+        if answer := await self._alookup(state):
+            return self._cache_hit(answer)
+
+        started = time.perf_counter()
+        policy = self.retry_policy
+        for attempt in range(1, policy.max_attempts + 1):
+            result = await self.runnable.ainvoke(state)
+            self._record_usage(result)
+            if not is_empty_response(result):
+                if entry := self._cacheable_answer(state, result):
+                    await self.response_cache.astore(*entry)
+                return self._finish(result, attempt, attempt - 1, started)
+            if attempt < policy.max_attempts:
+                await asyncio.sleep(policy.delay(attempt))
+                state = self._reprompt(state)
+        return self._finish(result, policy.max_attempts, policy.max_attempts, started)
+
+
+@dataclass
+class SubAgent:
+    """A domain assistant the supervisor can hand the dialog to."""
+
+    name: str
+    description: str
+    assistant: Assistant
+    tools: list[BaseTool] = field(default_factory=list)
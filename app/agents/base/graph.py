@@ -0,0 +1,112 @@
+from typing import Callable, Optional
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import END
+from langgraph.prebuilt import tools_condition
+
+from app.agents.base.agent import SubAgent
+from app.agents.base.tools import CompleteOrEscalate
+from app.agents.supervisor.state import TravelerAgentState
+from app.utils.nodes_helpers import create_tool_node_with_fallback
+from app.utils.tool_execution import ToolExecutor
+from app.utils.tool_results import ToolResultEncoder
+
+# Every tool call needs an answer; calls dropped by a hand-over get this one
+SKIPPED_CALL = "Not executed: the dialog was handed over to another assistant."
+
+
+def create_entry_node(
+    assistant_name: str, dialog_state: str, routing_tool: str
+) -> Callable:
+    """Node that answers the routing call and pushes `dialog_state`."""
+
+    def entry_node(state: TravelerAgentState) -> dict:
+        messages = []
+        for tool_call in state["messages"][-1].tool_calls:
+            content = SKIPPED_CALL
+            if tool_call["name"] == routing_tool:
+                content = (
+                    f"The assistant is now the {assistant_name}. Reflect on the above conversation"
+                    " between the host assistant and the user. The user's intent is unsatisfied."
+                    f" Use the provided tools to assist the user. Remember, you are {assistant_name},"
+                    " and the booking, update, other other action is not complete until after you"
+                    " have successfully invoked the appropriate tool. If the user changes their mind"
+                    " or needs help for other tasks, call the CompleteOrEscalate function to let the"
+                    " primary host assistant take control. Do not mention who you are - just act as"
+                    " the proxy for the assistant."
+                )
+            messages.append(
+                ToolMessage(
+                    content=content,
+                    tool_call_id=tool_call["id"],
+                    name=tool_call["name"],
+                )
+            )
+        return {"messages": messages, "dialog_state": dialog_state}
+
+    return entry_node
+
+
+def pop_dialog_state(state: TravelerAgentState) -> dict:
+    """Pop the dialog stack and return to the main assistant, without a model call."""
+    messages = []
+    for tool_call in state["messages"][-1].tool_calls:
+        content = SKIPPED_CALL
+        if tool_call["name"] == CompleteOrEscalate.__name__:
+            content = (
+                "Resuming dialog with the host assistant. Please reflect on the past"
+                " conversation and assist the user as needed."
+            )
+        messages.append(
+            ToolMessage(
+                content=content,
+                tool_call_id=tool_call["id"],
+                name=tool_call["name"],
+            )
+        )
+    return {"dialog_state": "pop", "messages": messages}
+
+
+def create_sub_agent_router(name: str) -> Callable:
+    def route(state: TravelerAgentState) -> str:
+        if tools_condition(state) == END:
+            return END
+        tool_calls = state["messages"][-1].tool_calls
+        if any(tc["name"] == CompleteOrEscalate.__name__ for tc in tool_calls):
+            return "leave_skill"
+        return f"{name}_tools"
+
+    return route
+
+
+def add_sub_agent(
+    builder,
+    agent: SubAgent,
+    routing_tool: str,
+    tool_encoder: Optional[ToolResultEncoder] = None,
+    tool_executor: Optional[ToolExecutor] = None,
+) -> None:
+    """
+    Add the `enter_<name>`, `<name>_assistant` and `<name>_tools` nodes of a
+    sub-agent. Escalations go to the shared `leave_skill` node.
+    """
+    name = agent.name
+    builder.add_node(
+        f"enter_{name}", create_entry_node(agent.description, name, routing_tool)
+    )
+    builder.add_node(
+        f"{name}_assistant",
+        RunnableLambda(agent.assistant, afunc=agent.assistant.acall),
+    )
+    builder.add_edge(f"enter_{name}", f"{name}_assistant")
+    builder.add_node(
+        f"{name}_tools",
+        create_tool_node_with_fallback(agent.tools, tool_encoder, tool_executor),
+    )
+    builder.add_edge(f"{name}_tools", f"{name}_assistant")
+    builder.add_conditional_edges(
+        f"{name}_assistant",
+        create_sub_agent_router(name),
+        [f"{name}_tools", "leave_skill", END],
+    )
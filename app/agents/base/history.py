@@ -0,0 +1,150 @@
+from typing import Optional
+
+from langchain_core.messages import (
+    AnyMessage,
+    HumanMessage,
+    RemoveMessage,
+    ToolMessage,
+    get_buffer_string,
+)
+from langchain_core.runnables import Runnable
+
+from app.agents.supervisor.state import TravelerAgentState
+from app.services.llm.embeddings import estimate_tokens
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+TOOL_STUB = "[Output of {name} elided from the history; call the tool again if needed.]"
+
+
+def message_tokens(message: AnyMessage) -> int:
+    """Approximate prompt tokens of a message, tool call arguments included."""
+    content = message.content
+    if isinstance(content, list):
+        content = " ".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+    tokens = estimate_tokens(content)
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += estimate_tokens(str(tool_call.get("args", "")))
+    return tokens
+
+
+def split_turns(messages: list[AnyMessage]) -> list[list[AnyMessage]]:
+    """Group messages into turns, each starting at a user message."""
+    turns: list[list[AnyMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+class HistoryManager:
+    """
+    Graph node that keeps the conversation sent to the model bounded.
+
+    The last `keep_turns` turns stay verbatim. Older tool outputs longer than
+    `stub_chars` are replaced in place by a short stub (same message id, so
+    `add_messages` overwrites them). When the history is still above
+    `max_tokens`, the oldest turns are folded into the rolling `summary` by
+    `summarizer` and removed from the state; without a summarizer they are
+    just dropped. Whole turns are removed so tool calls never lose their results.
+
+    Args:
+        max_tokens (int): Approximate token budget of the messages in the state.
+        keep_turns (int): Number of most recent turns never modified.
+        stub_chars (int): Tool outputs up to this length are kept as they are.
+        summarizer (Optional[Runnable]): Runnable taking `summary` and `messages`
+            and returning a message with the updated summary.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 6000,
+        keep_turns: int = 4,
+        stub_chars: int = 200,
+        summarizer: Optional[Runnable] = None,
+    ):
+        if keep_turns < 1:
+            raise ValueError("keep_turns must be at least 1.")
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.stub_chars = stub_chars
+        self.summarizer = summarizer
+
+    def _plan(self, state: TravelerAgentState) -> tuple[list, list[AnyMessage], int]:
+        """Return the stub updates, the messages to fold and the resulting tokens."""
+        turns = split_turns(state["messages"])
+        old_turns = turns[: -self.keep_turns]
+        recent = [message for turn in turns[-self.keep_turns :] for message in turn]
+
+        updates = []
+        old_turns = [list(turn) for turn in old_turns]
+        for turn in old_turns:
+            for i, message in enumerate(turn):
+                if (
+                    isinstance(message, ToolMessage)
+                    and len(str(message.content)) > self.stub_chars
+                ):
+                    stub = ToolMessage(
+                        content=TOOL_STUB.format(name=message.name or "tool"),
+                        tool_call_id=message.tool_call_id,
+                        name=message.name,
+                        id=message.id,
+                    )
+                    turn[i] = stub
+                    updates.append(stub)
+
+        tokens = sum(message_tokens(message) for message in recent)
+        tokens += sum(message_tokens(m) for turn in old_turns for m in turn)
+
+        folded: list[AnyMessage] = []
+        while old_turns and tokens > self.max_tokens:
+            turn = old_turns.pop(0)
+            tokens -= sum(message_tokens(message) for message in turn)
+            folded.extend(turn)
+        return updates, folded, tokens
+
+    def _update(self, updates: list, folded: list[AnyMessage], summary: Optional[str]):
+        folded_ids = {message.id for message in folded}
+        messages = [message for message in updates if message.id not in folded_ids] + [
+            RemoveMessage(id=message.id) for message in folded
+        ]
+        result = {"messages": messages}
+        if summary is not None:
+            result["summary"] = summary
+        return result
+
+    def _summary_input(self, state: TravelerAgentState, folded: list[AnyMessage]):
+        return {
+            "summary": state.get("summary", "") or "",
+            "messages": get_buffer_string(folded),
+        }
+
+    def __call__(self, state: TravelerAgentState):
+        updates, folded, tokens = self._plan(state)
+        summary = None
+        if folded and self.summarizer is not None:
+            summary = self.summarizer.invoke(self._summary_input(state, folded)).content
+        self._log(updates, folded, tokens)
+        return self._update(updates, folded, summary)
+
+    async def acall(self, state: TravelerAgentState):
+        updates, folded, tokens = self._plan(state)
+        summary = None
+        if folded and self.summarizer is not None:
+            result = await self.summarizer.ainvoke(self._summary_input(state, folded))
+            summary = result.content
+        self._log(updates, folded, tokens)
+        return self._update(updates, folded, summary)
+
+    @staticmethod
+    def _log(updates: list, folded: list[AnyMessage], tokens: int) -> None:
+        if updates or folded:
+            logger.info(
+                f"History trimmed: {len(updates)} tool outputs stubbed, "
+                f"{len(folded)} messages summarized, ~{tokens} tokens kept"
+            )
@@ -1,22 +1,87 @@
-from datetime import datetime
+import functools
+from datetime import datetime, timedelta
 
 from langchain_core.prompts import ChatPromptTemplate
 
-primary_assistant_prompt = ChatPromptTemplate.from_messages(
+# Static instructions: together with the tool schemas they form a prompt prefix
+# that is identical on every call, so provider-side prompt caching can hit.
+PRIMARY_ASSISTANT_INSTRUCTIONS = (
+    "You are a helpful customer support assistant for Swiss Airlines. "
+    " Use the provided tools to search for flights, company policies,"
+    "and other information to assist the user's queries. "
+    " When searching, be persistent."
+    "Expand your query bounds if the first search returns no results. "
+    " If a search comes up empty, expand your search before giving up."
+    "### IMPORTANT: Not respond another questions cannot references to flight,"
+    "cars, hotels, activities, remember you are customer support for Swiss Airlies."
+    " The latest context message describes the current user and time."
+)
+
+# Appended to every sub-agent's instructions: how to hand the dialog back
+ESCALATION_INSTRUCTIONS = (
+    " If you need more information or the customer changes their mind, escalate the task back to the main assistant."
+    " If the user needs help, and none of your tools are appropriate for it, then"
+    ' "CompleteOrEscalate" the dialog to the host assistant. Do not waste the user\'s time.'
+    " Do not make up invalid tools or functions."
+    " Once the task is completed, answer the user and then CompleteOrEscalate on their next unrelated request."
+    " The latest context message describes the current user and time."
+)
+
+# Per-user and per-time context goes after the conversation, so it never
+# invalidates the cached prefix.
+CONTEXT_TEMPLATE = (
+    "Current user:\n<User>\n{user_info}\n</User>"
+    "\nCurrent time: {time}."
+    "\n\nSummary of the earlier conversation:\n<Summary>\n{summary}\n</Summary>"
+)
+
+
+def rounded_now(granularity: int = 300) -> datetime:
+    """Current time truncated to `granularity` seconds."""
+    now = datetime.now().replace(microsecond=0)
+    if granularity <= 1:
+        return now
+    seconds = now.hour * 3600 + now.minute * 60 + now.second
+    return now - timedelta(seconds=seconds % granularity)
+
+
+def build_assistant_prompt(
+    instructions: str, time_granularity: int = 300
+) -> ChatPromptTemplate:
+    """
+    Build an assistant prompt: static system prefix, conversation, then a
+    trailing context message with the user's flights, the rounded time and the
+    history summary.
+    """
+    return ChatPromptTemplate.from_messages(
+        [
+            ("system", instructions),
+            ("placeholder", "{messages}"),
+            ("system", CONTEXT_TEMPLATE),
+        ]
+    ).partial(time=functools.partial(rounded_now, time_granularity), summary="")
+
+
+def build_primary_assistant_prompt(time_granularity: int = 300) -> ChatPromptTemplate:
+    return build_assistant_prompt(PRIMARY_ASSISTANT_INSTRUCTIONS, time_granularity)
+
+
+primary_assistant_prompt = build_primary_assistant_prompt()
+
+summary_prompt = ChatPromptTemplate.from_messages(
     [
         (
             "system",
-            "You are a helpful customer support assistant for Swiss Airlines. "
-            " Use the provided tools to search for flights, company policies,"
-            "and other information to assist the user's queries. "
-            " When searching, be persistent."
-            "Expand your query bounds if the first search returns no results. "
-            " If a search comes up empty, expand your search before giving up."
-            "### IMPORTANT: Not respond another questions cannot references to flight,"
-            "cars, hotels, activities, remember you are customer support for Swiss Airlies."
-            "\n\nCurrent user:\n<User>\n{user_info}\n</User>"
-            "\nCurrent time: {time}.",
+            "You maintain a running summary of a customer support conversation "
+            "for Swiss Airlines. Merge the current summary with the new messages. "
+            "Keep booking references, ticket numbers, flight, hotel, car rental and "
+            "excursion ids, dates and every decision or pending request of the user. "
+            "Leave out greetings and tool output details that were not used. "
+            "Answer only with the updated summary, in at most 200 words.",
+        ),
+        (
+            "human",
+            "Current summary:\n{summary}\n\nNew messages:\n{messages}",
         ),
-        ("placeholder", "{messages}"),
     ]
-).partial(time=datetime.now)
+)
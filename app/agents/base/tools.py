@@ -1,14 +1,66 @@
+import functools
 from typing import Callable
-from langchain_core.tools import tool
+
+from langchain_core.tools import BaseTool, StructuredTool
+from pydantic import BaseModel
+
+from app.services.database.sqlite_pool import SQLitePool
+
+LOOKUP_POLICY_DESCRIPTION = """Consult the company policies to check whether certain options are permitted.
+Use this before making any flight changes performing other 'write' events."""
+
+
+class CompleteOrEscalate(BaseModel):
+    """A tool to mark the current task as completed and/or to escalate control of the dialog to the main assistant,
+    who can re-route the dialog based on the user's needs."""
+
+    cancel: bool = True
+    reason: str
+
+
+def _format_docs(docs: list[dict]) -> str:
+    return "\n\n".join([doc["page_content"] for doc in docs])
 
 
 def create_lookup_policy_tool(retriever) -> list[Callable]:
 
-    @tool
     def lookup_policy(query: str) -> str:
-        """Consult the company policies to check whether certain options are permitted.
-        Use this before making any flight changes performing other 'write' events."""
         docs = retriever.query(query, k=2)
-        return "\n\n".join([doc["page_content"] for doc in docs])
+        return _format_docs(docs)
+
+    async def alookup_policy(query: str) -> str:
+        docs = await retriever.aquery(query, k=2)
+        return _format_docs(docs)
+
+    # The coroutine is used when the graph runs with `ainvoke`, so policy
+    # lookups do not take a thread-pool worker for the embeddings round trip.
+    return [
+        StructuredTool.from_function(
+            func=lookup_policy,
+            coroutine=alookup_policy,
+            name="lookup_policy",
+            description=LOOKUP_POLICY_DESCRIPTION,
+            # Policy answers do not depend on the passenger
+            metadata={"cacheable": True},
+        )
+    ]
+
+
+def with_async_db_execution(tools: list[BaseTool], pool: SQLitePool) -> list[BaseTool]:
+    """
+    Give each database tool a coroutine that runs its sync body on the pool's
+    bounded executor. `ainvoke` then awaits the coroutine instead of pushing the
+    call onto the event loop's default executor; `invoke` keeps the sync path.
+    """
+
+    def make_coroutine(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def run_on_pool(*args, **kwargs):
+            return await pool.run(func, *args, **kwargs)
+
+        return run_on_pool
 
-    return [lookup_policy]
+    return [
+        db_tool.model_copy(update={"coroutine": make_coroutine(db_tool.func)})
+        for db_tool in tools
+    ]
@@ -0,0 +1,24 @@
+from langchain_core.language_models import BaseChatModel
+from langchain_core.tools import BaseTool
+
+from app.agents.base.agent import Assistant, RetryPolicy, SubAgent
+from app.agents.base.tools import CompleteOrEscalate
+from app.agents.cars.prompts import build_cars_prompt
+
+
+def create_cars_agent(
+    llm: BaseChatModel,
+    tools: list[BaseTool],
+    time_granularity: int = 300,
+    retry_policy: RetryPolicy = RetryPolicy(),
+) -> SubAgent:
+    """Car rental sub-agent: searches, books, updates and cancels rentals."""
+    runnable = build_cars_prompt(time_granularity) | llm.bind_tools(
+        tools + [CompleteOrEscalate]
+    )
+    return SubAgent(
+        name="cars",
+        description="Car Rental Assistant",
+        assistant=Assistant(runnable, retry_policy=retry_policy),
+        tools=tools,
+    )
@@ -2,12 +2,64 @@ from datetime import date, datetime
 from typing import Callable, Optional, Union
 import sqlite3
 from langchain_core.tools import tool
+from app.agents.base.tools import with_async_db_execution
+from app.services.database.fts import build_match, catalog_search_query
+from app.services.database.pagination import DEFAULT_PAGE_SIZE, empty_page, paginate
+from app.services.database.sqlite_pool import SQLitePool
 from app.utils.logger import get_logger
 
 logger = get_logger(name=__name__)
 
-
-def create_cars_booking_tools(db_path: str) -> list[Callable]:
+CAR_RENTAL_FIELDS = [
+    "id",
+    "name",
+    "location",
+    "price_tier",
+    "start_date",
+    "end_date",
+    "booked",
+]
+
+BOOK_CAR_RENTAL_QUERY = "UPDATE car_rentals SET booked = 1 WHERE id = ?"
+CANCEL_CAR_RENTAL_QUERY = "UPDATE car_rentals SET booked = 0 WHERE id = ?"
+
+
+def build_update_car_rental_query(
+    rental_id: int,
+    start_date: Optional[Union[datetime, date]] = None,
+    end_date: Optional[Union[datetime, date]] = None,
+) -> tuple[str, list]:
+    updates = []
+    params = []
+
+    if start_date:
+        updates.append("start_date = ?")
+        params.append(start_date)
+    if end_date:
+        updates.append("end_date = ?")
+        params.append(end_date)
+
+    params.append(rental_id)
+    return f"UPDATE car_rentals SET {', '.join(updates)} WHERE id = ?", params
+
+
+# Representative parameters for the car rental tool queries, see
+# `app.agents.flights.tools.QUERY_PLAN_CHECKS`.
+QUERY_PLAN_CHECKS = {
+    "search_car_rentals": catalog_search_query(
+        "car_rentals",
+        build_match({"location": "Basel"}),
+        [("start_date >= ?", "2024-04-08"), ("end_date <= ?", "2024-04-15")],
+    ),
+    "book_car_rental": (BOOK_CAR_RENTAL_QUERY, (1,)),
+    "update_car_rental": build_update_car_rental_query(1, "2024-04-08", "2024-04-15"),
+    "cancel_car_rental": (CANCEL_CAR_RENTAL_QUERY, (1,)),
+}
+
+
+def create_cars_booking_tools(
+    pool: SQLitePool, use_async: bool = False
+) -> list[Callable]:
     """Create a tool to manage car rentals."""
 
     @tool
@@ -17,7 +69,9 @@ def create_cars_booking_tools(db_path: str) -> list[Callable]:
         price_tier: Optional[str] = None,
         start_date: Optional[Union[datetime, date]] = None,
         end_date: Optional[Union[datetime, date]] = None,
-    ) -> list[dict]:
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Union[dict, str]:
         """
         Search for car rentals based on location, name, price tier, start date, and end date.
 
@@ -27,43 +81,39 @@ def create_cars_booking_tools(db_path: str) -> list[Callable]:
             price_tier (Optional[str]): The price tier of the car rental. Defaults to None.
             start_date (Optional[Union[datetime, date]]): The start date of the car rental. Defaults to None.
             end_date (Optional[Union[datetime, date]]): The end date of the car rental. Defaults to None.
+            limit (int): Maximum number of car rentals to return, up to 50. Defaults to 10.
+            cursor (Optional[str]): The `next_cursor` of a previous search with the same filters,
+                to fetch the next page. Defaults to None.
 
         Returns:
-            list[dict]: A list of car rental dictionaries matching the search criteria.
+            Union[dict, str]: `results` with the matching car rentals, the `total` number of matches and
+                `next_cursor` to fetch more, or None when there are no more results.
+                An error message instead when `cursor` is invalid or stale: search
+                again without it.
         """
         try:
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
-
-                query = "SELECT * FROM car_rentals WHERE 1=1"
-                params = []
-
-                if location:
-                    query += " AND location LIKE ?"
-                    params.append(f"%{location}%")
-                if name:
-                    query += " AND name LIKE ?"
-                    params.append(f"%{name}%")
-                if price_tier:
-                    query += " AND price_tier LIKE ?"
-                    params.append(f"%{price_tier}%")
+            with pool.connection() as conn:
+                conditions = []
                 if start_date:
-                    query += " AND start_date >= ?"
-                    params.append(start_date)
+                    conditions.append(("start_date >= ?", start_date))
                 if end_date:
-                    query += " AND end_date <= ?"
-                    params.append(end_date)
-
-                cursor.execute(query, params)
-                results = cursor.fetchall()
+                    conditions.append(("end_date <= ?", end_date))
+
+                query, params = catalog_search_query(
+                    "car_rentals",
+                    build_match(
+                        {"location": location, "name": name, "price_tier": price_tier}
+                    ),
+                    conditions,
+                )
 
-                return [
-                    dict(zip([column[0] for column in cursor.description], row))
-                    for row in results
-                ]
+                return paginate(conn, query, params, CAR_RENTAL_FIELDS, limit, cursor)
         except sqlite3.Error as e:
             logger.error(f"Database error in search_car_rentals: {e}")
-            return []
+            return empty_page()
+        except ValueError as e:
+            # A malformed or stale cursor: tell the model to search again
+            return f"Error searching car rentals: {e}"
 
     @tool
     def book_car_rental(rental_id: int) -> str:
@@ -77,12 +127,10 @@ def create_cars_booking_tools(db_path: str) -> list[Callable]:
             str: A message indicating whether the car rental was successfully booked or not.
         """
         try:
-            with sqlite3.connect(db_path) as conn:
+            with pool.connection() as conn:
                 cursor = conn.cursor()
 
-                cursor.execute(
-                    "UPDATE car_rentals SET booked = 1 WHERE id = ?", (rental_id,)
-                )
+                cursor.execute(BOOK_CAR_RENTAL_QUERY, (rental_id,))
                 conn.commit()
 
                 if cursor.rowcount > 0:
@@ -114,22 +162,12 @@ def create_cars_booking_tools(db_path: str) -> list[Callable]:
             return "At least one date (start_date or end_date) must be provided for update."
 
         try:
-            with sqlite3.connect(db_path) as conn:
+            with pool.connection() as conn:
                 cursor = conn.cursor()
 
-                updates = []
-                params = []
-
-                if start_date:
-                    updates.append("start_date = ?")
-                    params.append(start_date)
-                if end_date:
-                    updates.append("end_date = ?")
-                    params.append(end_date)
-
-                params.append(rental_id)
-
-                query = f"UPDATE car_rentals SET {', '.join(updates)} WHERE id = ?"
+                query, params = build_update_car_rental_query(
+                    rental_id, start_date, end_date
+                )
                 cursor.execute(query, params)
                 conn.commit()
 
@@ -153,12 +191,10 @@ def create_cars_booking_tools(db_path: str) -> list[Callable]:
             str: A message indicating whether the car rental was successfully cancelled or not.
         """
         try:
-            with sqlite3.connect(db_path) as conn:
+            with pool.connection() as conn:
                 cursor = conn.cursor()
 
-                cursor.execute(
-                    "UPDATE car_rentals SET booked = 0 WHERE id = ?", (rental_id,)
-                )
+                cursor.execute(CANCEL_CAR_RENTAL_QUERY, (rental_id,))
                 conn.commit()
 
                 if cursor.rowcount > 0:
@@ -169,9 +205,10 @@ def create_cars_booking_tools(db_path: str) -> list[Callable]:
             logger.error(f"Database error in cancel_car_rental: {e}")
             return f"Error cancelling car rental: {str(e)}"
 
-    return [
+    tools = [
         search_car_rentals,
         book_car_rental,
         update_car_rental,
         cancel_car_rental,
     ]
+    return with_async_db_execution(tools, pool) if use_async else tools
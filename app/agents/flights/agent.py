@@ -0,0 +1,24 @@
+from langchain_core.language_models import BaseChatModel
+from langchain_core.tools import BaseTool
+
+from app.agents.base.agent import Assistant, RetryPolicy, SubAgent
+from app.agents.base.tools import CompleteOrEscalate
+from app.agents.flights.prompts import build_flights_prompt
+
+
+def create_flights_agent(
+    llm: BaseChatModel,
+    tools: list[BaseTool],
+    time_granularity: int = 300,
+    retry_policy: RetryPolicy = RetryPolicy(),
+) -> SubAgent:
+    """Flight sub-agent: changes and cancellations of the passenger's tickets."""
+    runnable = build_flights_prompt(time_granularity) | llm.bind_tools(
+        tools + [CompleteOrEscalate]
+    )
+    return SubAgent(
+        name="flights",
+        description="Flight Updates & Booking Assistant",
+        assistant=Assistant(runnable, retry_policy=retry_policy),
+        tools=tools,
+    )
@@ -0,0 +1,114 @@
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from app.services.database.sqlite_pool import SQLitePool
+from app.utils.cache import CacheStats, LRUTTLCache
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+FETCH_USER_FLIGHTS_QUERY = """
+    select
+        t.ticket_no,
+        t.book_ref,
+        f.flight_id,
+        f.flight_no,
+        f.departure_airport,
+        f.arrival_airport,
+        f.scheduled_departure,
+        f.scheduled_arrival,
+        bp.seat_no,
+        tf.fare_conditions
+    from
+        boarding_passes bp
+    join flights f on
+        (f.flight_id = bp.flight_id )
+    join ticket_flights tf on
+        (tf.flight_id = f.flight_id )
+    join tickets t on
+        (t.ticket_no = tf.ticket_no )
+    where
+        t.passenger_id = ?
+    ;
+"""
+
+
+def fetch_user_flights(pool: SQLitePool, passenger_id: str) -> list[dict]:
+    """Run the ticket/flight/boarding pass join for one passenger."""
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(FETCH_USER_FLIGHTS_QUERY, (passenger_id,))
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def render_user_info(flights: list[dict]) -> str:
+    """Render the flights exactly as the prompt used to receive them."""
+    return str(flights)
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    passenger_id: str
+    flights: list[dict]
+    text: str
+
+
+class UserProfileCache:
+    """
+    Per-passenger cache of the flight profile injected into the prompt on every turn.
+
+    Entries expire after `ttl` seconds and are invalidated explicitly by the tools
+    that modify the passenger's tickets. A load racing with an invalidation is
+    returned to its caller but not stored, so a stale profile is never cached.
+
+    Args:
+        pool (SQLitePool): Pool used to load profiles on a miss.
+        max_size (int): Maximum number of passengers kept in memory.
+        ttl (Optional[float]): Seconds a profile stays valid. `None` disables expiration.
+    """
+
+    def __init__(
+        self, pool: SQLitePool, max_size: int = 1024, ttl: Optional[float] = 300.0
+    ):
+        self._pool = pool
+        self._cache = LRUTTLCache(max_size=max_size, ttl=ttl)
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def get(self, passenger_id: str) -> UserProfile:
+        """Return the cached profile, loading and rendering it on a miss."""
+        profile = self._cache.get(passenger_id)
+        if profile is not None:
+            return profile
+
+        with self._lock:
+            version = self._versions.get(passenger_id, 0)
+
+        flights = fetch_user_flights(self._pool, passenger_id)
+        profile = UserProfile(
+            passenger_id=passenger_id,
+            flights=flights,
+            text=render_user_info(flights),
+        )
+
+        with self._lock:
+            if self._versions.get(passenger_id, 0) == version:
+                self._cache.set(passenger_id, profile)
+        return profile
+
+    def invalidate(self, passenger_id: str) -> None:
+        with self._lock:
+            self._versions[passenger_id] = self._versions.get(passenger_id, 0) + 1
+            self._cache.invalidate(passenger_id)
+        logger.info(f"Invalidated flight profile for passenger_id: {passenger_id}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+            self._cache.clear()
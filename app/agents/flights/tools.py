@@ -4,12 +4,96 @@ from datetime import date, datetime
 from typing import Callable, Optional
 import pytz
 from langchain_core.runnables import RunnableConfig
+from app.agents.base.tools import with_async_db_execution
+from app.agents.flights.profile import (
+    FETCH_USER_FLIGHTS_QUERY,
+    UserProfileCache,
+    fetch_user_flights,
+)
+from app.services.database.pagination import empty_page, paginate
+from app.services.database.sqlite_pool import SQLitePool
 from app.utils.logger import get_logger
 
 logger = get_logger(name=__name__)
 
-
-def create_flight_booking_tools(db_path: str) -> list[Callable]:
+FLIGHT_BY_ID_QUERY = (
+    "SELECT departure_airport, arrival_airport, scheduled_departure "
+    "FROM flights WHERE flight_id = ?"
+)
+TICKET_FLIGHT_QUERY = "SELECT flight_id FROM ticket_flights WHERE ticket_no = ?"
+TICKET_OWNER_QUERY = (
+    "SELECT ticket_no FROM tickets WHERE ticket_no = ? AND passenger_id = ?"
+)
+UPDATE_TICKET_FLIGHT_QUERY = (
+    "UPDATE ticket_flights SET flight_id = ? WHERE ticket_no = ?"
+)
+DELETE_TICKET_FLIGHTS_QUERY = "DELETE FROM ticket_flights WHERE ticket_no = ?"
+
+FLIGHT_FIELDS = [
+    "flight_id",
+    "flight_no",
+    "departure_airport",
+    "arrival_airport",
+    "scheduled_departure",
+    "scheduled_arrival",
+    "status",
+]
+# Flight searches have always returned up to 20 flights by default
+SEARCH_FLIGHTS_PAGE_SIZE = 20
+
+
+def build_search_flights_query(
+    departure_airport: Optional[str] = None,
+    arrival_airport: Optional[str] = None,
+    start_time: Optional[date | datetime] = None,
+    end_time: Optional[date | datetime] = None,
+) -> tuple[str, list]:
+    query = "SELECT * FROM flights WHERE 1 = 1"
+    params = []
+
+    if departure_airport:
+        query += " AND departure_airport = ?"
+        params.append(departure_airport)
+
+    if arrival_airport:
+        query += " AND arrival_airport = ?"
+        params.append(arrival_airport)
+
+    if start_time:
+        query += " AND scheduled_departure >= ?"
+        params.append(start_time)
+
+    if end_time:
+        query += " AND scheduled_departure <= ?"
+        params.append(end_time)
+
+    query += " ORDER BY scheduled_departure, flight_id"
+    return query, params
+
+
+# Representative parameters for every query the tools run on each turn,
+# checked with EXPLAIN QUERY PLAN to make sure none falls back to a table scan.
+QUERY_PLAN_CHECKS = {
+    "fetch_user_flight_information": (FETCH_USER_FLIGHTS_QUERY, ("3442 587242",)),
+    "search_flights": build_search_flights_query(
+        departure_airport="CDG",
+        arrival_airport="BSL",
+        start_time="2024-01-01",
+        end_time="2024-01-08",
+    ),
+    "flight_by_id": (FLIGHT_BY_ID_QUERY, (1,)),
+    "ticket_flight": (TICKET_FLIGHT_QUERY, ("7240005432906569",)),
+    "ticket_owner": (TICKET_OWNER_QUERY, ("7240005432906569", "3442 587242")),
+    "update_ticket_flight": (UPDATE_TICKET_FLIGHT_QUERY, (1, "7240005432906569")),
+    "delete_ticket_flights": (DELETE_TICKET_FLIGHTS_QUERY, ("7240005432906569",)),
+}
+
+
+def create_flight_booking_tools(
+    pool: SQLitePool,
+    use_async: bool = False,
+    profile_cache: Optional[UserProfileCache] = None,
+) -> list[Callable]:
 
     @tool
     def fetch_user_flight_information(config: RunnableConfig) -> list[dict]:
@@ -34,43 +118,15 @@ def create_flight_booking_tools(db_path: str) -> list[Callable]:
             raise ValueError("No passenger ID configured.")
 
         try:
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
-                query = """
-                    select
-                        t.ticket_no,
-                        t.book_ref,
-                        f.flight_id,
-                        f.flight_no,
-                        f.departure_airport,
-                        f.arrival_airport,
-                        f.scheduled_departure,
-                        f.scheduled_arrival,
-                        bp.seat_no,
-                        tf.fare_conditions
-                    from
-                        boarding_passes bp
-                    join flights f on
-                        (f.flight_id = bp.flight_id )
-                    join ticket_flights tf on
-                        (tf.flight_id = f.flight_id )
-                    join tickets t on
-                        (t.ticket_no = tf.ticket_no )
-                    where
-                        t.passenger_id = ?
-                    ;
-                """
-                cursor.execute(query, (passenger_id,))
-                rows = cursor.fetchall()
-                columns = [col[0] for col in cursor.description]
-                results = [dict(zip(columns, row)) for row in rows]
-                # No necesitas cerrar cursor manualmente con 'with' statement
-                logger.info(
-                    f"Found {len(results)} tickets for passenger_id: {passenger_id}"
-                )
-                return results
+            if profile_cache is not None:
+                results = profile_cache.get(passenger_id).flights
+            else:
+                results = fetch_user_flights(pool, passenger_id)
+            logger.info(
+                f"Found {len(results)} tickets for passenger_id: {passenger_id}"
+            )
+            return results
         except sqlite3.Error as e:
-            breakpoint()
             logger.error(f"Database error in fetch_user_flight_information: {e}")
             return []
 
@@ -80,43 +136,32 @@ def create_flight_booking_tools(db_path: str) -> list[Callable]:
         arrival_airport: Optional[str] = None,
         start_time: Optional[date | datetime] = None,
         end_time: Optional[date | datetime] = None,
-        limit: int = 20,
-    ) -> list[dict]:
-        """Search for flights based on departure airport, arrival airport, and departure time range."""
-
-        query = "SELECT * FROM flights WHERE 1 = 1"
-        params = []
-
-        if departure_airport:
-            query += " AND departure_airport = ?"
-            params.append(departure_airport)
-
-        if arrival_airport:
-            query += " AND arrival_airport = ?"
-            params.append(arrival_airport)
-
-        if start_time:
-            query += " AND scheduled_departure >= ?"
-            params.append(start_time)
-
-        if end_time:
-            query += " AND scheduled_departure <= ?"
-            params.append(end_time)
+        limit: int = SEARCH_FLIGHTS_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> dict | str:
+        """Search for flights based on departure airport, arrival airport, and departure time range.
+
+        Returns up to `limit` flights (20 by default, at most 50) in `results`, the `total` number of
+        matches and a `next_cursor`; pass it back with the same filters to get the next page.
+        An invalid or stale `cursor` returns an error message instead: search again without it.
+        """
 
-        query += " LIMIT ?"
-        params.append(limit)
+        query, params = build_search_flights_query(
+            departure_airport=departure_airport,
+            arrival_airport=arrival_airport,
+            start_time=start_time,
+            end_time=end_time,
+        )
 
         try:
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-                column_names = [column[0] for column in cursor.description]
-                results = [dict(zip(column_names, row)) for row in rows]
-                return results
+            with pool.connection() as conn:
+                return paginate(conn, query, params, FLIGHT_FIELDS, limit, cursor)
         except sqlite3.Error as e:
             logger.error(f"Database error in search_flights: {e}")
-            return []
+            return empty_page()
+        except ValueError as e:
+            # A malformed or stale cursor: tell the model to search again
+            return f"Error searching flights: {e}"
 
     @tool
     def update_ticket_to_new_flight(
@@ -129,14 +174,11 @@ def create_flight_booking_tools(db_path: str) -> list[Callable]:
             raise ValueError("No passenger ID configured.")
 
         try:
-            with sqlite3.connect(db_path) as conn:
+            with pool.connection() as conn:
                 cursor = conn.cursor()
 
                 # Check if new flight exists
-                cursor.execute(
-                    "SELECT departure_airport, arrival_airport, scheduled_departure FROM flights WHERE flight_id = ?",
-                    (new_flight_id,),
-                )
+                cursor.execute(FLIGHT_BY_ID_QUERY, (new_flight_id,))
                 new_flight = cursor.fetchone()
                 if not new_flight:
                     return "Invalid new flight ID provided."
@@ -156,31 +198,25 @@ def create_flight_booking_tools(db_path: str) -> list[Callable]:
                             El vuelo seleccionado sale a las {departure_time}."""
 
                 # Check if ticket exists
-                cursor.execute(
-                    "SELECT flight_id FROM ticket_flights WHERE ticket_no = ?",
-                    (ticket_no,),
-                )
+                cursor.execute(TICKET_FLIGHT_QUERY, (ticket_no,))
                 current_flight = cursor.fetchone()
                 if not current_flight:
                     return "No existen tickets para el número de ticket proporcionado."
 
                 # Check if user owns the ticket
-                cursor.execute(
-                    "SELECT * FROM tickets WHERE ticket_no = ? AND passenger_id = ?",
-                    (ticket_no, passenger_id),
-                )
+                cursor.execute(TICKET_OWNER_QUERY, (ticket_no, passenger_id))
                 current_ticket = cursor.fetchone()
                 if not current_ticket:
                     return f"El pasajero con ID {passenger_id} no es el dueño del ticket {ticket_no}"
 
                 # Update the ticket
-                cursor.execute(
-                    "UPDATE ticket_flights SET flight_id = ? WHERE ticket_no = ?",
-                    (new_flight_id, ticket_no),
-                )
+                cursor.execute(UPDATE_TICKET_FLIGHT_QUERY, (new_flight_id, ticket_no))
                 conn.commit()
 
-                return "Ticket actualizado exitosamente al nuevo vuelo."
+            if profile_cache is not None:
+                profile_cache.invalidate(passenger_id)
+
+            return "Ticket actualizado exitosamente al nuevo vuelo."
 
         except sqlite3.Error as e:
             logger.error(f"Database error in update_ticket_to_new_flight: {e}")
@@ -195,42 +231,38 @@ def create_flight_booking_tools(db_path: str) -> list[Callable]:
             raise ValueError("No passenger ID configured.")
 
         try:
-            with sqlite3.connect(db_path) as conn:
+            with pool.connection() as conn:
                 cursor = conn.cursor()
 
                 # Check if ticket exists
-                cursor.execute(
-                    "SELECT flight_id FROM ticket_flights WHERE ticket_no = ?",
-                    (ticket_no,),
-                )
+                cursor.execute(TICKET_FLIGHT_QUERY, (ticket_no,))
                 existing_ticket = cursor.fetchone()
                 if not existing_ticket:
                     return "No existen tickets para el número de ticket proporcionado."
 
                 # Check if user owns the ticket
-                cursor.execute(
-                    "SELECT ticket_no FROM tickets WHERE ticket_no = ? AND passenger_id = ?",
-                    (ticket_no, passenger_id),
-                )
+                cursor.execute(TICKET_OWNER_QUERY, (ticket_no, passenger_id))
                 current_ticket = cursor.fetchone()
                 if not current_ticket:
                     return f"El pasajero con ID {passenger_id} no es dueño del ticket numero {ticket_no}"
 
                 # Delete the ticket
-                cursor.execute(
-                    "DELETE FROM ticket_flights WHERE ticket_no = ?", (ticket_no,)
-                )
+                cursor.execute(DELETE_TICKET_FLIGHTS_QUERY, (ticket_no,))
                 conn.commit()
 
-                return "Ticket successfully cancelled."
+            if profile_cache is not None:
+                profile_cache.invalidate(passenger_id)
+
+            return "Ticket successfully cancelled."
 
         except sqlite3.Error as e:
             logger.error(f"Database error in cancel_ticket: {e}")
             return f"Error cancelling ticket: {str(e)}"
 
-    return [
+    tools = [
         fetch_user_flight_information,
         search_flights,
         update_ticket_to_new_flight,
         cancel_ticket,
     ]
+    return with_async_db_execution(tools, pool) if use_async else tools
@@ -0,0 +1,24 @@
+from langchain_core.language_models import BaseChatModel
+from langchain_core.tools import BaseTool
+
+from app.agents.base.agent import Assistant, RetryPolicy, SubAgent
+from app.agents.base.tools import CompleteOrEscalate
+from app.agents.hotels.prompts import build_hotels_prompt
+
+
+def create_hotels_agent(
+    llm: BaseChatModel,
+    tools: list[BaseTool],
+    time_granularity: int = 300,
+    retry_policy: RetryPolicy = RetryPolicy(),
+) -> SubAgent:
+    """Hotel sub-agent: searches, books, updates and cancels hotels."""
+    runnable = build_hotels_prompt(time_granularity) | llm.bind_tools(
+        tools + [CompleteOrEscalate]
+    )
+    return SubAgent(
+        name="hotels",
+        description="Hotel Booking Assistant",
+        assistant=Assistant(runnable, retry_policy=retry_policy),
+        tools=tools,
+    )
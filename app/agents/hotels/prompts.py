@@ -0,0 +1,13 @@
+from app.agents.base.prompts import ESCALATION_INSTRUCTIONS, build_assistant_prompt
+
+HOTELS_ASSISTANT_INSTRUCTIONS = (
+    "You are a specialized assistant for handling hotel bookings for Swiss Airlines. "
+    "The primary assistant delegates work to you whenever the user needs help booking a hotel. "
+    "Search for available hotels based on the user's preferences and confirm the booking details with the customer. "
+    " When searching, be persistent. "
+    "Expand your query bounds if the first search returns no results."
+) + ESCALATION_INSTRUCTIONS
+
+
+def build_hotels_prompt(time_granularity: int = 300):
+    return build_assistant_prompt(HOTELS_ASSISTANT_INSTRUCTIONS, time_granularity)
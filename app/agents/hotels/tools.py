@@ -4,8 +4,52 @@ from datetime import datetime, date
 
 from langchain.tools import tool
 
+from app.agents.base.tools import with_async_db_execution
+from app.services.database.fts import build_match, catalog_search_query
+from app.services.database.pagination import DEFAULT_PAGE_SIZE, empty_page, paginate
+from app.services.database.sqlite_pool import SQLitePool
+from app.utils.logger import get_logger
 
-def create_hotel_booking_tools(db_path: str) -> list[Callable]:
+logger = get_logger(name=__name__)
+
+HOTEL_FIELDS = ["id", "name", "location", "price_tier", "booked"]
+
+BOOK_HOTEL_QUERY = "UPDATE hotels SET booked = 1 WHERE id = ?"
+CANCEL_HOTEL_QUERY = "UPDATE hotels SET booked = 0 WHERE id = ?"
+
+
+def build_update_hotel_query(
+    hotel_id: int,
+    checkin_date: Optional[Union[datetime, date]] = None,
+    checkout_date: Optional[Union[datetime, date]] = None,
+) -> tuple[str, list]:
+    updates = []
+    params = []
+
+    if checkin_date:
+        updates.append("checkin_date = ?")
+        params.append(checkin_date)
+    if checkout_date:
+        updates.append("checkout_date = ?")
+        params.append(checkout_date)
+
+    params.append(hotel_id)
+    return f"UPDATE hotels SET {', '.join(updates)} WHERE id = ?", params
+
+
+# Representative parameters for the hotel tool queries, see
+# `app.agents.flights.tools.QUERY_PLAN_CHECKS`.
+QUERY_PLAN_CHECKS = {
+    "search_hotels": catalog_search_query("hotels", build_match({"location": "Basel"})),
+    "book_hotel": (BOOK_HOTEL_QUERY, (1,)),
+    "update_hotel": build_update_hotel_query(1, "2024-04-08", "2024-04-10"),
+    "cancel_hotel": (CANCEL_HOTEL_QUERY, (1,)),
+}
+
+
+def create_hotel_booking_tools(
+    pool: SQLitePool, use_async: bool = False
+) -> list[Callable]:
     @tool
     def search_hotels(
         location: Optional[str] = None,
@@ -13,7 +57,9 @@ def create_hotel_booking_tools(db_path: str) -> list[Callable]:
         price_tier: Optional[str] = None,
         checkin_date: Optional[Union[datetime, date]] = None,
         checkout_date: Optional[Union[datetime, date]] = None,
-    ) -> list[dict]:
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Union[dict, str]:
         """
         Search for hotels based on location, name, price tier, check-in date, and check-out date.
 
@@ -23,32 +69,29 @@ def create_hotel_booking_tools(db_path: str) -> list[Callable]:
             price_tier (Optional[str]): The price tier of the hotel. Defaults to None. Examples: Midscale, Upper Midscale, Upscale, Luxury
             checkin_date (Optional[Union[datetime, date]]): The check-in date of the hotel. Defaults to None.
             checkout_date (Optional[Union[datetime, date]]): The check-out date of the hotel. Defaults to None.
+            limit (int): Maximum number of hotels to return, up to 50. Defaults to 10.
+            cursor (Optional[str]): The `next_cursor` of a previous search with the same filters,
+                to fetch the next page. Defaults to None.
 
         Returns:
-            list[dict]: A list of hotel dictionaries matching the search criteria.
+            Union[dict, str]: `results` with the matching hotels, the `total` number of matches and
+                `next_cursor` to fetch more, or None when there are no more results.
+                An error message instead when `cursor` is invalid or stale: search
+                again without it.
         """
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        query = "SELECT * FROM hotels WHERE 1=1"
-        params = []
-
-        if location:
-            query += " AND location LIKE ?"
-            params.append(f"%{location}%")
-        if name:
-            query += " AND name LIKE ?"
-            params.append(f"%{name}%")
-        # For the sake of this tutorial, we will let you match on any dates and price tier.
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-
-        conn.close()
-
-        return [
-            dict(zip([column[0] for column in cursor.description], row))
-            for row in results
-        ]
+        try:
+            with pool.connection() as conn:
+                query, params = catalog_search_query(
+                    "hotels", build_match({"location": location, "name": name})
+                )
+                # For the sake of this tutorial, we will let you match on any dates and price tier.
+                return paginate(conn, query, params, HOTEL_FIELDS, limit, cursor)
+        except sqlite3.Error as e:
+            logger.error(f"Database error in search_hotels: {e}")
+            return empty_page()
+        except ValueError as e:
+            # A malformed or stale cursor: tell the model to search again
+            return f"Error searching hotels: {e}"
 
     @tool
     def book_hotel(hotel_id: int) -> str:
@@ -61,18 +104,20 @@ def create_hotel_booking_tools(db_path: str) -> list[Callable]:
         Returns:
             str: A message indicating whether the hotel was successfully booked or not.
         """
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        try:
+            with pool.connection() as conn:
+                cursor = conn.cursor()
 
-        cursor.execute("UPDATE hotels SET booked = 1 WHERE id = ?", (hotel_id,))
-        conn.commit()
+                cursor.execute(BOOK_HOTEL_QUERY, (hotel_id,))
+                conn.commit()
 
-        if cursor.rowcount > 0:
-            conn.close()
-            return f"Hotel {hotel_id} successfully booked."
-        else:
-            conn.close()
-            return f"No hotel found with ID {hotel_id}."
+                if cursor.rowcount > 0:
+                    return f"Hotel {hotel_id} successfully booked."
+                else:
+                    return f"No hotel found with ID {hotel_id}."
+        except sqlite3.Error as e:
+            logger.error(f"Database error in book_hotel: {e}")
+            return f"Error booking hotel: {str(e)}"
 
     @tool
     def update_hotel(
@@ -91,28 +136,26 @@ def create_hotel_booking_tools(db_path: str) -> list[Callable]:
         Returns:
             str: A message indicating whether the hotel was successfully updated or not.
         """
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        if checkin_date:
-            cursor.execute(
-                "UPDATE hotels SET checkin_date = ? WHERE id = ?",
-                (checkin_date, hotel_id),
-            )
-        if checkout_date:
-            cursor.execute(
-                "UPDATE hotels SET checkout_date = ? WHERE id = ?",
-                (checkout_date, hotel_id),
-            )
-
-        conn.commit()
-
-        if cursor.rowcount > 0:
-            conn.close()
-            return f"Hotel {hotel_id} successfully updated."
-        else:
-            conn.close()
-            return f"No hotel found with ID {hotel_id}."
+        if not checkin_date and not checkout_date:
+            return "At least one date (checkin_date or checkout_date) must be provided for update."
+
+        try:
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+
+                query, params = build_update_hotel_query(
+                    hotel_id, checkin_date, checkout_date
+                )
+                cursor.execute(query, params)
+                conn.commit()
+
+                if cursor.rowcount > 0:
+                    return f"Hotel {hotel_id} successfully updated."
+                else:
+                    return f"No hotel found with ID {hotel_id}."
+        except sqlite3.Error as e:
+            logger.error(f"Database error in update_hotel: {e}")
+            return f"Error updating hotel: {str(e)}"
 
     @tool
     def cancel_hotel(hotel_id: int) -> str:
@@ -125,22 +168,25 @@ def create_hotel_booking_tools(db_path: str) -> list[Callable]:
         Returns:
             str: A message indicating whether the hotel was successfully cancelled or not.
         """
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("UPDATE hotels SET booked = 0 WHERE id = ?", (hotel_id,))
-        conn.commit()
-
-        if cursor.rowcount > 0:
-            conn.close()
-            return f"Hotel {hotel_id} successfully cancelled."
-        else:
-            conn.close()
-            return f"No hotel found with ID {hotel_id}."
-
-    return [
+        try:
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(CANCEL_HOTEL_QUERY, (hotel_id,))
+                conn.commit()
+
+                if cursor.rowcount > 0:
+                    return f"Hotel {hotel_id} successfully cancelled."
+                else:
+                    return f"No hotel found with ID {hotel_id}."
+        except sqlite3.Error as e:
+            logger.error(f"Database error in cancel_hotel: {e}")
+            return f"Error cancelling hotel: {str(e)}"
+
+    tools = [
         search_hotels,
         book_hotel,
         update_hotel,
         cancel_hotel,
     ]
+    return with_async_db_execution(tools, pool) if use_async else tools
@@ -0,0 +1,32 @@
+from typing import Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.tools import BaseTool
+
+from app.agents.base.agent import Assistant, RetryPolicy
+from app.agents.supervisor.prompts import build_supervisor_prompt
+from app.agents.supervisor.tools import routing_tools
+from app.services.vectorstore.response_cache import SemanticResponseCache
+
+
+def create_supervisor_assistant(
+    llm: BaseChatModel,
+    tools: list[BaseTool],
+    time_granularity: int = 300,
+    retry_policy: RetryPolicy = RetryPolicy(),
+    response_cache: Optional[SemanticResponseCache] = None,
+    cacheable_tools: frozenset[str] = frozenset(),
+) -> Assistant:
+    """
+    Host assistant: answers with its read-only `tools` and hands bookings to
+    the sub-agents through the routing tools.
+    """
+    runnable = build_supervisor_prompt(time_granularity) | llm.bind_tools(
+        tools + routing_tools
+    )
+    return Assistant(
+        runnable,
+        retry_policy=retry_policy,
+        response_cache=response_cache,
+        cacheable_tools=cacheable_tools,
+    )
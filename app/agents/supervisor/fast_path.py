@@ -0,0 +1,196 @@
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from app.agents.base.agent import AssistantMetrics
+from app.agents.flights.profile import UserProfileCache
+from app.agents.supervisor.state import TravelerAgentState
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+GREETING, THANKS, FLIGHT_TIME = "greeting", "thanks", "flight_time"
+
+_FILLER = r"[\s,.!¡?¿:)]*"
+INTENT_PATTERNS = {
+    GREETING: re.compile(
+        rf"{_FILLER}(hi|hello|hey|good (morning|afternoon|evening)|hola|buen[oa]s (d[ií]as|tardes|noches))"
+        rf"( there)?{_FILLER}",
+        re.IGNORECASE,
+    ),
+    THANKS: re.compile(
+        rf"{_FILLER}((ok(ay)?|great|perfect|perfecto)[\s,.!]*)?"
+        rf"(thanks?( you)?( so much| a lot)?|thx|ty|gracias|muchas gracias){_FILLER}",
+        re.IGNORECASE,
+    ),
+    # Only "when does my flight leave?": check-in, boarding or baggage times
+    # are policy questions for the model
+    FLIGHT_TIME: re.compile(
+        rf"{_FILLER}((what time|when) (is|does) (my|our) (next )?flight"
+        r"( (leave|depart|take off))?( (today|tomorrow))?"
+        r"|a qu[eé] hora sale (mi|nuestro) (pr[oó]ximo )?vuelo( (hoy|mañana))?)"
+        rf"{_FILLER}",
+        re.IGNORECASE,
+    ),
+}
+# Questions about a flight that ask for more than its schedule go to the model
+ACTION_WORDS = re.compile(
+    r"\b(change|cancel|book|rebook|refund|upgrade|update|delay|status|cambiar|cancelar)",
+    re.IGNORECASE,
+)
+
+GREETING_RESPONSE = (
+    "Hello! I'm the Swiss Airlines customer support assistant. How can I help you "
+    "with your flights, hotels, car rentals or excursions today?"
+)
+THANKS_RESPONSE = "You're welcome! Is there anything else I can help you with?"
+FLIGHT_TIME_RESPONSE = (
+    "Your flight {flight_no} from {departure_airport} to {arrival_airport} is "
+    "scheduled to depart at {departure} and arrive at {arrival}{seat}."
+)
+
+
+def classify(text: str) -> Optional[str]:
+    """Return the intent of `text` if it is one the fast path answers."""
+    text = text.strip()
+    if len(text) > 200:
+        return None
+    for intent in (GREETING, THANKS):
+        if INTENT_PATTERNS[intent].fullmatch(text):
+            return intent
+    if INTENT_PATTERNS[FLIGHT_TIME].fullmatch(text) and not ACTION_WORDS.search(text):
+        return FLIGHT_TIME
+    return None
+
+
+def _parse(value) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _format(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d %H:%M") + (
+        moment.strftime(" %z") if moment.tzinfo else ""
+    )
+
+
+def next_flight(flights: list[dict], now: Optional[datetime] = None) -> Optional[dict]:
+    """The passenger's earliest flight that has not departed yet."""
+    upcoming = []
+    for flight in flights:
+        departure = _parse(flight.get("scheduled_departure"))
+        if departure is None:
+            continue
+        reference = now or datetime.now(departure.tzinfo)
+        if departure >= reference:
+            upcoming.append((departure, flight))
+    return min(upcoming, key=lambda item: item[0])[1] if upcoming else None
+
+
+def render_flight_time(flight: dict) -> str:
+    departure = _parse(flight["scheduled_departure"])
+    arrival = _parse(flight.get("scheduled_arrival"))
+    return FLIGHT_TIME_RESPONSE.format(
+        flight_no=flight.get("flight_no"),
+        departure_airport=flight.get("departure_airport"),
+        arrival_airport=flight.get("arrival_airport"),
+        departure=_format(departure),
+        arrival=_format(arrival) if arrival else "the scheduled time",
+        seat=f", seat {flight['seat_no']}" if flight.get("seat_no") else "",
+    )
+
+
+@dataclass
+class FastPathMetrics:
+    turns: int = 0
+    hits: int = 0
+    by_intent: dict[str, int] = field(default_factory=dict)
+    classify_seconds: float = 0.0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.turns if self.turns else 0.0
+
+
+class FastPath:
+    """
+    Graph node answering trivial turns without a model call: greetings,
+    thanks and "what time is my flight?", the last one from the passenger's
+    cached flight profile.
+
+    Anything else, a turn handled by a sub-agent, or a flight question the
+    profile cannot answer falls through to the model. Saved latency is
+    estimated from the average model call of `assistant_metrics`.
+
+    Args:
+        profile_cache (UserProfileCache): Flight profiles loaded by `fetch_user_info`.
+        assistant_metrics (Optional[AssistantMetrics]): Metrics of the assistant it bypasses.
+    """
+
+    def __init__(
+        self,
+        profile_cache: UserProfileCache,
+        assistant_metrics: Optional[AssistantMetrics] = None,
+    ):
+        self.profile_cache = profile_cache
+        self.assistant_metrics = assistant_metrics
+        self.metrics = FastPathMetrics()
+        self._lock = threading.Lock()
+
+    def _answer(self, intent: str, config: RunnableConfig) -> Optional[str]:
+        if intent == GREETING:
+            return GREETING_RESPONSE
+        if intent == THANKS:
+            return THANKS_RESPONSE
+        passenger_id = config.get("configurable", {}).get("passenger_id")
+        if not passenger_id:
+            return None
+        flight = next_flight(self.profile_cache.get(passenger_id).flights)
+        return render_flight_time(flight) if flight else None
+
+    def _record(self, intent: Optional[str], seconds: float) -> None:
+        with self._lock:
+            self.metrics.turns += 1
+            self.metrics.classify_seconds += seconds
+            if intent is None:
+                return
+            self.metrics.hits += 1
+            self.metrics.by_intent[intent] = self.metrics.by_intent.get(intent, 0) + 1
+            if self.assistant_metrics is not None:
+                saved = self.assistant_metrics.avg_call_seconds - seconds
+                self.metrics.saved_seconds += max(saved, 0.0)
+        logger.info(
+            f"Fast path answered '{intent}' in {seconds * 1000:.1f}ms "
+            f"(hit rate {self.metrics.hit_rate:.1%}, "
+            f"~{self.metrics.saved_seconds:.1f}s of model time saved)"
+        )
+
+    def __call__(self, state: TravelerAgentState, config: RunnableConfig):
+        started = time.perf_counter()
+        answer, intent = None, None
+        message = state["messages"][-1]
+        # A sub-agent holding the dialog keeps its own context
+        if isinstance(message, HumanMessage) and not state.get("dialog_state"):
+            intent = classify(
+                message.content if isinstance(message.content, str) else ""
+            )
+            if intent:
+                try:
+                    answer = self._answer(intent, config)
+                except Exception as e:
+                    logger.warning(f"Fast path failed for '{intent}': {e}")
+        self._record(intent if answer else None, time.perf_counter() - started)
+        return {"messages": AIMessage(content=answer)} if answer else {}
+
+
+def answered(state: TravelerAgentState) -> bool:
+    return isinstance(state["messages"][-1], AIMessage)
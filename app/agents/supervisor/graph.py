@@ -1,30 +1,97 @@
-from typing import Callable, List, Dict
+from typing import Callable, List, Dict, Optional, Union
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
-from langgraph.graph import START, StateGraph
+from langgraph.graph import END, START, StateGraph
+from langchain_core.runnables import RunnableLambda
 from langgraph.prebuilt import tools_condition
 
-from app.agents.base.agent import Assistant
+from app.agents.base.agent import Assistant, SubAgent
+from app.agents.base.graph import add_sub_agent, pop_dialog_state
+from app.agents.base.history import HistoryManager
+from app.agents.supervisor.fast_path import FastPath, answered
+from app.agents.supervisor.state import TravelerAgentState
+from app.agents.supervisor.tools import ROUTING_TOOLS
 from app.utils.nodes_helpers import create_tool_node_with_fallback
+from app.utils.tool_execution import ToolExecutor
+from app.utils.tool_results import ToolResultEncoder
 
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def add_turn_start(
+    builder,
+    user_info: Callable,
+    target: Union[str, Callable],
+    destinations: List[str],
+    history: Optional[HistoryManager] = None,
+    fast_path: Optional[FastPath] = None,
+) -> None:
+    """
+    Add the nodes every user turn runs before the first model call:
+    fetch_user_info, then the fast path (which may end the turn) and history
+    management, and finally `target`, a node name or a routing function over
+    `destinations`.
+    """
+    builder.add_node("fetch_user_info", user_info)
+    builder.add_edge(START, "fetch_user_info")
+    steps = ["fetch_user_info"]
+    if fast_path is not None:
+        builder.add_node("fast_path", fast_path)
+        steps.append("fast_path")
+    if history is not None:
+        # Trim the history once per user turn, before the first model call
+        builder.add_node("manage_history", RunnableLambda(history, afunc=history.acall))
+        steps.append("manage_history")
+
+    def connect(source: str, route: Callable, targets: List[str]) -> None:
+        if source == "fast_path":
+            builder.add_conditional_edges(
+                source,
+                lambda state: END if answered(state) else route(state),
+                [END] + targets,
+            )
+        elif len(targets) == 1:
+            builder.add_edge(source, targets[0])
+        else:
+            builder.add_conditional_edges(source, route, targets)
+
+    for source, step in zip(steps, steps[1:]):
+        connect(source, lambda state, step=step: step, [step])
+    if isinstance(target, str):
+        connect(steps[-1], lambda state: target, [target])
+    else:
+        connect(steps[-1], target, destinations)
+
+
 def supervisor_graph(
     builder,
     assistant: Assistant,
     tools: List[Callable],
     extra_nodes: Dict[str, Callable] = {},
+    tool_encoder: Optional[ToolResultEncoder] = None,
+    history: Optional[HistoryManager] = None,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    tool_executor: Optional[ToolExecutor] = None,
+    fast_path: Optional[FastPath] = None,
 ) -> StateGraph:
     """Create the state graph for the supervisor agent."""
     logger.info("Creating supervisor graph")
-    builder.add_node("fetch_user_info", extra_nodes.get("user_info", None))
-    builder.add_edge(START, "fetch_user_info")
-    builder.add_node("assistant", assistant)
-    builder.add_node("tools", create_tool_node_with_fallback(tools))
+    # The async path awaits the model instead of holding an executor thread
+    builder.add_node("assistant", RunnableLambda(assistant, afunc=assistant.acall))
+    builder.add_node(
+        "tools", create_tool_node_with_fallback(tools, tool_encoder, tool_executor)
+    )
     # Define edges: these determine how the control flow moves
-    builder.add_edge("fetch_user_info", "assistant")
+    add_turn_start(
+        builder,
+        extra_nodes.get("user_info", None),
+        "assistant",
+        ["assistant"],
+        history=history,
+        fast_path=fast_path,
+    )
 
     builder.add_conditional_edges(
         "assistant",
@@ -34,5 +101,86 @@ def supervisor_graph(
 
     # The checkpointer lets the graph persist its state
     # this is a complete memory for the entire graph.
-    memory = MemorySaver()
+    memory = checkpointer or MemorySaver()
     return builder.compile(checkpointer=memory, interrupt_before=["tools"])
+
+
+def route_to_workflow(state: TravelerAgentState) -> str:
+    """A new user turn goes to whichever assistant holds the dialog."""
+    dialog_state = state.get("dialog_state")
+    if not dialog_state:
+        return "primary_assistant"
+    return f"{dialog_state[-1]}_assistant"
+
+
+def route_primary_assistant(state: TravelerAgentState) -> str:
+    if tools_condition(state) == END:
+        return END
+    for tool_call in state["messages"][-1].tool_calls:
+        if tool_call["name"] in ROUTING_TOOLS:
+            return f"enter_{ROUTING_TOOLS[tool_call['name']]}"
+    return "primary_assistant_tools"
+
+
+def multi_agent_graph(
+    builder,
+    assistant: Assistant,
+    tools: List[Callable],
+    sub_agents: List[SubAgent],
+    extra_nodes: Dict[str, Callable] = {},
+    tool_encoder: Optional[ToolResultEncoder] = None,
+    history: Optional[HistoryManager] = None,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    tool_executor: Optional[ToolExecutor] = None,
+    fast_path: Optional[FastPath] = None,
+) -> StateGraph:
+    """
+    Create the supervisor graph with one sub-agent per domain. Each model call
+    binds only the tools of the assistant holding the dialog: the supervisor's
+    read-only tools plus the routing tools, or a sub-agent's domain tools plus
+    `CompleteOrEscalate`.
+    """
+    logger.info(f"Creating multi-agent graph with {len(sub_agents)} sub-agents")
+    routes = {agent: name for name, agent in ROUTING_TOOLS.items()}
+    add_turn_start(
+        builder,
+        extra_nodes.get("user_info", None),
+        route_to_workflow,
+        ["primary_assistant"] + [f"{agent.name}_assistant" for agent in sub_agents],
+        history=history,
+        fast_path=fast_path,
+    )
+
+    builder.add_node(
+        "primary_assistant", RunnableLambda(assistant, afunc=assistant.acall)
+    )
+    builder.add_node(
+        "primary_assistant_tools",
+        create_tool_node_with_fallback(tools, tool_encoder, tool_executor),
+    )
+    builder.add_edge("primary_assistant_tools", "primary_assistant")
+    builder.add_conditional_edges(
+        "primary_assistant",
+        route_primary_assistant,
+        ["primary_assistant_tools", END]
+        + [f"enter_{agent.name}" for agent in sub_agents],
+    )
+
+    # Going back to the supervisor is a plain state update, not a model call
+    builder.add_node("leave_skill", pop_dialog_state)
+    builder.add_edge("leave_skill", "primary_assistant")
+    for agent in sub_agents:
+        add_sub_agent(
+            builder,
+            agent,
+            routing_tool=routes[agent.name],
+            tool_encoder=tool_encoder,
+            tool_executor=tool_executor,
+        )
+
+    memory = checkpointer or MemorySaver()
+    return builder.compile(
+        checkpointer=memory,
+        interrupt_before=["primary_assistant_tools"]
+        + [f"{agent.name}_tools" for agent in sub_agents],
+    )
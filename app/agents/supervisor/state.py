@@ -1,10 +1,25 @@
-from typing import Annotated
+from typing import Annotated, Literal, Optional
 
 from typing_extensions import TypedDict
 
 from langgraph.graph.message import AnyMessage, add_messages
 
 
+DialogState = Literal["flights", "hotels", "cars", "activities"]
+
+
+def update_dialog_stack(left: list[str], right: Optional[str]) -> list[str]:
+    """Push or pop the dialog state stack."""
+    if right is None:
+        return left
+    if right == "pop":
+        return left[:-1]
+    return left + [right]
+
+
 class TravelerAgentState(TypedDict):
     messages: Annotated[list[AnyMessage], add_messages]
     user_info: str
+    summary: str
+    # Active sub-agent on top; empty means the supervisor
+    dialog_state: Annotated[list[DialogState], update_dialog_stack]
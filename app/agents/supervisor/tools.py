@@ -0,0 +1,62 @@
+from pydantic import BaseModel, Field
+
+
+class ToFlightBookingAssistant(BaseModel):
+    """Transfers work to a specialized assistant to handle flight updates and cancellations."""
+
+    request: str = Field(
+        description="Any necessary followup questions the update flight assistant should clarify before proceeding."
+    )
+
+
+class ToHotelBookingAssistant(BaseModel):
+    """Transfer work to a specialized assistant to handle hotel bookings."""
+
+    location: str = Field(
+        description="The location where the user wants to book a hotel."
+    )
+    checkin_date: str = Field(description="The check-in date for the hotel.")
+    checkout_date: str = Field(description="The check-out date for the hotel.")
+    request: str = Field(
+        description="Any additional information or requests from the user regarding the hotel booking."
+    )
+
+
+class ToBookCarRental(BaseModel):
+    """Transfers work to a specialized assistant to handle car rental bookings."""
+
+    location: str = Field(
+        description="The location where the user wants to rent a car."
+    )
+    start_date: str = Field(description="The start date of the car rental.")
+    end_date: str = Field(description="The end date of the car rental.")
+    request: str = Field(
+        description="Any additional information or requests from the user regarding the car rental."
+    )
+
+
+class ToBookExcursion(BaseModel):
+    """Transfers work to a specialized assistant to handle trip recommendation and other excursion bookings."""
+
+    location: str = Field(
+        description="The location where the user wants to book a recommended trip."
+    )
+    request: str = Field(
+        description="Any additional information or requests from the user regarding the trip recommendation."
+    )
+
+
+# Routing tool name -> sub-agent it hands the dialog to
+ROUTING_TOOLS = {
+    ToFlightBookingAssistant.__name__: "flights",
+    ToHotelBookingAssistant.__name__: "hotels",
+    ToBookCarRental.__name__: "cars",
+    ToBookExcursion.__name__: "activities",
+}
+
+routing_tools = [
+    ToFlightBookingAssistant,
+    ToHotelBookingAssistant,
+    ToBookCarRental,
+    ToBookExcursion,
+]
@@ -0,0 +1,55 @@
+from typing import Optional
+
+from fastapi import WebSocket
+
+from app.utils.exceptions import AuthenticationError
+from app.utils.logger import get_logger
+from app.utils.tokens import sign_token, verify_token
+
+logger = get_logger(name=__name__)
+
+
+def create_passenger_token(passenger_id: str, secret: str) -> str:
+    """
+    Issue the token a client presents to chat as `passenger_id`. It is valid
+    for `PASSENGER_TOKEN_TTL` seconds; see `app.utils.issue_passenger_token`.
+    """
+    return sign_token({"sub": passenger_id}, secret)
+
+
+def authenticate_websocket(
+    websocket: WebSocket,
+    secret: str,
+    default_passenger_id: Optional[str] = None,
+    max_age: Optional[float] = None,
+) -> str:
+    """
+    Resolve the passenger_id of a WebSocket client.
+
+    The passenger token is read from the `Authorization: Bearer` header or, for
+    browsers that cannot set handshake headers, the `auth` query parameter.
+    Without a token the default passenger is used, if one is configured; that
+    fallback is meant for development only.
+
+    Raises:
+        AuthenticationError: If there is no valid token and no default passenger,
+            or the token is older than `max_age` seconds.
+    """
+    token = websocket.query_params.get("auth")
+    authorization = websocket.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[len("bearer ") :].strip()
+
+    if token:
+        passenger_id = verify_token(token, secret, max_age).get("sub")
+        if not passenger_id:
+            raise AuthenticationError("Token has no passenger.")
+        return passenger_id
+
+    if default_passenger_id:
+        logger.warning(
+            f"No passenger token; using the development default passenger "
+            f"{default_passenger_id}"
+        )
+        return default_passenger_id
+    raise AuthenticationError("Missing passenger token.")
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from app.agents.base.agent import total_usage
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+async def live(request: Request) -> JSONResponse:
+    """
+    El proceso responde. Solo falla si el arranque falló, para que el
+    orquestador reinicie el pod.
+    """
+    readiness = request.app.state.readiness
+    if readiness.failed:
+        return JSONResponse(
+            status_code=503, content={"status": "failed", "error": readiness.error}
+        )
+    return JSONResponse(content={"status": "alive"})
+
+
+@router.get("/ready")
+async def ready(request: Request) -> JSONResponse:
+    """
+    La aplicación puede atender tráfico: todas las fases del arranque
+    terminaron. Devuelve 503 mientras tanto, con el estado de cada fase.
+    """
+    snapshot = request.app.state.readiness.snapshot()
+    status = "ready" if snapshot["ready"] else "starting"
+    if snapshot["error"]:
+        status = "failed"
+    return JSONResponse(
+        status_code=200 if snapshot["ready"] else 503,
+        content={"status": status, **snapshot},
+    )
+
+
+@router.get("/usage")
+async def usage(request: Request) -> JSONResponse:
+    """
+    Tokens consumidos por cada asistente del grafo y su total, incluida la
+    parte servida desde la caché de prompts del proveedor.
+    """
+    bootstrap = getattr(request.app.state, "bootstrap", None)
+    if bootstrap is None:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return JSONResponse(content=total_usage(bootstrap.components.assistant_metrics))
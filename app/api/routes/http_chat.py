@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import HTMLResponse
 
 
@@ -13,6 +13,8 @@ async def home(request: Request) -> HTMLResponse:
     Args:
         request: Request object from FastAPI
     """
+    if getattr(request.app.state, "bootstrap", None) is None:
+        raise HTTPException(status_code=503, detail="Service is starting")
     return request.app.state.bootstrap.components.templates.TemplateResponse(
         request=request, name="index.html"
     )
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, WebSocket
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from app.api.middleware.auth import authenticate_websocket
+from app.utils.exceptions import AuthenticationError, SessionError
 from app.utils.logger import get_logger
+from app.utils.tool_execution import turn_deadline
 
 router = APIRouter(
     prefix="/chat",
@@ -8,54 +11,171 @@ router = APIRouter(
 
 logger = get_logger(name=__name__)
 
+SESSION_TOKEN_HEADER = b"x-session-token"
+# Maximum characters of a tool input/output echoed in tool frames
+TOOL_PREVIEW_CHARS = 500
+# Only tokens of the graph's answering nodes are streamed (not the summarizer)
+STREAMED_NODES = {
+    "assistant",
+    "primary_assistant",
+    "flights_assistant",
+    "hotels_assistant",
+    "cars_assistant",
+    "activities_assistant",
+}
+
+
+def message_text(message) -> str:
+    content = (
+        message.content if hasattr(message, "content") else message.get("content", "")
+    )
+    if isinstance(content, list):
+        return "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+    return content
+
+
+def preview(value) -> str:
+    text = message_text(value) if hasattr(value, "content") else str(value)
+    return text[:TOOL_PREVIEW_CHARS]
+
+
+async def send_frame(websocket: WebSocket, frame_type: str, **payload) -> None:
+    await websocket.send_json({"type": frame_type, **payload})
+
+
+async def run_turn(agent, data: str, config: dict) -> str:
+    """Run a whole turn and return the text of the last message."""
+    result = await agent.ainvoke({"messages": data}, config=config)
+    logger.info(f"Agent result: {result}")
+
+    if not result:
+        logger.error("No response from agent")
+        return "No response from agent"
+
+    messages = result.get("messages")
+    if not messages:
+        logger.warning("No messages found in the result")
+        return "No messages found"
+
+    response_text = message_text(messages[-1])
+    logger.info(f"Agent response: {response_text}")
+    return response_text
+
+
+async def stream_turn(websocket: WebSocket, agent, data: str, config: dict) -> None:
+    """
+    Run a turn pushing JSON frames as the graph progresses:
+    `token` deltas of the answer, `tool_start`/`tool_end` around tool calls and
+    a `final` frame with the complete answer. Failures become an `error` frame
+    so the connection survives a bad turn.
+    """
+    try:
+        async for event in agent.astream_events(
+            {"messages": data}, config=config, version="v2"
+        ):
+            kind = event["event"]
+            node = event.get("metadata", {}).get("langgraph_node")
+            if kind == "on_chat_model_stream" and node in STREAMED_NODES:
+                delta = message_text(event["data"]["chunk"])
+                if delta:
+                    await send_frame(websocket, "token", content=delta)
+            elif kind == "on_tool_start":
+                await send_frame(
+                    websocket,
+                    "tool_start",
+                    name=event["name"],
+                    input=preview(event["data"].get("input")),
+                )
+            elif kind == "on_tool_end":
+                await send_frame(
+                    websocket,
+                    "tool_end",
+                    name=event["name"],
+                    output=preview(event["data"].get("output")),
+                )
+
+        state = await agent.aget_state(config)
+        messages = state.values.get("messages", [])
+        await send_frame(
+            websocket,
+            "final",
+            content=message_text(messages[-1]) if messages else "",
+            pending=list(state.next),
+        )
+    except WebSocketDisconnect:
+        raise
+    except Exception as e:
+        logger.exception("Error streaming agent response")
+        await send_frame(websocket, "error", message=str(e))
+
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-    thread_id = "hola"
-    config = {
-        "configurable": {
-            "passenger_id": "3952-666242",
-            "thread_id": thread_id,
-        }
-    }
-    agent = websocket.app.state.bootstrap.components.agent
+    if getattr(websocket.app.state, "bootstrap", None) is None:
+        # 1013: "try again later" mientras la aplicación arranca
+        await websocket.close(code=1013, reason="Service is starting")
+        return
+    components = websocket.app.state.bootstrap.components
+    sessions = components.session_manager
+    agent = components.agent
+    turn_budget = components.tool_executor.turn_budget
     if not agent:
         logger.error("Agent not initialized")
         await websocket.close(code=1011, reason="Agent not initialized")
         return
 
+    try:
+        passenger_id = authenticate_websocket(
+            websocket,
+            secret=sessions.secret,
+            default_passenger_id=sessions.default_passenger_id,
+            max_age=sessions.passenger_token_ttl,
+        )
+        session = sessions.open(
+            passenger_id=passenger_id,
+            resume_token=websocket.query_params.get("resume"),
+        )
+    except AuthenticationError as e:
+        logger.warning(f"Rejected unauthenticated WebSocket connection: {e}")
+        # 4401: equivalente a HTTP 401 en el rango de códigos de la aplicación
+        await websocket.close(code=4401, reason=str(e))
+        return
+    except SessionError as e:
+        logger.warning(f"Rejected WebSocket connection: {e}")
+        await websocket.close(code=1008, reason=str(e))
+        return
+
+    # El token permite retomar el mismo hilo en una nueva conexión
+    token = sessions.token(session).encode()
+    await websocket.accept(headers=[(SESSION_TOKEN_HEADER, token)])
+
+    streaming = websocket.query_params.get("mode") == "stream"
+    if streaming:
+        await send_frame(
+            websocket, "session", thread_id=session.thread_id, token=token.decode()
+        )
+
     try:
         while True:
             data = await websocket.receive_text()
-            logger.info(f"Received message: {data}")
-
-            result = await agent.ainvoke(
-                {"messages": data},
-                config=config,
-            )
-            logger.info(f"Agent result: {result}")
-
-            if not result:
-                logger.error("No response from agent")
-                await websocket.send_text("No response from agent")
-                continue
-
-            messages = result.get("messages")
-            if not messages:
-                logger.warning("No messages found in the result")
-                await websocket.send_text("No messages found")
-                continue
-
-            response_text = (
-                messages[-1].content
-                if hasattr(messages[-1], "content")
-                else messages[-1].get("content", "")
-            )
-            logger.info(f"Agent response: {response_text}")
-
-            await websocket.send_text(response_text)
+            logger.info(f"Received message on session {session.thread_id}: {data}")
+            session.touch()
+
+            # Todas las tools del turno comparten el mismo presupuesto
+            with turn_deadline(turn_budget):
+                if streaming:
+                    await stream_turn(websocket, agent, data, session.config)
+                else:
+                    reply = await run_turn(agent, data, session.config)
+                    await websocket.send_text(reply)
 
+    except WebSocketDisconnect:
+        logger.info(f"WebSocket disconnected: session {session.thread_id}")
     except Exception as e:
         logger.exception("Unexpected error in WebSocket")
         await websocket.close(code=1011, reason=str(e))
+    finally:
+        await sessions.close(session)
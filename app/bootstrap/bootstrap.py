@@ -1,21 +1,57 @@
+import asyncio
+import secrets
+import sqlite3
 from typing import Optional
 
-from app.agents.base.agent import Assistant
+from app.agents.base.agent import Assistant, AssistantMetrics, RetryPolicy
+from app.agents.base.history import HistoryManager
+from app.agents.flights.profile import UserProfileCache
+from app.agents.flights import tools as flight_tools
 from app.agents.flights.tools import create_flight_booking_tools
+from app.agents.hotels import tools as hotel_tools
 from app.agents.hotels.tools import create_hotel_booking_tools
+from app.agents.cars import tools as car_tools
 from app.agents.cars.tools import create_cars_booking_tools
 from app.agents.base.tools import create_lookup_policy_tool
+from app.agents.activities import tools as activity_tools
 from app.agents.activities.tools import create_activities_tools
-from app.agents.supervisor.graph import supervisor_graph
+from app.agents.activities.agent import create_activities_agent
+from app.agents.cars.agent import create_cars_agent
+from app.agents.flights.agent import create_flights_agent
+from app.agents.hotels.agent import create_hotels_agent
+from app.agents.supervisor.agent import create_supervisor_assistant
+from app.agents.supervisor.fast_path import FastPath
+from app.agents.supervisor.graph import multi_agent_graph, supervisor_graph
 from app.agents.supervisor.state import TravelerAgentState
+from app.bootstrap.readiness import Readiness, startup_phase
 from app.config.settings import Settings
 from app.config.settings import get_settings
+from app.services.vectorstore.embedding_cache import EmbeddingCache
+from app.services.vectorstore.faq import load_faq_docs
+from app.services.vectorstore.hybrid import HybridRetriever
+from app.services.vectorstore.response_cache import SemanticResponseCache
+from app.services.database.async_postgres_client import AsyncPostgresClient
+from app.services.database.checkpointer import (
+    DurableCheckpointSaver,
+    PostgresCheckpointBackend,
+    SQLiteCheckpointBackend,
+)
+from app.services.database.migrations import apply_migrations, verify_query_plans
+from app.services.database.sqlite_pool import SQLitePool
+from app.services.llm.factory import create_embedding_provider
+from app.services.sessions.session_manager import SessionManager
 from app.services.vectorstore.vector_store import VectorStoreRetriever
+from app.utils.cache import LRUTTLCache
 from app.utils.logger import get_logger
+from app.utils.tool_execution import ToolExecutor, ToolLimits
+from app.utils.tool_results import ToolResultEncoder
 
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph
 
-from app.agents.base.prompts import primary_assistant_prompt
+from app.agents.base.prompts import build_primary_assistant_prompt, summary_prompt
 from langchain_openai.chat_models import ChatOpenAI
 
 
@@ -24,22 +60,45 @@ from fastapi.templating import Jinja2Templates
 
 logger = get_logger(name=__name__)
 
+# Consultas de todas las tools verificadas con EXPLAIN QUERY PLAN al arrancar
+QUERY_PLAN_CHECKS = {
+    **flight_tools.QUERY_PLAN_CHECKS,
+    **hotel_tools.QUERY_PLAN_CHECKS,
+    **car_tools.QUERY_PLAN_CHECKS,
+    **activity_tools.QUERY_PLAN_CHECKS,
+}
+
 
 class AppComponents:
     """Contenedor para componentes de la aplicación."""
 
     def __init__(
         self,
-        retriever: VectorStoreRetriever,
+        retriever: VectorStoreRetriever | HybridRetriever,
         agent: StateGraph,
         templates: Jinja2Templates,
+        db_pool: SQLitePool,
+        profile_cache: UserProfileCache,
+        checkpointer: BaseCheckpointSaver,
+        session_manager: SessionManager,
+        tool_executor: ToolExecutor,
+        assistant_metrics: Optional[dict[str, AssistantMetrics]] = None,
     ):
         """
         Inicializa los componentes con las dependencias inyectadas.
+
+        `assistant_metrics` reúne las métricas de todos los asistentes del
+        grafo (supervisor y sub-agentes) por nombre.
         """
         self.retriever = retriever
         self.agent = agent
         self.templates = templates
+        self.db_pool = db_pool
+        self.profile_cache = profile_cache
+        self.checkpointer = checkpointer
+        self.session_manager = session_manager
+        self.tool_executor = tool_executor
+        self.assistant_metrics = assistant_metrics or {}
 
 
 class Bootstrap:
@@ -62,75 +121,405 @@ class Bootstrap:
                 cls._initialize_components(settings=settings)
         return cls._instance
 
-    @classmethod
-    def _initialize_components(cls, settings: Settings):
+    @staticmethod
+    def create_retriever(
+        settings: Settings, docs: list[dict]
+    ) -> VectorStoreRetriever | HybridRetriever:
         """
-        Inicializa los componentes de la aplicación.
+        Construye el retriever de políticas con sus caches e índice configurados.
 
         Args:
             settings: Configuración de la aplicación
+            docs: Documentos del FAQ
         """
-        from app.services.vectorstore.vector_store import VectorStoreRetriever
-        import requests
-        import openai
-        import re
+        embedder = create_embedding_provider(settings=settings)
 
-        logger.info("Initializing components")
+        cache = None
+        if settings.embedding_cache_dir:
+            cache = EmbeddingCache(
+                cache_dir=settings.embedding_cache_dir, model=embedder.model
+            )
+
+        query_cache = LRUTTLCache(
+            max_size=settings.query_cache_size, ttl=settings.query_cache_ttl
+        )
+
+        retriever = VectorStoreRetriever.from_docs(
+            docs=docs,
+            embedder=embedder,
+            cache=cache,
+            query_cache=query_cache,
+            index=settings.vector_index,
+            index_options={
+                "nlist": settings.ivf_nlist,
+                "nprobe": settings.ivf_nprobe,
+                "quantization": settings.vector_quantization,
+                "path": settings.vector_index_path,
+            },
+        )
+        if settings.retrieval_mode == "hybrid":
+            return HybridRetriever(
+                vector_retriever=retriever,
+                alpha=settings.hybrid_alpha,
+                lexical_confidence=settings.lexical_confidence,
+            )
+        return retriever
+
+    @staticmethod
+    def _create_checkpointer(settings: Settings) -> BaseCheckpointSaver:
+        """
+        Construye el checkpointer del grafo según `settings.checkpointer`.
+
+        Args:
+            settings: Configuración de la aplicación
+        """
+        if settings.checkpointer == "memory":
+            return MemorySaver()
+
+        if settings.checkpointer == "sqlite":
+            backend = SQLiteCheckpointBackend(
+                pool=SQLitePool(db_path=settings.checkpoint_db_path, size=4)
+            )
+        elif settings.checkpointer == "postgres":
+            if not settings.postgres_dsn:
+                raise ValueError(
+                    "POSTGRES_DSN is required for the postgres checkpointer."
+                )
+            backend = PostgresCheckpointBackend(
+                client=AsyncPostgresClient(dsn=settings.postgres_dsn)
+            )
+        else:
+            raise ValueError(f"Unknown checkpointer: {settings.checkpointer}")
+
+        return DurableCheckpointSaver(
+            backend=backend,
+            keep_last=settings.checkpoint_keep_last,
+            thread_ttl=settings.checkpoint_thread_ttl,
+            flush_interval=settings.checkpoint_flush_interval,
+            batch_size=settings.checkpoint_batch_size,
+        )
+
+    @staticmethod
+    def _create_fast_path(
+        settings: Settings, profile_cache: UserProfileCache, assistant: Assistant
+    ) -> Optional[FastPath]:
+        """
+        Crea el clasificador local que responde saludos, agradecimientos y la
+        hora del vuelo sin llamar al LLM.
+        """
+        if not settings.fast_path:
+            return None
+        return FastPath(
+            profile_cache=profile_cache, assistant_metrics=assistant.metrics
+        )
 
-        response = requests.get(
-            url=settings.faq_url,
-            timeout=10,
+    @classmethod
+    def _load_retriever(
+        cls, settings: Settings
+    ) -> VectorStoreRetriever | HybridRetriever:
+        """Descarga el FAQ y construye el retriever (incluye los embeddings)."""
+        docs = load_faq_docs(faq_url=settings.faq_url)
+        return cls.create_retriever(settings=settings, docs=docs)
+
+    @staticmethod
+    def _open_database(settings: Settings) -> SQLitePool:
+        """Abre el pool, aplica migraciones y precalienta las conexiones."""
+        db_pool = SQLitePool(
+            db_path=settings.db_path,
+            size=settings.db_pool_size,
+            cache_size_kib=settings.db_cache_size_kib,
+            mmap_size=settings.db_mmap_size,
         )
-        response.raise_for_status()
-        faq_text = response.text
+        try:
+            with db_pool.connection() as conn:
+                apply_migrations(conn)
+                if settings.verify_query_plans:
+                    verify_query_plans(
+                        conn,
+                        QUERY_PLAN_CHECKS,
+                        strict=settings.verify_query_plans_strict,
+                    )
+            warmed = db_pool.warm_up()
+        except BaseException:
+            db_pool.close()
+            raise
+        logger.info(f"Initialized SQLite pool with {warmed} warm connections")
+        return db_pool
+
+    @classmethod
+    def _initialize_components(
+        cls, settings: Settings, readiness: Optional[Readiness] = None
+    ):
+        """
+        Inicializa los componentes de la aplicación de forma secuencial.
+
+        Args:
+            settings: Configuración de la aplicación
+            readiness: Estado del arranque donde registrar cada fase
+        """
+        logger.info("Initializing components")
+        with startup_phase("retriever", readiness):
+            retriever = cls._load_retriever(settings)
+        with startup_phase("database", readiness):
+            db_pool = cls._open_database(settings)
+        with startup_phase("graph", readiness):
+            cls._components = cls._build_components(settings, retriever, db_pool)
+        logger.info("Components initialized successfully")
+
+    @classmethod
+    async def _ainitialize_components(
+        cls, settings: Settings, readiness: Optional[Readiness] = None
+    ):
+        """
+        Inicializa los componentes sin bloquear el event loop: la descarga del
+        FAQ con sus embeddings y la preparación de la base de datos corren en
+        paralelo en hilos; el grafo se arma cuando ambas terminan.
+
+        Args:
+            settings: Configuración de la aplicación
+            readiness: Estado del arranque donde registrar cada fase
+        """
+        logger.info("Initializing components in parallel")
 
-        docs = [{"page_content": txt} for txt in re.split(r"(?=\n##)", faq_text)]
+        async def run_phase(name: str, func):
+            with startup_phase(name, readiness):
+                return await asyncio.to_thread(func, settings)
 
-        oai_client = openai.OpenAI()
+        retriever, db_pool = await asyncio.gather(
+            run_phase("retriever", cls._load_retriever),
+            run_phase("database", cls._open_database),
+            return_exceptions=True,
+        )
+        for result in (retriever, db_pool):
+            if isinstance(result, BaseException):
+                # La otra fase pudo haber terminado: no dejar el pool abierto
+                if isinstance(db_pool, SQLitePool):
+                    db_pool.close()
+                raise result
+
+        with startup_phase("graph", readiness):
+            cls._components = cls._build_components(settings, retriever, db_pool)
+        logger.info("Components initialized successfully")
 
-        retriever = VectorStoreRetriever.from_docs(docs=docs, oai_client=oai_client)
+    @classmethod
+    def _build_components(
+        cls,
+        settings: Settings,
+        retriever: VectorStoreRetriever | HybridRetriever,
+        db_pool: SQLitePool,
+    ) -> AppComponents:
+        """
+        Construye las tools, el LLM y el grafo sobre el retriever y el pool ya listos.
 
+        Args:
+            settings: Configuración de la aplicación
+            retriever: Retriever de políticas
+            db_pool: Pool de conexiones SQLite
+        """
         llm = ChatOpenAI(model=settings.llm_model)
         logger.info(f"Initialized LLM: {settings.llm_model}")
 
+        # Perfil de vuelos por pasajero, invalidado por las tools que modifican tickets
+        profile_cache = UserProfileCache(
+            pool=db_pool,
+            max_size=settings.profile_cache_size,
+            ttl=settings.profile_cache_ttl,
+        )
+
         tools = []
         policies_tools = create_lookup_policy_tool(retriever=retriever)
-        flight_tools = create_flight_booking_tools(db_path=settings.db_path)
-        hotel_tools = create_hotel_booking_tools(db_path=settings.db_path)
-        car_tools = create_cars_booking_tools(db_path=settings.db_path)
-        activities_tools = create_activities_tools(db_path=settings.db_path)
+        # Las variantes async corren en el executor acotado del pool
+        use_async = settings.async_tools
+        flight_tools = create_flight_booking_tools(
+            pool=db_pool, use_async=use_async, profile_cache=profile_cache
+        )
+        hotel_tools = create_hotel_booking_tools(pool=db_pool, use_async=use_async)
+        car_tools = create_cars_booking_tools(pool=db_pool, use_async=use_async)
+        activities_tools = create_activities_tools(pool=db_pool, use_async=use_async)
 
         logger.info("Initialized all tools")
 
-        def user_info(state: TravelerAgentState):
-            return {"user_info": flight_tools[0].invoke({})}
+        def user_info(state: TravelerAgentState, config: RunnableConfig):
+            passenger_id = config.get("configurable", {}).get("passenger_id", None)
+            if not passenger_id:
+                raise ValueError("No passenger ID configured.")
+            try:
+                return {"user_info": profile_cache.get(passenger_id).text}
+            except sqlite3.Error as e:
+                logger.error(f"Database error loading user profile: {e}")
+                return {"user_info": "[]"}
 
         tools += (
             policies_tools + flight_tools + hotel_tools + car_tools + activities_tools
         )
         logger.info(f"Initialized {len(tools)} tools")
 
-        runnable_with_tools = primary_assistant_prompt | llm.bind_tools(tools=tools)
-        logger.info("Initialized runnable with tools")
+        # Resultados de tools en formato tabular compacto para ahorrar tokens
+        tool_encoder = (
+            ToolResultEncoder(max_chars=settings.tool_result_max_chars)
+            if settings.tool_result_encoding
+            else None
+        )
 
-        builder = StateGraph(TravelerAgentState)
-        agent = supervisor_graph(
-            builder=builder,
-            tools=tools,
-            assistant=Assistant(runnable=runnable_with_tools),
-            extra_nodes={
-                "user_info": user_info,
+        # Concurrencia, timeouts y presupuesto por turno de las tools
+        tool_executor = ToolExecutor(
+            max_concurrency=settings.tool_max_concurrency,
+            timeout=settings.tool_timeout,
+            limits={
+                name: ToolLimits(**limits)
+                for name, limits in settings.tool_limits.items()
             },
+            turn_budget=settings.tool_turn_budget,
+        )
+
+        # Ventana de turnos recientes + resumen incremental de los anteriores
+        history = HistoryManager(
+            max_tokens=settings.history_max_tokens,
+            keep_turns=settings.history_keep_turns,
+            stub_chars=settings.history_stub_chars,
+            summarizer=summary_prompt | llm if settings.history_summary else None,
+        )
+
+        response_cache = None
+        if settings.response_cache:
+            # Respuestas de políticas reutilizadas entre pasajeros
+            response_cache = SemanticResponseCache(
+                retriever=getattr(retriever, "vector_retriever", retriever),
+                threshold=settings.response_cache_threshold,
+                ttl=settings.response_cache_ttl,
+                max_entries=settings.response_cache_size,
+            )
+        cacheable_tools = frozenset(
+            tool.name for tool in tools if (tool.metadata or {}).get("cacheable")
+        )
+
+        checkpointer = cls._create_checkpointer(settings=settings)
+        logger.info(f"Initialized {settings.checkpointer} checkpointer")
+
+        retry_policy = RetryPolicy(
+            max_attempts=settings.llm_max_attempts,
+            backoff=settings.llm_retry_backoff,
+        )
+        granularity = settings.prompt_time_granularity
+        builder = StateGraph(TravelerAgentState)
+        if settings.agent_graph == "multi_agent":
+            # Cada llamada al LLM solo lleva las tools del asistente activo
+            supervisor_tools = policies_tools + [
+                tool
+                for tool in flight_tools
+                if tool.name in ("fetch_user_flight_information", "search_flights")
+            ]
+            sub_agents = [
+                create_flights_agent(
+                    llm, flight_tools + policies_tools, granularity, retry_policy
+                ),
+                create_hotels_agent(llm, hotel_tools, granularity, retry_policy),
+                create_cars_agent(llm, car_tools, granularity, retry_policy),
+                create_activities_agent(
+                    llm, activities_tools, granularity, retry_policy
+                ),
+            ]
+            assistant = create_supervisor_assistant(
+                llm,
+                supervisor_tools,
+                time_granularity=granularity,
+                retry_policy=retry_policy,
+                response_cache=response_cache,
+                cacheable_tools=cacheable_tools,
+            )
+            agent = multi_agent_graph(
+                builder=builder,
+                assistant=assistant,
+                tools=supervisor_tools,
+                sub_agents=sub_agents,
+                extra_nodes={
+                    "user_info": user_info,
+                },
+                tool_encoder=tool_encoder,
+                history=history,
+                checkpointer=checkpointer,
+                tool_executor=tool_executor,
+                fast_path=cls._create_fast_path(settings, profile_cache, assistant),
+            )
+            assistant_metrics = {
+                "supervisor": assistant.metrics,
+                **{sub.name: sub.assistant.metrics for sub in sub_agents},
+            }
+        elif settings.agent_graph == "single":
+            # Prefijo estático (instrucciones + tools) y contexto del usuario al final
+            assistant_prompt = build_primary_assistant_prompt(
+                time_granularity=granularity
+            )
+            runnable_with_tools = assistant_prompt | llm.bind_tools(tools=tools)
+            logger.info("Initialized runnable with tools")
+            assistant = Assistant(
+                runnable=runnable_with_tools,
+                retry_policy=retry_policy,
+                response_cache=response_cache,
+                cacheable_tools=cacheable_tools,
+            )
+            agent = supervisor_graph(
+                builder=builder,
+                tools=tools,
+                assistant=assistant,
+                extra_nodes={
+                    "user_info": user_info,
+                },
+                tool_encoder=tool_encoder,
+                history=history,
+                checkpointer=checkpointer,
+                tool_executor=tool_executor,
+                fast_path=cls._create_fast_path(settings, profile_cache, assistant),
+            )
+            assistant_metrics = {"primary": assistant.metrics}
+        else:
+            raise ValueError(f"Unknown agent graph: {settings.agent_graph}")
+        logger.info(f"Initialized {settings.agent_graph} agent graph")
+
+        secret = settings.session_secret
+        if not secret:
+            logger.warning(
+                "SESSION_SECRET not set; session tokens will not survive a restart"
+            )
+            secret = secrets.token_hex(32)
+        default_passenger_id = None
+        if settings.allow_default_passenger and settings.default_passenger_id:
+            logger.warning(
+                f"Clients without a passenger token chat as "
+                f"{settings.default_passenger_id}; do not enable this in production"
+            )
+            default_passenger_id = settings.default_passenger_id
+        elif settings.default_passenger_id:
+            logger.warning(
+                "DEFAULT_PASSENGER_ID ignored: set ALLOW_DEFAULT_PASSENGER=true "
+                "to use it in development"
+            )
+        # Con MemorySaver los hilos no se pueden retomar tras reiniciar: se borran al cerrar
+        session_manager = SessionManager(
+            secret=secret,
+            token_ttl=settings.session_token_ttl,
+            max_sessions=settings.max_sessions,
+            checkpointer=checkpointer,
+            delete_on_close=settings.checkpointer == "memory",
+            default_passenger_id=default_passenger_id,
+            passenger_token_ttl=settings.passenger_token_ttl,
         )
 
         templates = Jinja2Templates(directory="app/templates")
 
         components = AppComponents(
-            retriever=retriever, agent=agent, templates=templates
+            retriever=retriever,
+            agent=agent,
+            templates=templates,
+            db_pool=db_pool,
+            profile_cache=profile_cache,
+            checkpointer=checkpointer,
+            session_manager=session_manager,
+            tool_executor=tool_executor,
+            assistant_metrics=assistant_metrics,
         )
 
-        cls._components = components
-        logger.info("Components initialized successfully")
+        return components
 
     @property
     def components(self) -> AppComponents:
@@ -150,6 +539,8 @@ class Bootstrap:
     @classmethod
     def reset(cls):
         """Reinicia el singleton (útil para pruebas)."""
+        if cls._components is not None:
+            cls._components.db_pool.close()
         cls._instance = None
         cls._components = None
 
@@ -165,3 +556,24 @@ def get_bootstrap(settings: Settings = None) -> Bootstrap:
         Instancia de Bootstrap
     """
     return Bootstrap(settings=settings)
+
+
+async def aget_bootstrap(
+    settings: Settings = None, readiness: Optional[Readiness] = None
+) -> Bootstrap:
+    """
+    Versión async de `get_bootstrap`: inicializa los componentes sin bloquear
+    el event loop.
+
+    Args:
+        settings: Configuración opcional (si no se proporciona, se usa la global)
+        readiness: Estado del arranque donde registrar cada fase
+
+    Returns:
+        Instancia de Bootstrap
+    """
+    if Bootstrap._components is None:
+        await Bootstrap._ainitialize_components(
+            settings=settings or get_settings(), readiness=readiness
+        )
+    return Bootstrap(settings=settings)
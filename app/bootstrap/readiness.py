@@ -0,0 +1,87 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+PENDING, RUNNING, READY, FAILED = "pending", "running", "ready", "failed"
+
+
+class Readiness:
+    """
+    Estado del arranque de la aplicación, consultado por los health checks.
+
+    Cada fase registra su estado y duración; la aplicación está lista cuando
+    todas las fases terminaron y `mark_ready` fue llamado.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: dict[str, str] = {}
+        self.timings: dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.ready = False
+        self._lock = threading.Lock()
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+    def set_phase(
+        self, name: str, status: str, seconds: Optional[float] = None
+    ) -> None:
+        with self._lock:
+            self.phases[name] = status
+            if seconds is not None:
+                self.timings[name] = round(seconds, 3)
+
+    def mark_ready(self) -> None:
+        with self._lock:
+            self.ready = True
+            self.timings["total"] = round(time.perf_counter() - self.started_at, 3)
+        logger.info(
+            f"Application ready in {self.timings['total']:.2f}s: {self.timings}"
+        )
+
+    def fail(self, error: BaseException) -> None:
+        with self._lock:
+            self.error = f"{type(error).__name__}: {error}"
+            self.ready = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "phases": dict(self.phases),
+                "timings": dict(self.timings),
+                "error": self.error,
+            }
+
+
+@contextmanager
+def startup_phase(name: str, readiness: Optional[Readiness] = None) -> Iterator[None]:
+    """
+    Mide y registra una fase del arranque.
+
+    Args:
+        name: Nombre de la fase
+        readiness: Estado donde reflejar la fase (opcional)
+    """
+    if readiness is not None:
+        readiness.set_phase(name, RUNNING)
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        seconds = time.perf_counter() - start
+        if readiness is not None:
+            readiness.set_phase(name, FAILED, seconds)
+        logger.error(f"Startup phase '{name}' failed after {seconds:.2f}s")
+        raise
+    seconds = time.perf_counter() - start
+    if readiness is not None:
+        readiness.set_phase(name, READY, seconds)
+    logger.info(f"Startup phase '{name}' finished in {seconds:.2f}s")
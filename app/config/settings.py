@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Optional
 
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -13,11 +14,75 @@ class Settings(BaseSettings):
     faq_url: str
     openai_api_key: str
     db_path: str
+    db_pool_size: int = 8
+    db_cache_size_kib: int = 64 * 1024
+    db_mmap_size: int = 256 * 1024 * 1024
+    async_tools: bool = True
+    verify_query_plans: bool = True
+    # Falla el arranque si una consulta hace un table scan (si no, solo avisa)
+    verify_query_plans_strict: bool = False
+    profile_cache_size: int = 1024
+    profile_cache_ttl: Optional[float] = 300.0
+    tool_result_encoding: bool = True
+    tool_result_max_chars: int = 4000
+    tool_max_concurrency: int = 8
+    tool_timeout: Optional[float] = 30.0
+    tool_turn_budget: Optional[float] = 90.0
+    # Por tool, p. ej. TOOL_LIMITS='{"search_flights": {"max_concurrency": 2, "timeout": 10}}'
+    tool_limits: dict[str, dict[str, float]] = {}
+    history_max_tokens: int = 6000
+    history_keep_turns: int = 4
+    history_stub_chars: int = 200
+    history_summary: bool = True
+    # "memory" (se pierde al reiniciar); "sqlite" o "postgres" lo hacen durable
+    checkpointer: str = "memory"
+    checkpoint_db_path: str = "checkpoints.sqlite"
+    postgres_dsn: Optional[str] = None
+    checkpoint_keep_last: int = 10
+    checkpoint_thread_ttl: Optional[float] = 7 * 24 * 3600
+    checkpoint_flush_interval: float = 0.5
+    checkpoint_batch_size: int = 64
+    session_secret: Optional[str] = None
+    session_token_ttl: Optional[float] = 24 * 3600
+    passenger_token_ttl: Optional[float] = 30 * 24 * 3600
+    max_sessions: Optional[int] = None
+    # Solo desarrollo: pasajero de los clientes sin token, si ALLOW_DEFAULT_PASSENGER=true
+    default_passenger_id: Optional[str] = None
+    allow_default_passenger: bool = False
     llm_model: str
+    # "multi_agent" (supervisor + sub-agentes por dominio) o "single"
+    agent_graph: str = "multi_agent"
+    fast_path: bool = True
+    llm_max_attempts: int = 3
+    prompt_time_granularity: int = 300
+    llm_retry_backoff: float = 0.5
+    response_cache: bool = False
+    response_cache_threshold: float = 0.95
+    response_cache_ttl: Optional[float] = 3600.0
+    response_cache_size: int = 512
+    embedding_provider: str = "openai"
+    embedding_model: str = "text-embedding-3-small"
+    embedding_batch_size: int = 2048
+    embedding_concurrency: int = 4
+    embedding_max_retries: int = 3
+    local_embedding_dim: int = 512
+    embedding_cache_dir: Optional[str] = None
+    query_cache_size: int = 256
+    query_cache_ttl: float = 3600.0
+    vector_index: str = "exact"
+    vector_index_path: Optional[str] = None
+    vector_quantization: Optional[str] = None
+    ivf_nlist: Optional[int] = None
+    ivf_nprobe: int = 8
+    retrieval_mode: str = "vector"
+    hybrid_alpha: float = 0.5
+    lexical_confidence: Optional[float] = 0.6
 
     model_config = SettingsConfigDict(
         env_file=f'.env.{"development" if os.getenv("ENVIRONMENT") is None else os.getenv("ENVIRONMENT")}',
         env_file_encoding="utf-8",
+        # `CHECKPOINTER=` en el .env equivale a no definirla
+        env_ignore_empty=True,
     )
 
 
@@ -10,7 +10,9 @@ def setup_routers(app: FastAPI) -> None:
     """
     from app.api.routes.ws_chat import router as chat_router
     from app.api.routes.http_chat import router as http_chat_router
+    from app.api.routes.health import router as health_router
 
     # Registrar los routers
     app.include_router(chat_router)
     app.include_router(http_chat_router)
+    app.include_router(health_router)
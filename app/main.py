@@ -1,10 +1,15 @@
+import asyncio
+from contextlib import suppress
+
 from fastapi import FastAPI
 from fastapi.concurrency import asynccontextmanager
 
 from app.config.setup_middlewares import setup_middlewares
 from app.config.setup_routers import setup_routers
-from app.bootstrap.bootstrap import get_bootstrap
+from app.bootstrap.bootstrap import aget_bootstrap
+from app.bootstrap.readiness import Readiness
 from app.config.settings import get_settings
+from app.services.database.checkpointer import DurableCheckpointSaver
 
 from app.config.setup_static import setup_static
 from app.utils.logger import get_logger
@@ -12,17 +17,46 @@ from app.utils.logger import get_logger
 logger = get_logger(name=__name__)
 
 
+async def initialize(app: FastAPI, readiness: Readiness) -> None:
+    """Inicializa el bootstrap en segundo plano y marca la aplicación como lista."""
+    try:
+        app.state.bootstrap = await aget_bootstrap(
+            settings=get_settings(), readiness=readiness
+        )
+        readiness.mark_ready()
+        logger.info("Bootstrap initialized and set in app state")
+    except Exception as err:
+        readiness.fail(err)
+        logger.exception("Error initializing bootstrap")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for the FastAPI app."""
     logger.info("Starting lifespan context manager")
-    bootstrap = get_bootstrap(settings=get_settings())
-    app.state.bootstrap = bootstrap
-    logger.info("Bootstrap initialized and set in app state")
+    # El arranque no bloquea: /health/ready responde 503 hasta que termine
+    readiness = Readiness()
+    app.state.readiness = readiness
+    app.state.bootstrap = None
+    startup = asyncio.create_task(initialize(app, readiness))
 
     # Ceder el control a FastAPI
     yield
 
+    if not startup.done():
+        startup.cancel()
+        with suppress(asyncio.CancelledError):
+            await startup
+    bootstrap = app.state.bootstrap
+    if bootstrap is None:
+        return
+    checkpointer = bootstrap.components.checkpointer
+    if isinstance(checkpointer, DurableCheckpointSaver):
+        # Escribe los checkpoints pendientes antes de cerrar
+        await checkpointer.aclose()
+    bootstrap.components.tool_executor.shutdown()
+    bootstrap.components.db_pool.close()
+
 
 def create_application() -> FastAPI:
     """
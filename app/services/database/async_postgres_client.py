@@ -1,5 +1,5 @@
 import asyncpg
-from typing import Any, List, Dict, Tuple
+from typing import Any, List, Dict, Optional, Tuple
 from app.services.database.database_client import DatabaseClient
 
 
@@ -27,5 +27,17 @@ class AsyncPostgresClient(DatabaseClient):
             affected = int(result.split()[-1]) if result.split()[-1].isdigit() else 0
             return affected
 
+    async def execute_batch(
+        self, statements: List[Tuple[str, Optional[List[Tuple]]]]
+    ) -> None:
+        """Run (query, rows) pairs in one transaction; `None` rows runs the query once."""
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                for query, rows in statements:
+                    if rows is None:
+                        await conn.execute(query)
+                    else:
+                        await conn.executemany(query, rows)
+
     async def close(self):
         await self.pool.close()
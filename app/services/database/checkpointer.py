@@ -0,0 +1,772 @@
+import asyncio
+import re
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from app.services.database.async_postgres_client import AsyncPostgresClient
+from app.services.database.sqlite_pool import SQLitePool
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+COMPRESSED_SUFFIX = "+zlib"
+
+
+class CompressedSerializer(SerializerProtocol):
+    """Serializer that zlib-compresses payloads of at least `min_size` bytes."""
+
+    def __init__(
+        self,
+        serde: SerializerProtocol = JsonPlusSerializer(),
+        min_size: int = 512,
+        level: int = 6,
+    ):
+        self.serde = serde
+        self.min_size = min_size
+        self.level = level
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.serde.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self.serde.loads(data)
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        typ, data = self.serde.dumps_typed(obj)
+        if len(data) < self.min_size:
+            return typ, data
+        return typ + COMPRESSED_SUFFIX, zlib.compress(data, self.level)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        typ, payload = data
+        if typ.endswith(COMPRESSED_SUFFIX):
+            typ = typ[: -len(COMPRESSED_SUFFIX)]
+            payload = zlib.decompress(payload)
+        return self.serde.loads_typed((typ, payload))
+
+
+CHECKPOINT_COLUMNS = (
+    "thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+    "type, checkpoint, metadata_type, metadata, created_at"
+)
+UPSERT_CHECKPOINT = f"""
+    INSERT INTO checkpoints ({CHECKPOINT_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id) DO UPDATE SET
+        type = excluded.type,
+        checkpoint = excluded.checkpoint,
+        metadata_type = excluded.metadata_type,
+        metadata = excluded.metadata,
+        created_at = excluded.created_at
+"""
+WRITE_COLUMNS = (
+    "thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, "
+    "task_path"
+)
+INSERT_WRITE = f"""
+    INSERT INTO checkpoint_writes ({WRITE_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id, task_id, idx) DO NOTHING
+"""
+# Special writes (errors, interrupts) use negative indexes and are overwritten.
+UPSERT_WRITE = f"""
+    INSERT INTO checkpoint_writes ({WRITE_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id, task_id, idx) DO UPDATE SET
+        channel = excluded.channel,
+        type = excluded.type,
+        value = excluded.value,
+        task_path = excluded.task_path
+"""
+SELECT_WRITES = """
+    SELECT task_id, channel, type, value FROM checkpoint_writes
+    WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?
+    ORDER BY task_id, idx
+"""
+PRUNE_CHECKPOINTS = """
+    DELETE FROM checkpoints
+    WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (
+        SELECT checkpoint_id FROM checkpoints
+        WHERE thread_id = ? AND checkpoint_ns = ?
+        ORDER BY checkpoint_id DESC LIMIT ?
+    )
+"""
+PRUNE_WRITES = """
+    DELETE FROM checkpoint_writes
+    WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (
+        SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+    )
+"""
+IDLE_THREADS = """
+    SELECT thread_id FROM checkpoints
+    GROUP BY thread_id HAVING MAX(created_at) < ?
+"""
+DELETE_THREAD_WRITES = "DELETE FROM checkpoint_writes WHERE thread_id = ?"
+DELETE_THREAD_CHECKPOINTS = "DELETE FROM checkpoints WHERE thread_id = ?"
+
+
+class CheckpointBackend(ABC):
+    """
+    Storage for the durable checkpointer. Both backends share the same SQL,
+    written with `?` placeholders; only the schema and the driver calls differ.
+    """
+
+    schema: Sequence[str] = ()
+
+    @abstractmethod
+    async def _execute_many(
+        self, statements: list[tuple[str, Optional[list[tuple]]]]
+    ) -> None:
+        """Run every (sql, rows) pair in one transaction; `None` rows runs it once."""
+
+    @abstractmethod
+    async def _fetch(self, query: str, params: tuple = ()) -> list[dict]:
+        pass
+
+    async def setup(self) -> None:
+        await self._execute_many([(statement, None) for statement in self.schema])
+
+    async def close(self) -> None:
+        pass
+
+    async def write_batch(self, checkpoints: list[tuple], writes: list[tuple]) -> None:
+        statements = [(UPSERT_CHECKPOINT, checkpoints)]
+        statements.append((INSERT_WRITE, [w for w in writes if w[4] >= 0]))
+        statements.append((UPSERT_WRITE, [w for w in writes if w[4] < 0]))
+        await self._execute_many([(sql, rows) for sql, rows in statements if rows])
+
+    async def prune(self, keys: set[tuple[str, str]], keep_last: int) -> None:
+        statements = []
+        for thread_id, checkpoint_ns in keys:
+            key = (thread_id, checkpoint_ns)
+            statements.append((PRUNE_CHECKPOINTS, [key + key + (keep_last,)]))
+            statements.append((PRUNE_WRITES, [key + key]))
+        if statements:
+            await self._execute_many(statements)
+
+    async def get_writes(
+        self, thread_id: str, checkpoint_ns: str, checkpoint_id: str
+    ) -> list[dict]:
+        return await self._fetch(
+            SELECT_WRITES, (thread_id, checkpoint_ns, checkpoint_id)
+        )
+
+    async def list_checkpoints(
+        self,
+        thread_id: Optional[str] = None,
+        checkpoint_ns: Optional[str] = None,
+        checkpoint_id: Optional[str] = None,
+        before: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        conditions, params = [], []
+        for column, operator, value in (
+            ("thread_id", "=", thread_id),
+            ("checkpoint_ns", "=", checkpoint_ns),
+            ("checkpoint_id", "=", checkpoint_id),
+            ("checkpoint_id", "<", before),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+        query = f"SELECT {CHECKPOINT_COLUMNS} FROM checkpoints"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY checkpoint_id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return await self._fetch(query, tuple(params))
+
+    async def delete_threads(self, thread_ids: list[str]) -> None:
+        rows = [(thread_id,) for thread_id in thread_ids]
+        if rows:
+            await self._execute_many(
+                [(DELETE_THREAD_WRITES, rows), (DELETE_THREAD_CHECKPOINTS, rows)]
+            )
+
+    async def expire(self, cutoff: float) -> list[str]:
+        rows = await self._fetch(IDLE_THREADS, (cutoff,))
+        thread_ids = [row["thread_id"] for row in rows]
+        await self.delete_threads(thread_ids)
+        return thread_ids
+
+
+class SQLiteCheckpointBackend(CheckpointBackend):
+    """Checkpoint storage on a `SQLitePool`; queries run on the pool's executor."""
+
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            thread_id TEXT NOT NULL,
+            checkpoint_ns TEXT NOT NULL DEFAULT '',
+            checkpoint_id TEXT NOT NULL,
+            parent_checkpoint_id TEXT,
+            type TEXT,
+            checkpoint BLOB,
+            metadata_type TEXT,
+            metadata BLOB,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS checkpoint_writes (
+            thread_id TEXT NOT NULL,
+            checkpoint_ns TEXT NOT NULL DEFAULT '',
+            checkpoint_id TEXT NOT NULL,
+            task_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            channel TEXT NOT NULL,
+            type TEXT,
+            value BLOB,
+            task_path TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+        )
+        """,
+    )
+
+    def __init__(self, pool: SQLitePool):
+        self.pool = pool
+
+    def _execute_many_sync(
+        self, statements: list[tuple[str, Optional[list[tuple]]]]
+    ) -> None:
+        with self.pool.connection() as conn:
+            for query, rows in statements:
+                if rows is None:
+                    conn.execute(query)
+                else:
+                    conn.executemany(query, rows)
+
+    def _fetch_sync(self, query: str, params: tuple) -> list[dict]:
+        with self.pool.connection() as conn:
+            cursor = conn.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    async def _execute_many(
+        self, statements: list[tuple[str, Optional[list[tuple]]]]
+    ) -> None:
+        await self.pool.run(self._execute_many_sync, statements)
+
+    async def _fetch(self, query: str, params: tuple = ()) -> list[dict]:
+        return await self.pool.run(self._fetch_sync, query, params)
+
+    async def close(self) -> None:
+        self.pool.close()
+
+
+def to_postgres_placeholders(query: str) -> str:
+    """Rewrite `?` placeholders into asyncpg's numbered `$n` style."""
+    counter = iter(range(1, query.count("?") + 1))
+    return re.sub(r"\?", lambda _: f"${next(counter)}", query)
+
+
+class PostgresCheckpointBackend(CheckpointBackend):
+    """Checkpoint storage on the shared `AsyncPostgresClient` pool."""
+
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            thread_id TEXT NOT NULL,
+            checkpoint_ns TEXT NOT NULL DEFAULT '',
+            checkpoint_id TEXT NOT NULL,
+            parent_checkpoint_id TEXT,
+            type TEXT,
+            checkpoint BYTEA,
+            metadata_type TEXT,
+            metadata BYTEA,
+            created_at DOUBLE PRECISION NOT NULL,
+            PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS checkpoint_writes (
+            thread_id TEXT NOT NULL,
+            checkpoint_ns TEXT NOT NULL DEFAULT '',
+            checkpoint_id TEXT NOT NULL,
+            task_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            channel TEXT NOT NULL,
+            type TEXT,
+            value BYTEA,
+            task_path TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+        )
+        """,
+    )
+
+    def __init__(self, client: AsyncPostgresClient):
+        self.client = client
+
+    async def setup(self) -> None:
+        if self.client.pool is None:
+            await self.client.connect()
+        await super().setup()
+
+    async def _execute_many(
+        self, statements: list[tuple[str, Optional[list[tuple]]]]
+    ) -> None:
+        await self.client.execute_batch(
+            [(to_postgres_placeholders(query), rows) for query, rows in statements]
+        )
+
+    async def _fetch(self, query: str, params: tuple = ()) -> list[dict]:
+        return await self.client.fetch_all(to_postgres_placeholders(query), params)
+
+    async def close(self) -> None:
+        if self.client.pool is not None:
+            await self.client.close()
+
+
+class DurableCheckpointSaver(BaseCheckpointSaver[int]):
+    """
+    LangGraph checkpointer persisted in SQLite or Postgres.
+
+    Checkpoints and pending writes are buffered and written in batches, either
+    when `batch_size` rows are waiting, every `flush_interval` seconds, or
+    before any read, so a worker always reads its own writes. After each flush
+    only the last `keep_last` checkpoints of every touched thread are kept, and
+    threads without a new checkpoint for `thread_ttl` seconds are deleted.
+    Blobs are serialized with `CompressedSerializer`.
+
+    The saver is asyncio-native and its backend lives on a single event loop:
+    the running loop of its first async use, or a dedicated background loop
+    started by the first sync call made while no loop owns it. Calls from any
+    other loop or thread are forwarded to that loop, so pooled connections
+    never cross loops.
+
+    Args:
+        backend (CheckpointBackend): Storage backend.
+        keep_last (int): Checkpoints kept per thread and namespace.
+        thread_ttl (Optional[float]): Idle seconds before a thread expires. `None` keeps threads.
+        flush_interval (float): Maximum seconds a write waits in the buffer.
+        batch_size (int): Buffered rows that trigger an immediate flush.
+        expire_interval (float): Seconds between idle thread sweeps.
+        serde (Optional[SerializerProtocol]): Serializer, compressed JSON+ by default.
+    """
+
+    def __init__(
+        self,
+        backend: CheckpointBackend,
+        keep_last: int = 10,
+        thread_ttl: Optional[float] = 7 * 24 * 3600,
+        flush_interval: float = 0.5,
+        batch_size: int = 64,
+        expire_interval: float = 300.0,
+        serde: Optional[SerializerProtocol] = None,
+    ):
+        super().__init__(serde=serde or CompressedSerializer())
+        if keep_last < 1:
+            raise ValueError("keep_last must be at least 1.")
+        self.backend = backend
+        self.keep_last = keep_last
+        self.thread_ttl = thread_ttl
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.expire_interval = expire_interval
+
+        self._checkpoints: list[tuple] = []
+        self._writes: list[tuple] = []
+        self._buffer_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._loop_lock = threading.Lock()
+        self._background: Optional[asyncio.AbstractEventLoop] = None
+        self._background_thread: Optional[threading.Thread] = None
+        self._setup_done = False
+        self._flusher: Optional[asyncio.Task] = None
+        self._last_expiry = 0.0
+
+    # ----------------------------------------------------------------- lifecycle
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._flush_lock = asyncio.Lock()
+        self._flusher = None
+
+    def _owner_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """The loop the backend is bound to, if it is still usable."""
+        loop = self._loop
+        if loop is not None and (loop.is_running() or loop is self._background):
+            return loop
+        return None
+
+    def _start_background_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.new_event_loop()
+        self._background = loop
+        self._background_thread = threading.Thread(
+            target=loop.run_forever, name="checkpointer", daemon=True
+        )
+        self._background_thread.start()
+        self._bind(loop)
+        return loop
+
+    def _stop_background_loop(self) -> None:
+        loop, self._background = self._background, None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        self._background_thread.join()
+        loop.close()
+        self._loop = None
+
+    async def _on_owner_loop(self, coro):
+        """Await `coro` on the loop the backend is bound to."""
+        owner = self._owner_loop()
+        if owner is None or owner is asyncio.get_running_loop():
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, owner))
+
+    async def _ensure_ready(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or the loop it was bound to has stopped
+            self._bind(loop)
+        if not self._setup_done:
+            async with self._flush_lock:
+                if not self._setup_done:
+                    await self.backend.setup()
+                    self._setup_done = True
+                    logger.info(f"Checkpointer ready on {type(self.backend).__name__}")
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self._flush()
+                if (
+                    self.thread_ttl is not None
+                    and time.time() - self._last_expiry >= self.expire_interval
+                ):
+                    await self._expire_idle_threads()
+            except Exception as e:
+                logger.error(f"Checkpoint flush failed: {e}")
+
+    async def flush(self) -> None:
+        """Write every buffered checkpoint and write, then apply retention."""
+        await self._on_owner_loop(self._flush())
+
+    async def _flush(self) -> None:
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            with self._buffer_lock:
+                checkpoints, self._checkpoints = self._checkpoints, []
+                writes, self._writes = self._writes, []
+            if not checkpoints and not writes:
+                return
+            try:
+                await self.backend.write_batch(checkpoints, writes)
+            except Exception:
+                # Put the rows back so the next flush retries them in order
+                with self._buffer_lock:
+                    self._checkpoints[:0] = checkpoints
+                    self._writes[:0] = writes
+                raise
+            await self.backend.prune(
+                {(row[0], row[1]) for row in checkpoints}, self.keep_last
+            )
+
+    async def expire_idle_threads(self) -> list[str]:
+        return await self._on_owner_loop(self._expire_idle_threads())
+
+    async def _expire_idle_threads(self) -> list[str]:
+        self._last_expiry = time.time()
+        await self._flush()
+        expired = await self.backend.expire(time.time() - self.thread_ttl)
+        if expired:
+            logger.info(f"Expired {len(expired)} idle checkpoint threads")
+        return expired
+
+    async def aclose(self) -> None:
+        await self._on_owner_loop(self._close())
+        self._stop_background_loop()
+
+    def close(self) -> None:
+        """Sync counterpart of `aclose`."""
+        if self._owner_loop() is not None:
+            self._run_sync(self._close())
+        else:
+            asyncio.run(self._close())
+        self._stop_background_loop()
+
+    async def _close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        if self._setup_done:
+            await self._flush()
+        await self.backend.close()
+
+    async def _enqueue(self, checkpoints: list[tuple], writes: list[tuple]) -> None:
+        await self._ensure_ready()
+        with self._buffer_lock:
+            self._checkpoints.extend(checkpoints)
+            self._writes.extend(writes)
+            pending = len(self._checkpoints) + len(self._writes)
+        if pending >= self.batch_size:
+            await self._flush()
+
+    def _run_sync(self, coro):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        with self._loop_lock:
+            owner = self._owner_loop() or self._start_background_loop()
+        if running is owner:
+            coro.close()
+            raise asyncio.InvalidStateError(
+                "Synchronous checkpointer calls are not allowed from the event "
+                "loop thread; use ainvoke/astream instead."
+            )
+        return asyncio.run_coroutine_threadsafe(coro, owner).result()
+
+    # --------------------------------------------------------------- conversion
+
+    def _to_tuple(self, row: dict, writes: list[dict]) -> CheckpointTuple:
+        thread_id, checkpoint_ns = row["thread_id"], row["checkpoint_ns"]
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": row["checkpoint_id"],
+                }
+            },
+            checkpoint=self.serde.loads_typed((row["type"], row["checkpoint"])),
+            metadata=self.serde.loads_typed((row["metadata_type"], row["metadata"])),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": row["parent_checkpoint_id"],
+                    }
+                }
+                if row["parent_checkpoint_id"]
+                else None
+            ),
+            pending_writes=[
+                (
+                    write["task_id"],
+                    write["channel"],
+                    self.serde.loads_typed((write["type"], write["value"])),
+                )
+                for write in writes
+            ],
+        )
+
+    # ---------------------------------------------------------------- async API
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await self._on_owner_loop(self._aget_tuple(config))
+
+    async def _aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        await self._ensure_ready()
+        await self._flush()
+        configurable = config["configurable"]
+        rows = await self.backend.list_checkpoints(
+            thread_id=configurable["thread_id"],
+            checkpoint_ns=configurable.get("checkpoint_ns", ""),
+            checkpoint_id=get_checkpoint_id(config),
+            limit=1,
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        writes = await self.backend.get_writes(
+            row["thread_id"], row["checkpoint_ns"], row["checkpoint_id"]
+        )
+        return self._to_tuple(row, writes)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await self._on_owner_loop(self._alist(config, filter, before, limit))
+        for item in items:
+            yield item
+
+    async def _alist(
+        self,
+        config: Optional[RunnableConfig],
+        filter: Optional[dict[str, Any]],
+        before: Optional[RunnableConfig],
+        limit: Optional[int],
+    ) -> list[CheckpointTuple]:
+        await self._ensure_ready()
+        await self._flush()
+        configurable = config["configurable"] if config else {}
+        rows = await self.backend.list_checkpoints(
+            thread_id=configurable.get("thread_id"),
+            checkpoint_ns=configurable.get("checkpoint_ns"),
+            checkpoint_id=get_checkpoint_id(config) if config else None,
+            before=get_checkpoint_id(before) if before else None,
+            # Metadata filters are applied after decoding
+            limit=None if filter else limit,
+        )
+        items = []
+        for row in rows:
+            if limit is not None and limit <= 0:
+                break
+            if filter:
+                metadata = self.serde.loads_typed(
+                    (row["metadata_type"], row["metadata"])
+                )
+                if not all(metadata.get(k) == v for k, v in filter.items()):
+                    continue
+            if limit is not None:
+                limit -= 1
+            writes = await self.backend.get_writes(
+                row["thread_id"], row["checkpoint_ns"], row["checkpoint_id"]
+            )
+            items.append(self._to_tuple(row, writes))
+        return items
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await self._on_owner_loop(self._aput(config, checkpoint, metadata))
+
+    async def _aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+    ) -> RunnableConfig:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        type_, data = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_data = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        row = (
+            thread_id,
+            checkpoint_ns,
+            checkpoint["id"],
+            configurable.get("checkpoint_id"),
+            type_,
+            data,
+            metadata_type,
+            metadata_data,
+            time.time(),
+        )
+        await self._enqueue([row], [])
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await self._on_owner_loop(self._aput_writes(config, writes, task_id, task_path))
+
+    async def _aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str,
+    ) -> None:
+        configurable = config["configurable"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self.serde.dumps_typed(value)
+            rows.append(
+                (
+                    configurable["thread_id"],
+                    configurable.get("checkpoint_ns", ""),
+                    configurable["checkpoint_id"],
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    type_,
+                    data,
+                    task_path,
+                )
+            )
+        await self._enqueue([], rows)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self._on_owner_loop(self._adelete_thread(thread_id))
+
+    async def _adelete_thread(self, thread_id: str) -> None:
+        await self._ensure_ready()
+        await self._flush()
+        await self.backend.delete_threads([thread_id])
+
+    # ----------------------------------------------------------------- sync API
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self._run_sync(self._aget_tuple(config))
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        yield from self._run_sync(self._alist(config, filter, before, limit))
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self._run_sync(self._aput(config, checkpoint, metadata))
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        return self._run_sync(self._aput_writes(config, writes, task_id, task_path))
+
+    def delete_thread(self, thread_id: str) -> None:
+        return self._run_sync(self._adelete_thread(thread_id))
@@ -0,0 +1,136 @@
+import re
+import sqlite3
+from typing import Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Catalog table -> columns indexed in its external-content FTS5 table
+FTS_TABLES = {
+    "hotels": ("name", "location"),
+    "car_rentals": ("name", "location", "price_tier"),
+    "trip_recommendations": ("name", "location", "keywords", "details"),
+}
+
+
+def fts_table(table: str) -> str:
+    return f"{table}_fts"
+
+
+def _trigger_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def create_fts_tables(conn: sqlite3.Connection) -> None:
+    """
+    Create the FTS5 indexes over the catalog tables and the triggers that keep
+    them in sync. The index is rebuilt when its triggers are missing, which is the
+    case on first run and after `populate_db` replaced the base table.
+    """
+    for table, columns in FTS_TABLES.items():
+        fts = fts_table(table)
+        cols = ", ".join(columns)
+        new_cols = ", ".join(f"new.{col}" for col in columns)
+        old_cols = ", ".join(f"old.{col}" for col in columns)
+        stale = not _trigger_exists(conn, f"{fts}_ai")
+
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{cols}, content='{table}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+            f"VALUES ('delete', old.id, {old_cols}); END"
+        )
+        # Only changes to indexed columns touch the FTS index, so booking
+        # updates (`booked = 1`) stay cheap.
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF id, {cols} "
+            f"ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+            f"VALUES ('delete', old.id, {old_cols}); "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+        )
+        if stale:
+            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            logger.info(f"Rebuilt full-text index {fts}")
+
+
+def _terms(text: str) -> list[str]:
+    # Quoting every token keeps user input from being parsed as FTS5 syntax
+    return [f'"{token}"*' for token in TOKEN_RE.findall(text.lower())]
+
+
+def build_match(
+    all_terms: Optional[dict[str, Optional[str]]] = None,
+    any_terms: Optional[dict[str, Optional[str]]] = None,
+) -> Optional[str]:
+    """
+    Build an FTS5 MATCH expression with prefix matching on every token.
+
+    Args:
+        all_terms: Column -> text whose tokens must all match in that column.
+        any_terms: Column -> comma-separated values of which at least one must
+            match in that column.
+
+    Returns:
+        Optional[str]: The MATCH expression, or None when there is nothing to match.
+    """
+    clauses = []
+    for column, text in (all_terms or {}).items():
+        terms = _terms(text or "")
+        if terms:
+            clauses.append(f"{column} : ({' AND '.join(terms)})")
+    for column, text in (any_terms or {}).items():
+        phrases = [
+            " AND ".join(terms)
+            for terms in (_terms(value) for value in (text or "").split(","))
+            if terms
+        ]
+        if phrases:
+            clauses.append(f"{column} : (({') OR ('.join(phrases)}))")
+    return " AND ".join(clauses) if clauses else None
+
+
+def catalog_search_query(
+    table: str,
+    match: Optional[str],
+    conditions: Optional[list[tuple[str, object]]] = None,
+) -> tuple[str, list]:
+    """
+    Build a catalog search that goes through the FTS5 index when there is text to
+    match, ranked by BM25, with extra `(sql, param)` conditions on the base table.
+    """
+    params: list = []
+    if match is None:
+        query = f"SELECT {table}.* FROM {table} WHERE 1=1"
+    else:
+        fts = fts_table(table)
+        query = (
+            f"SELECT {table}.* FROM {fts} JOIN {table} ON {table}.id = {fts}.rowid "
+            f"WHERE {fts} MATCH ?"
+        )
+        params.append(match)
+
+    for condition, param in conditions or []:
+        query += f" AND {table}.{condition}"
+        params.append(param)
+
+    # A deterministic order keeps offset-based pages stable
+    if match is not None:
+        query += f" ORDER BY bm25({fts_table(table)}), {table}.id"
+    else:
+        query += f" ORDER BY {table}.id"
+    return query, params
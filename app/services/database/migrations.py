@@ -0,0 +1,82 @@
+import re
+import sqlite3
+
+from app.services.database.fts import create_fts_tables
+from app.utils.exceptions import QueryPlanError
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+# `populate_db.update_dates` rewrites every table with `to_sql(if_exists="replace")`,
+# which drops all indexes, so they are (re)created on every startup.
+INDEXES = {
+    "idx_tickets_passenger_id": "tickets(passenger_id)",
+    "idx_tickets_ticket_no": "tickets(ticket_no)",
+    "idx_ticket_flights_ticket_no": "ticket_flights(ticket_no)",
+    "idx_ticket_flights_flight_id": "ticket_flights(flight_id)",
+    "idx_boarding_passes_flight_id": "boarding_passes(flight_id)",
+    "idx_flights_flight_id": "flights(flight_id)",
+    "idx_flights_route_departure": (
+        "flights(departure_airport, arrival_airport, scheduled_departure)"
+    ),
+    "idx_hotels_id": "hotels(id)",
+    "idx_car_rentals_id": "car_rentals(id)",
+    "idx_trip_recommendations_id": "trip_recommendations(id)",
+}
+
+# "SCAN flights" or "SCAN f" is a full table scan; "SCAN f USING INDEX ..." and
+# "SEARCH ..." steps are index driven.
+TABLE_SCAN_RE = re.compile(r"^SCAN (?!CONSTANT ROW)\S+(?: AS \S+)?$")
+
+
+def apply_migrations(conn: sqlite3.Connection) -> None:
+    """
+    Create the indexes and full-text tables the tool queries rely on. Safe to
+    run repeatedly.
+    """
+    for name, target in INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    create_fts_tables(conn)
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+    logger.info(f"Applied {len(INDEXES)} index migrations")
+
+
+def explain_query_plan(conn: sqlite3.Connection, query: str, params=()) -> list[str]:
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def verify_query_plans(
+    conn: sqlite3.Connection, queries: dict[str, tuple], strict: bool = False
+) -> None:
+    """
+    Run `EXPLAIN QUERY PLAN` on each query and report any step that is a table
+    scan: a warning by default, an error when `strict`.
+
+    Args:
+        conn: Connection to the travel database.
+        queries: Mapping of a query name to its SQL and sample parameters.
+        strict: Raise instead of logging a warning.
+
+    Raises:
+        QueryPlanError: If `strict` and one or more queries scan a whole table.
+    """
+    scans = {}
+    for name, (query, params) in queries.items():
+        try:
+            plan = explain_query_plan(conn, query, params)
+        except sqlite3.OperationalError as e:
+            # e.g. the full-text tables do not exist yet
+            scans[name] = [f"cannot plan: {e}"]
+            continue
+        steps = [step for step in plan if TABLE_SCAN_RE.match(step)]
+        if steps:
+            scans[name] = steps
+    if scans:
+        error = QueryPlanError(scans)
+        if strict:
+            raise error
+        logger.warning(str(error))
+        return
+    logger.info(f"Verified query plans for {len(queries)} queries")
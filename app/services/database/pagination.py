@@ -0,0 +1,104 @@
+import base64
+import binascii
+import hashlib
+import json
+import sqlite3
+from typing import Optional
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 50
+# Counting stops here so a broad search never pays for a full count
+COUNT_CAP = 1000
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def _fingerprint(query: str, params: list) -> str:
+    return hashlib.sha1(repr((query, list(params))).encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(offset: int, query: str, params: list) -> str:
+    payload = json.dumps({"o": offset, "q": _fingerprint(query, params)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, query: str, params: list) -> int:
+    """
+    Return the offset stored in `cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to a different search.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        offset = int(payload["o"])
+        fingerprint = payload["q"]
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor. Repeat the search without a cursor.")
+    if fingerprint != _fingerprint(query, params) or offset < 0:
+        raise ValueError(
+            "The cursor belongs to a different search. Use the same filters as the "
+            "search that returned it."
+        )
+    return offset
+
+
+def paginate(
+    conn: sqlite3.Connection,
+    query: str,
+    params: list,
+    columns: list[str],
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    Run one page of a search, projected to `columns`.
+
+    Args:
+        conn: Database connection.
+        query: The search query; its order defines the pages.
+        params: Parameters of the search query.
+        columns: Columns returned for each row.
+        limit: Page size, clamped to `MAX_PAGE_SIZE`.
+        cursor: `next_cursor` of the previous page.
+
+    Returns:
+        dict: `results` for this page, `total` matches (capped at `COUNT_CAP`,
+        flagged by `total_capped`) and `next_cursor`, None on the last page.
+    """
+    page_size = clamp_page_size(limit)
+    offset = decode_cursor(cursor, query, params) if cursor else 0
+    projection = ", ".join(columns)
+
+    rows = conn.execute(
+        f"SELECT {projection} FROM ({query}) LIMIT ? OFFSET ?",
+        [*params, page_size + 1, offset],
+    ).fetchall()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if offset == 0 and not has_more:
+        total = len(rows)
+    else:
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM ({query} LIMIT ?)", [*params, COUNT_CAP]
+        ).fetchone()[0]
+
+    page = {
+        "results": [dict(zip(columns, row)) for row in rows],
+        "total": total,
+        "next_cursor": (
+            encode_cursor(offset + page_size, query, params) if has_more else None
+        ),
+    }
+    if total >= COUNT_CAP:
+        page["total_capped"] = True
+    return page
+
+
+def empty_page() -> dict:
+    return {"results": [], "total": 0, "next_cursor": None}
@@ -0,0 +1,216 @@
+import asyncio
+import contextvars
+import functools
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+
+@dataclass
+class PoolStats:
+    size: int
+    created: int
+    in_use: int
+    peak_in_use: int
+    acquisitions: int
+    waits: int
+    total_wait_seconds: float
+
+    @property
+    def utilization(self) -> float:
+        return self.in_use / self.size if self.size else 0.0
+
+
+class SQLitePool:
+    """
+    Bounded pool of tuned SQLite connections shared by all the tools.
+
+    Connections are opened lazily up to `size`, run in WAL mode so readers do not
+    block the writer, and keep a per-connection prepared statement cache. Async
+    callers run their blocking work on a dedicated executor with one thread per
+    connection, so database calls never queue behind the event loop's default
+    executor.
+
+    Args:
+        db_path (str): Path of the SQLite database.
+        size (int): Maximum number of open connections.
+        acquire_timeout (float): Seconds to wait for a free connection.
+        cache_size_kib (int): Page cache size per connection, in KiB.
+        mmap_size (int): Bytes of the database file to memory-map.
+        cached_statements (int): Prepared statements cached per connection.
+        busy_timeout_ms (int): How long a statement waits on a locked database.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        size: int = 8,
+        acquire_timeout: float = 30.0,
+        cache_size_kib: int = 64 * 1024,
+        mmap_size: int = 256 * 1024 * 1024,
+        cached_statements: int = 256,
+        busy_timeout_ms: int = 5000,
+    ):
+        if size <= 0:
+            raise ValueError("size must be positive.")
+        self.db_path = db_path
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._acquisitions = 0
+        self._waits = 0
+        self._total_wait_seconds = 0.0
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="sqlite-pool"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            timeout=self.busy_timeout_ms / 1000,
+            cached_statements=self.cached_statements,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise sqlite3.ProgrammingError("The connection pool is closed.")
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except sqlite3.Error:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                start = time.perf_counter()
+                try:
+                    conn = self._idle.get(timeout=self.acquire_timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        "Timed out waiting for a database connection."
+                    )
+                finally:
+                    with self._lock:
+                        self._waits += 1
+                        self._total_wait_seconds += time.perf_counter() - start
+
+        with self._lock:
+            self._acquisitions += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+        return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._in_use -= 1
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection. Like `with sqlite3.connect(...)`, the transaction is
+        committed on success and rolled back on error.
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+
+    def warm_up(self) -> int:
+        """
+        Open every connection ahead of the first request so the PRAGMA setup and
+        mmap happen at startup. Returns the number of connections warmed.
+        """
+        borrowed = []
+        try:
+            while len(borrowed) < self.size and self._created < self.size:
+                borrowed.append(self._acquire())
+            for conn in borrowed:
+                conn.execute("SELECT 1").fetchone()
+        finally:
+            for conn in borrowed:
+                self._release(conn)
+        return len(borrowed)
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking database function on the pool's executor. The thread
+        cannot be interrupted, so a cancelled call ends when the function does.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        future = loop.run_in_executor(
+            self._executor, functools.partial(context.run, func, *args, **kwargs)
+        )
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            raise
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                size=self.size,
+                created=self._created,
+                in_use=self._in_use,
+                peak_in_use=self._peak_in_use,
+                acquisitions=self._acquisitions,
+                waits=self._waits,
+                total_wait_seconds=self._total_wait_seconds,
+            )
+
+    def close(self) -> None:
+        """Close the idle connections; borrowed ones are closed when released."""
+        self._closed = True
+        self._executor.shutdown(wait=False)
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        logger.info(f"SQLite pool closed: {self.stats()}")
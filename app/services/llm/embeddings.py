@@ -0,0 +1,243 @@
+import asyncio
+import hashlib
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import openai
+
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# OpenAI limits: 2048 inputs and 300k tokens per embeddings request
+MAX_BATCH_SIZE = 2048
+MAX_BATCH_TOKENS = 300_000
+
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used to size batches."""
+    return len(text) // 4 + 1
+
+
+def batch_texts(
+    texts: list[str],
+    max_batch_size: int = MAX_BATCH_SIZE,
+    max_batch_tokens: int = MAX_BATCH_TOKENS,
+) -> list[list[str]]:
+    """Split `texts` into consecutive batches that respect both request limits."""
+    batches: list[list[str]] = []
+    current: list[str] = []
+    current_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and (
+            len(current) >= max_batch_size or current_tokens + tokens > max_batch_tokens
+        ):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+@dataclass
+class EmbeddingMetrics:
+    requests: int = 0
+    texts: int = 0
+    retries: int = 0
+    failures: int = 0
+    total_seconds: float = 0.0
+
+    @property
+    def avg_request_seconds(self) -> float:
+        return self.total_seconds / self.requests if self.requests else 0.0
+
+
+class EmbeddingProvider(ABC):
+    """Turns texts into embedding vectors, one row per text."""
+
+    model: str
+
+    def __init__(self):
+        self.metrics = EmbeddingMetrics()
+        self._metrics_lock = threading.Lock()
+
+    def _record(self, texts: int, seconds: float) -> None:
+        with self._metrics_lock:
+            self.metrics.requests += 1
+            self.metrics.texts += texts
+            self.metrics.total_seconds += seconds
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> np.ndarray:
+        pass
+
+    async def aembed(self, texts: list[str]) -> np.ndarray:
+        return await asyncio.to_thread(self.embed, texts)
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """
+    OpenAI embeddings with request batching, bounded concurrency and retries.
+
+    Args:
+        client: `openai.OpenAI` client used by `embed`.
+        async_client: `openai.AsyncOpenAI` client used by `aembed`.
+        model (str): Embedding model name.
+        max_batch_size (int): Maximum inputs per request.
+        max_batch_tokens (int): Maximum estimated tokens per request.
+        max_concurrency (int): Maximum requests in flight.
+        max_retries (int): Retries of a batch on transient API errors.
+        backoff (float): Base delay in seconds, doubled on every retry.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        async_client=None,
+        model: str = EMBEDDING_MODEL,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_batch_tokens: int = MAX_BATCH_TOKENS,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+    ):
+        super().__init__()
+        self._client = client
+        self._async_client = async_client
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _batches(self, texts: list[str]) -> list[list[str]]:
+        return batch_texts(texts, self.max_batch_size, self.max_batch_tokens)
+
+    def _on_retry(self, attempt: int, error: Exception) -> float:
+        with self._metrics_lock:
+            self.metrics.retries += 1
+        delay = self.backoff * 2**attempt
+        logger.warning(f"Embeddings request failed ({error}), retrying in {delay}s")
+        return delay
+
+    def _on_failure(self) -> None:
+        with self._metrics_lock:
+            self.metrics.failures += 1
+
+    def _embed_batch(self, batch: list[str]) -> list[list[float]]:
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                response = self._client.embeddings.create(model=self.model, input=batch)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    self._on_failure()
+                    raise
+                time.sleep(self._on_retry(attempt, e))
+                continue
+            self._record(len(batch), time.perf_counter() - start)
+            return [emb.embedding for emb in response.data]
+
+    async def _aembed_batch(self, batch: list[str]) -> list[list[float]]:
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await self._async_client.embeddings.create(
+                        model=self.model, input=batch
+                    )
+                except RETRYABLE_ERRORS as e:
+                    if attempt == self.max_retries:
+                        self._on_failure()
+                        raise
+                    delay = self._on_retry(attempt, e)
+                else:
+                    self._record(len(batch), time.perf_counter() - start)
+                    return [emb.embedding for emb in response.data]
+            await asyncio.sleep(delay)
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        if self._client is None:
+            raise RuntimeError("OpenAIEmbeddingProvider has no sync client configured.")
+        batches = self._batches(texts)
+        if len(batches) <= 1 or self.max_concurrency <= 1:
+            results = [self._embed_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                results = list(executor.map(self._embed_batch, batches))
+        return np.array(
+            [vector for batch in results for vector in batch], dtype=np.float32
+        )
+
+    async def aembed(self, texts: list[str]) -> np.ndarray:
+        if self._async_client is None:
+            return await super().aembed(texts)
+        results = await asyncio.gather(
+            *(self._aembed_batch(batch) for batch in self._batches(texts))
+        )
+        return np.array(
+            [vector for batch in results for vector in batch], dtype=np.float32
+        )
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic local embeddings built by feature hashing of word unigrams and
+    character trigrams. Needs no network, so it backs offline runs and benchmarks.
+
+    Args:
+        dim (int): Dimension of the vectors.
+    """
+
+    TOKEN_RE = re.compile(r"\w+")
+
+    def __init__(self, dim: int = 512):
+        super().__init__()
+        self.dim = dim
+        self.model = f"local-hashing-{dim}"
+
+    def _features(self, text: str) -> list[str]:
+        words = self.TOKEN_RE.findall(text.lower())
+        trigrams = [
+            f"#{word[i : i + 3]}"
+            for word in words
+            for i in range(max(1, len(word) - 2))
+        ]
+        return words + trigrams
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            # The lowest bit picks the sign so collisions tend to cancel out
+            vector[(value >> 1) % self.dim] += 1.0 if value & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        start = time.perf_counter()
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            vectors[i] = self._vector(text)
+        self._record(len(texts), time.perf_counter() - start)
+        return vectors
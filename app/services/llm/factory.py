@@ -0,0 +1,35 @@
+from app.config.settings import Settings
+from app.services.llm.embeddings import (
+    EmbeddingProvider,
+    HashingEmbeddingProvider,
+    OpenAIEmbeddingProvider,
+)
+
+
+def create_embedding_provider(settings: Settings) -> EmbeddingProvider:
+    """
+    Create the embeddings backend selected in the settings.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        EmbeddingProvider: `openai` for the OpenAI API, `local` for the offline
+        hashing embeddings.
+    """
+    if settings.embedding_provider == "local":
+        return HashingEmbeddingProvider(dim=settings.local_embedding_dim)
+    if settings.embedding_provider != "openai":
+        raise ValueError(f"Unknown embedding provider: {settings.embedding_provider}")
+
+    import openai
+
+    # The provider retries transient errors itself; client retries would multiply them
+    return OpenAIEmbeddingProvider(
+        client=openai.OpenAI(max_retries=0),
+        async_client=openai.AsyncOpenAI(max_retries=0),
+        model=settings.embedding_model,
+        max_batch_size=settings.embedding_batch_size,
+        max_concurrency=settings.embedding_concurrency,
+        max_retries=settings.embedding_max_retries,
+    )
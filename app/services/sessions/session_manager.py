@@ -0,0 +1,142 @@
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+from app.utils.exceptions import AuthenticationError, SessionError
+from app.utils.logger import get_logger
+from app.utils.tokens import sign_token, verify_token
+
+logger = get_logger(name=__name__)
+
+
+@dataclass
+class Session:
+    thread_id: str
+    passenger_id: str
+    resumed: bool = False
+    created_at: float = field(default_factory=time.time)
+    last_active: float = field(default_factory=time.time)
+    turns: int = 0
+
+    @property
+    def config(self) -> dict:
+        return {
+            "configurable": {
+                "passenger_id": self.passenger_id,
+                "thread_id": self.thread_id,
+            }
+        }
+
+    def touch(self) -> None:
+        self.turns += 1
+        self.last_active = time.time()
+
+
+class SessionManager:
+    """
+    Map WebSocket connections to LangGraph threads.
+
+    Each connection gets a fresh thread unless it presents a resume token
+    issued for the same passenger. A thread is served by one connection at a
+    time, so concurrent clients never interleave turns on the same checkpoint.
+    On disconnect the session is released; with a non-durable checkpointer its
+    checkpoints are deleted too, since nobody can resume them after a restart.
+
+    Args:
+        secret (str): HMAC key used to sign resume tokens.
+        token_ttl (Optional[float]): Seconds a resume token stays valid.
+        max_sessions (Optional[int]): Maximum number of concurrent sessions.
+        checkpointer (Optional[BaseCheckpointSaver]): Graph checkpointer to clean up.
+        delete_on_close (bool): Delete the thread's checkpoints on disconnect.
+        default_passenger_id (Optional[str]): Passenger of clients that send no
+            passenger token; `None` makes the token mandatory.
+        passenger_token_ttl (Optional[float]): Seconds a passenger token stays valid.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        token_ttl: Optional[float] = 24 * 3600,
+        max_sessions: Optional[int] = None,
+        checkpointer: Optional[BaseCheckpointSaver] = None,
+        delete_on_close: bool = False,
+        default_passenger_id: Optional[str] = None,
+        passenger_token_ttl: Optional[float] = 30 * 24 * 3600,
+    ):
+        self.secret = secret
+        self.token_ttl = token_ttl
+        self.max_sessions = max_sessions
+        self.checkpointer = checkpointer
+        self.delete_on_close = delete_on_close
+        self.default_passenger_id = default_passenger_id
+        self.passenger_token_ttl = passenger_token_ttl
+        self._sessions: dict[str, Session] = {}
+        self._lock = threading.Lock()
+
+    def open(self, passenger_id: str, resume_token: Optional[str] = None) -> Session:
+        """
+        Register a new session, resuming the thread of `resume_token` if given.
+
+        Raises:
+            SessionError: If the token is invalid, belongs to another passenger,
+                its thread is already connected, or the server is full.
+        """
+        thread_id, resumed = str(uuid.uuid4()), False
+        if resume_token:
+            try:
+                payload = verify_token(resume_token, self.secret, self.token_ttl)
+            except AuthenticationError as e:
+                raise SessionError(f"Cannot resume session: {e}") from e
+            if payload.get("passenger") != passenger_id or not payload.get("thread"):
+                raise SessionError("Resume token belongs to another passenger.")
+            thread_id, resumed = payload["thread"], True
+
+        with self._lock:
+            if thread_id in self._sessions:
+                raise SessionError("Session is already active on another connection.")
+            if (
+                self.max_sessions is not None
+                and len(self._sessions) >= self.max_sessions
+            ):
+                raise SessionError("Too many active sessions.")
+            session = Session(
+                thread_id=thread_id, passenger_id=passenger_id, resumed=resumed
+            )
+            self._sessions[thread_id] = session
+
+        logger.info(
+            f"{'Resumed' if resumed else 'Opened'} session {thread_id} "
+            f"for passenger_id: {passenger_id} ({len(self._sessions)} active)"
+        )
+        return session
+
+    def token(self, session: Session) -> str:
+        """Resume token for `session`, valid for `token_ttl` seconds."""
+        return sign_token(
+            {"thread": session.thread_id, "passenger": session.passenger_id},
+            self.secret,
+        )
+
+    async def close(self, session: Session) -> None:
+        with self._lock:
+            self._sessions.pop(session.thread_id, None)
+        if self.delete_on_close and self.checkpointer is not None:
+            await self.checkpointer.adelete_thread(session.thread_id)
+        logger.info(
+            f"Closed session {session.thread_id} after {session.turns} turns "
+            f"({len(self._sessions)} active)"
+        )
+
+    def get(self, thread_id: str) -> Optional[Session]:
+        return self._sessions.get(thread_id)
+
+    def active(self) -> list[Session]:
+        with self._lock:
+            return list(self._sessions.values())
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -0,0 +1,74 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\w+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from how i if in is it my of on or "
+    "that the this to was what when where which who will with you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    In-memory inverted index scored with Okapi BM25.
+
+    Args:
+        texts (list[str]): Documents to index; row `i` of the scores is document `i`.
+        k1 (float): Term frequency saturation.
+        b (float): Document length normalization.
+    """
+
+    def __init__(self, texts: list[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.size = len(texts)
+
+        postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        lengths = np.zeros(self.size, dtype=np.float32)
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lengths[doc_id] = sum(counts.values())
+            for term, tf in counts.items():
+                postings[term].append((doc_id, tf))
+
+        avg_length = float(lengths.mean()) if self.size else 0.0
+        # Per-document length factor of the BM25 denominator, computed once
+        self._norm = k1 * (1 - b + b * lengths / (avg_length or 1.0))
+        self._postings: dict[str, tuple[np.ndarray, np.ndarray, float]] = {}
+        for term, entries in postings.items():
+            doc_ids = np.array([doc_id for doc_id, _ in entries], dtype=np.int64)
+            tfs = np.array([tf for _, tf in entries], dtype=np.float32)
+            df = len(entries)
+            idf = math.log(1 + (self.size - df + 0.5) / (df + 0.5))
+            self._postings[term] = (doc_ids, tfs, idf)
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for `query`."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            doc_ids, tfs, idf = posting
+            scores[doc_ids] += idf * tfs * (self.k1 + 1) / (tfs + self._norm[doc_ids])
+        return scores
+
+    def coverage(self, query: str, doc_id: int) -> float:
+        """Fraction of the query terms that appear in the document."""
+        terms = set(tokenize(query))
+        if not terms:
+            return 0.0
+        matched = sum(
+            1
+            for term in terms
+            if term in self._postings and doc_id in self._postings[term][0]
+        )
+        return matched / len(terms)
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+
+class EmbeddingCache:
+    """
+    On-disk cache of document embeddings keyed by the content hash of each document.
+
+    The vectors live in a `.npy` matrix that is memory-mapped on load, and a JSON
+    manifest records the model and the hash of every row. Only documents whose
+    hash is not in the manifest are sent to the embeddings API.
+    """
+
+    MATRIX_FILE = "embeddings.npy"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, cache_dir: str, model: str):
+        self.cache_dir = Path(cache_dir)
+        self.model = model
+
+    @property
+    def matrix_path(self) -> Path:
+        return self.cache_dir / self.MATRIX_FILE
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.cache_dir / self.MANIFEST_FILE
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def load(self) -> tuple[list[str], Optional[np.ndarray]]:
+        """
+        Load the cached hashes and the memory-mapped matrix.
+
+        Returns:
+            tuple: The row hashes and the read-only matrix, or `([], None)` when the
+            cache is missing, corrupt or was built with another model.
+        """
+        if not self.manifest_path.exists() or not self.matrix_path.exists():
+            return [], None
+
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("model") != self.model:
+                logger.info(
+                    f"Embedding cache built with {manifest.get('model')}, expected {self.model}"
+                )
+                return [], None
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache: {e}")
+            return [], None
+
+        hashes = manifest.get("hashes", [])
+        if matrix.ndim != 2 or matrix.shape[0] != len(hashes):
+            logger.warning("Embedding cache manifest does not match the matrix")
+            return [], None
+        return hashes, matrix
+
+    def save(self, hashes: list[str], matrix: np.ndarray) -> None:
+        """Atomically write the matrix and its manifest."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_matrix = self.cache_dir / f".{self.MATRIX_FILE}.tmp"
+        tmp_manifest = self.cache_dir / f".{self.MANIFEST_FILE}.tmp"
+
+        with open(tmp_matrix, "wb") as f:
+            np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+        tmp_manifest.write_text(
+            json.dumps(
+                {"model": self.model, "dim": int(matrix.shape[1]), "hashes": hashes}
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_matrix, self.matrix_path)
+        os.replace(tmp_manifest, self.manifest_path)
+
+    def get_or_embed(
+        self, texts: list[str], embed: Callable[[list[str]], list[list[float]]]
+    ) -> np.ndarray:
+        """
+        Return the embeddings for `texts`, embedding only the ones not cached yet.
+
+        Args:
+            texts (list[str]): Texts to embed, in the order of the resulting rows.
+            embed (Callable): Function that embeds a batch of texts.
+
+        Returns:
+            np.ndarray: A float32 matrix with one row per text, memory-mapped from disk.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        hashes = [self.content_hash(text) for text in texts]
+        cached_hashes, cached = self.load()
+
+        if cached is not None and cached_hashes == hashes:
+            logger.info(f"Embedding cache hit for all {len(hashes)} documents")
+            return cached
+
+        row_by_hash = {h: i for i, h in enumerate(cached_hashes)}
+        missing = [i for i, h in enumerate(hashes) if h not in row_by_hash]
+        logger.info(
+            f"Embedding cache: {len(hashes) - len(missing)} cached, {len(missing)} to embed"
+        )
+
+        new_vectors = {}
+        if missing:
+            vectors = embed([texts[i] for i in missing])
+            new_vectors = {
+                i: np.asarray(vector, dtype=np.float32)
+                for i, vector in zip(missing, vectors)
+            }
+
+        dim = (
+            cached.shape[1]
+            if cached is not None
+            else len(next(iter(new_vectors.values())))
+        )
+        matrix = np.empty((len(hashes), dim), dtype=np.float32)
+        for i, h in enumerate(hashes):
+            matrix[i] = new_vectors[i] if i in new_vectors else cached[row_by_hash[h]]
+
+        del cached
+        self.save(hashes, matrix)
+        return np.load(self.matrix_path, mmap_mode="r")
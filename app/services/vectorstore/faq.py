@@ -0,0 +1,29 @@
+import re
+
+import requests
+
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+
+def split_faq(faq_text: str) -> list[dict]:
+    """Split the FAQ markdown into one document per `##` section."""
+    return [{"page_content": txt} for txt in re.split(r"(?=\n##)", faq_text)]
+
+
+def load_faq_docs(faq_url: str, timeout: int = 10) -> list[dict]:
+    """
+    Download the FAQ and split it into documents.
+
+    Args:
+        faq_url (str): URL of the FAQ markdown file.
+        timeout (int): Request timeout in seconds.
+
+    Returns:
+        list[dict]: Documents with a `page_content` key.
+    """
+    logger.info(f"Downloading FAQ from {faq_url}")
+    response = requests.get(url=faq_url, timeout=timeout)
+    response.raise_for_status()
+    return split_faq(response.text)
@@ -0,0 +1,117 @@
+from typing import Optional
+
+import numpy as np
+
+from app.services.vectorstore.bm25 import BM25Index
+from app.services.vectorstore.index import top_k_indices
+from app.services.vectorstore.vector_store import VectorStoreRetriever
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+
+def _min_max(scores: np.ndarray) -> np.ndarray:
+    low, high = float(scores.min()), float(scores.max())
+    if high - low < 1e-9:
+        return np.where(scores > 0, 1.0, 0.0).astype(np.float32)
+    return (scores - low) / (high - low)
+
+
+class HybridRetriever:
+    """
+    Combine BM25 and vector retrieval behind the `VectorStoreRetriever` query API.
+
+    Scores from both retrievers are min-max normalized and blended with `alpha`
+    (the weight of the vector score). When the lexical match is confident enough
+    the embeddings call is skipped, and when the embeddings endpoint fails the
+    lexical ranking is returned on its own.
+
+    Args:
+        vector_retriever (VectorStoreRetriever): Dense retriever over the same docs.
+        alpha (float): Weight of the vector score in the fused score.
+        lexical_confidence (Optional[float]): Confidence in [0, 1] above which the
+            lexical results are returned without embedding the query. None disables it.
+        candidates (int): Number of vector candidates fused with the lexical scores.
+    """
+
+    def __init__(
+        self,
+        vector_retriever: VectorStoreRetriever,
+        alpha: float = 0.5,
+        lexical_confidence: Optional[float] = 0.6,
+        candidates: int = 20,
+    ):
+        self.vector_retriever = vector_retriever
+        self.bm25 = BM25Index([doc["page_content"] for doc in vector_retriever.docs])
+        self.alpha = alpha
+        self.lexical_confidence = lexical_confidence
+        self.candidates = candidates
+        self.lexical_hits = 0
+
+    @property
+    def docs(self) -> list[dict]:
+        return self.vector_retriever.docs
+
+    def _confidence(self, query: str, scores: np.ndarray) -> float:
+        """
+        Coverage of the query terms by the best document, discounted by how close
+        the runner-up is.
+        """
+        if scores.size == 0 or scores.max() <= 0:
+            return 0.0
+        top = top_k_indices(scores, 2)
+        best = top[0]
+        margin = 1.0 - scores[top[1]] / scores[best] if top.size > 1 else 1.0
+        return self.bm25.coverage(query, best) * margin
+
+    def _lexical_results(self, scores: np.ndarray, k: int) -> list[dict]:
+        return [
+            {**self.docs[idx], "similarity": float(scores[idx])}
+            for idx in top_k_indices(scores, k)
+            if scores[idx] > 0
+        ]
+
+    def _fuse(
+        self, lexical: np.ndarray, dense: list[tuple[int, float]], k: int
+    ) -> list[dict]:
+        vector_scores = np.zeros_like(lexical)
+        if dense:
+            ids = np.array([idx for idx, _ in dense])
+            vector_scores[ids] = _min_max(np.array([score for _, score in dense]))
+        fused = self.alpha * vector_scores + (1 - self.alpha) * _min_max(lexical)
+        return [
+            {**self.docs[idx], "similarity": float(fused[idx])}
+            for idx in top_k_indices(fused, k)
+        ]
+
+    def _fast_path(self, query: str, lexical: np.ndarray) -> bool:
+        if self.lexical_confidence is None:
+            return False
+        if self._confidence(query, lexical) < self.lexical_confidence:
+            return False
+        self.lexical_hits += 1
+        return True
+
+    def query(self, query: str, k: int = 5) -> list[dict]:
+        lexical = self.bm25.scores(query)
+        if self._fast_path(query, lexical):
+            return self._lexical_results(lexical, k)
+        try:
+            dense = self.vector_retriever.search(query, k=max(k, self.candidates))
+        except Exception as e:
+            logger.warning(f"Vector retrieval failed, using lexical results: {e}")
+            return self._lexical_results(lexical, k)
+        return self._fuse(lexical, dense, k)
+
+    async def aquery(self, query: str, k: int = 5) -> list[dict]:
+        lexical = self.bm25.scores(query)
+        if self._fast_path(query, lexical):
+            return self._lexical_results(lexical, k)
+        try:
+            dense = await self.vector_retriever.asearch(
+                query, k=max(k, self.candidates)
+            )
+        except Exception as e:
+            logger.warning(f"Vector retrieval failed, using lexical results: {e}")
+            return self._lexical_results(lexical, k)
+        return self._fuse(lexical, dense, k)
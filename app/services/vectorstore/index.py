@@ -0,0 +1,310 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+QUANTIZATIONS = (None, "float16", "int8")
+
+
+def normalize_rows(matrix) -> np.ndarray:
+    """
+    Return a C-contiguous float32 matrix with L2-normalized rows.
+
+    Matrices that already satisfy this (e.g. a memory-mapped embedding cache of
+    unit-length OpenAI vectors) are returned as-is, without a copy.
+    """
+    arr = np.asarray(matrix, dtype=np.float32)
+    if arr.ndim == 1:
+        arr = arr.reshape(1, -1)
+    norms = np.linalg.norm(arr, axis=1)
+    if arr.flags.c_contiguous and np.allclose(norms, 1.0, atol=1e-4):
+        return arr
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(arr / norms[:, None])
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the `k` highest scores along the last axis, best first."""
+    k = min(k, scores.shape[-1])
+    top_k_idx = np.argpartition(scores, -k, axis=-1)[..., -k:]
+    order = np.argsort(-np.take_along_axis(scores, top_k_idx, axis=-1), axis=-1)
+    return np.take_along_axis(top_k_idx, order, axis=-1)
+
+
+class VectorIndex(ABC):
+    """Nearest-neighbour index over unit-length vectors scored by inner product."""
+
+    @property
+    @abstractmethod
+    def size(self) -> int:
+        pass
+
+    @abstractmethod
+    def search(
+        self, queries: np.ndarray, k: int
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        Find the `k` best rows for each query.
+
+        Args:
+            queries (np.ndarray): A `(m, dim)` matrix of unit-length query vectors.
+            k (int): Number of neighbours per query.
+
+        Returns:
+            list[tuple[np.ndarray, np.ndarray]]: For each query, the row indices and
+            their similarity scores, best first.
+        """
+        pass
+
+
+class ExactIndex(VectorIndex):
+    """Brute-force index: one matrix product against every row."""
+
+    def __init__(self, vectors):
+        self.matrix = normalize_rows(vectors)
+
+    @property
+    def size(self) -> int:
+        return self.matrix.shape[0]
+
+    def search(
+        self, queries: np.ndarray, k: int
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        if self.size == 0:
+            return [(np.empty(0, dtype=np.int64), np.empty(0)) for _ in queries]
+        # "@" is just a matrix multiplication in python
+        scores = queries @ self.matrix.T
+        top_k = top_k_indices(scores, k)
+        return [(idx, row[idx]) for idx, row in zip(top_k, scores)]
+
+
+class IVFIndex(VectorIndex):
+    """
+    Inverted-file index: rows are clustered with spherical k-means and a query only
+    scans the `nprobe` clusters whose centroids are closest to it.
+
+    Rows can be stored quantized to float16 or to int8 with one scale per row,
+    which cuts the memory of the stored vectors by 2x or 4x.
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        ids: np.ndarray,
+        offsets: np.ndarray,
+        vectors: np.ndarray,
+        scales: Optional[np.ndarray] = None,
+        quantization: Optional[str] = None,
+        nprobe: int = 8,
+        fingerprint: str = "",
+    ):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        self.centroids = centroids
+        self.ids = ids
+        self.offsets = offsets
+        self.vectors = vectors
+        self.scales = scales
+        self.quantization = quantization
+        self.nprobe = nprobe
+        self.fingerprint = fingerprint
+
+    @property
+    def size(self) -> int:
+        return self.ids.shape[0]
+
+    @property
+    def nlist(self) -> int:
+        return self.centroids.shape[0]
+
+    @classmethod
+    def build(
+        cls,
+        vectors,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        quantization: Optional[str] = None,
+        iterations: int = 10,
+        seed: int = 0,
+        fingerprint: str = "",
+    ) -> "IVFIndex":
+        matrix = normalize_rows(vectors)
+        n = matrix.shape[0]
+        if n == 0:
+            raise ValueError("Cannot build an IVF index over an empty corpus.")
+        nlist = max(1, min(nlist or int(np.sqrt(n)), n))
+        rng = np.random.default_rng(seed)
+
+        centroids = matrix[rng.choice(n, size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = cls._assign(matrix, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, matrix)
+            counts = np.bincount(assignments, minlength=nlist)
+            empty = counts == 0
+            # Re-seed empty clusters with random rows so every list is used
+            sums[empty] = matrix[rng.choice(n, size=int(empty.sum()))]
+            centroids = normalize_rows(sums)
+
+        assignments = cls._assign(matrix, centroids)
+        ids = np.argsort(assignments, kind="stable")
+        offsets = np.searchsorted(assignments[ids], np.arange(nlist + 1))
+        stored, scales = cls._quantize(matrix[ids], quantization)
+        logger.info(
+            f"Built IVF index: {n} vectors, {nlist} lists, quantization={quantization}"
+        )
+        return cls(
+            centroids=centroids,
+            ids=ids,
+            offsets=offsets,
+            vectors=stored,
+            scales=scales,
+            quantization=quantization,
+            nprobe=nprobe,
+            fingerprint=fingerprint,
+        )
+
+    @staticmethod
+    def _assign(
+        matrix: np.ndarray, centroids: np.ndarray, chunk: int = 4096
+    ) -> np.ndarray:
+        return np.concatenate(
+            [
+                np.argmax(matrix[start : start + chunk] @ centroids.T, axis=1)
+                for start in range(0, matrix.shape[0], chunk)
+            ]
+        )
+
+    @staticmethod
+    def _quantize(
+        matrix: np.ndarray, quantization: Optional[str]
+    ) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        if quantization is None:
+            return matrix, None
+        if quantization == "float16":
+            return matrix.astype(np.float16), None
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+
+    def _decode(self, start: int, stop: int) -> np.ndarray:
+        rows = self.vectors[start:stop].astype(np.float32)
+        if self.quantization == "int8":
+            rows *= self.scales[start:stop, None]
+        return rows
+
+    def search(
+        self, queries: np.ndarray, k: int
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        nprobe = min(self.nprobe, self.nlist)
+        probes = top_k_indices(queries @ self.centroids.T, nprobe)
+
+        results = []
+        for query, lists in zip(queries, probes):
+            ranges = [(self.offsets[i], self.offsets[i + 1]) for i in lists]
+            candidates = np.concatenate([self.ids[a:b] for a, b in ranges])
+            if candidates.size == 0:
+                results.append((candidates, np.empty(0, dtype=np.float32)))
+                continue
+            scores = np.concatenate([self._decode(a, b) @ query for a, b in ranges])
+            best = top_k_indices(scores, k)
+            results.append((candidates[best], scores[best]))
+        return results
+
+    def save(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                centroids=self.centroids,
+                ids=self.ids,
+                offsets=self.offsets,
+                vectors=self.vectors,
+                scales=self.scales if self.scales is not None else np.empty(0),
+                quantization=np.array(self.quantization or ""),
+                nprobe=np.array(self.nprobe),
+                fingerprint=np.array(self.fingerprint),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        with np.load(path) as data:
+            quantization = str(data["quantization"]) or None
+            return cls(
+                centroids=data["centroids"],
+                ids=data["ids"],
+                offsets=data["offsets"],
+                vectors=data["vectors"],
+                scales=data["scales"] if quantization == "int8" else None,
+                quantization=quantization,
+                nprobe=int(data["nprobe"]),
+                fingerprint=str(data["fingerprint"]),
+            )
+
+
+def build_index(
+    vectors,
+    kind: str = "exact",
+    *,
+    nlist: Optional[int] = None,
+    nprobe: int = 8,
+    quantization: Optional[str] = None,
+    path: Optional[str] = None,
+    fingerprint: str = "",
+) -> VectorIndex:
+    """
+    Create the configured index, reusing a persisted IVF index when its
+    fingerprint still matches the corpus.
+
+    Args:
+        vectors: Document embeddings, one row per document.
+        kind (str): `exact` or `ivf`.
+        nlist (Optional[int]): Number of IVF lists. Defaults to sqrt(n).
+        nprobe (int): IVF lists scanned per query.
+        quantization (Optional[str]): `float16`, `int8` or None for float32 storage.
+        path (Optional[str]): File the IVF index is persisted to.
+        fingerprint (str): Identifier of the corpus the index was built from.
+    """
+    if kind not in ("exact", "ivf"):
+        raise ValueError(f"Unknown vector index: {kind}")
+    if kind == "exact" or len(vectors) == 0:
+        if kind == "ivf":
+            logger.warning("Empty corpus: using an exact index instead of IVF")
+        return ExactIndex(vectors)
+
+    if path and Path(path).exists():
+        try:
+            index = IVFIndex.load(path)
+            if index.centroids.shape[1] != np.shape(vectors)[-1]:
+                logger.warning(
+                    f"Rebuilding IVF index at {path}: it holds "
+                    f"{index.centroids.shape[1]}-d vectors, the corpus "
+                    f"{np.shape(vectors)[-1]}-d ones"
+                )
+            elif (
+                index.fingerprint == fingerprint
+                and index.quantization == quantization
+                and (nlist is None or index.nlist == nlist)
+            ):
+                index.nprobe = nprobe
+                logger.info(f"Loaded IVF index from {path}")
+                return index
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable IVF index at {path}: {e}")
+
+    index = IVFIndex.build(
+        vectors,
+        nlist=nlist,
+        nprobe=nprobe,
+        quantization=quantization,
+        fingerprint=fingerprint,
+    )
+    if path:
+        index.save(path)
+    return index
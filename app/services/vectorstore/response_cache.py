@@ -0,0 +1,121 @@
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.services.vectorstore.index import ExactIndex
+from app.services.vectorstore.vector_store import VectorStoreRetriever
+from app.utils.cache import CacheStats
+
+
+class SemanticResponseCache:
+    """
+    Cache of final answers keyed by the embedding of the user's question.
+
+    Questions are embedded with the policy retriever (sharing its query cache)
+    and matched with an `ExactIndex` over the stored question vectors, so
+    paraphrases above `threshold` cosine similarity reuse the same answer.
+    Entries expire after `ttl` seconds; when the cache is full an expired
+    entry or, failing that, the least recently used one is replaced.
+
+    Args:
+        retriever (VectorStoreRetriever): Retriever whose embedder keys the cache.
+        threshold (float): Minimum cosine similarity for a hit.
+        ttl (Optional[float]): Seconds an answer stays valid. `None` disables expiration.
+        max_entries (int): Maximum number of cached answers.
+        clock (Callable[[], float]): Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        retriever: VectorStoreRetriever,
+        threshold: float = 0.95,
+        ttl: Optional[float] = 3600.0,
+        max_entries: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive.")
+        self.retriever = retriever
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._clock = clock
+        self._vectors: Optional[np.ndarray] = None
+        self._answers: list[Optional[str]] = [None] * max_entries
+        self._expires = np.full(max_entries, np.inf)
+        self._last_used = np.zeros(max_entries)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(answer is not None for answer in self._answers)
+
+    def _match(self, vector: np.ndarray) -> Optional[str]:
+        with self._lock:
+            if self._size == 0:
+                self.stats.misses += 1
+                return None
+            # The first `_size` rows are contiguous and unit-length: no copy
+            index = ExactIndex(self._vectors[: self._size])
+            ids, scores = index.search(vector[None, :], k=min(self._size, 4))[0]
+            now = self._clock()
+            for idx, score in zip(ids, scores):
+                if score < self.threshold:
+                    break
+                if self._answers[idx] is None:
+                    continue
+                if self._expires[idx] < now:
+                    self._answers[idx] = None
+                    self.stats.expirations += 1
+                    continue
+                self._last_used[idx] = now
+                self.stats.hits += 1
+                return self._answers[idx]
+            self.stats.misses += 1
+            return None
+
+    def _insert(self, vector: np.ndarray, answer: str) -> None:
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros(
+                    (self.max_entries, vector.shape[0]), np.float32
+                )
+            now = self._clock()
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                free = [i for i, a in enumerate(self._answers) if a is None]
+                expired = np.flatnonzero(self._expires < now)
+                if free:
+                    slot = free[0]
+                elif expired.size:
+                    slot = int(expired[0])
+                    self.stats.expirations += 1
+                else:
+                    slot = int(np.argmin(self._last_used))
+                    self.stats.evictions += 1
+            self._vectors[slot] = vector
+            self._answers[slot] = answer
+            self._expires[slot] = now + self.ttl if self.ttl is not None else np.inf
+            self._last_used[slot] = now
+
+    def lookup(self, question: str) -> Optional[str]:
+        return self._match(self.retriever.embed_query(question))
+
+    async def alookup(self, question: str) -> Optional[str]:
+        return self._match((await self.retriever.aembed_queries([question]))[0])
+
+    def store(self, question: str, answer: str) -> None:
+        self._insert(self.retriever.embed_query(question), answer)
+
+    async def astore(self, question: str, answer: str) -> None:
+        self._insert((await self.retriever.aembed_queries([question]))[0], answer)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._answers = [None] * self.max_entries
+            self._size = 0
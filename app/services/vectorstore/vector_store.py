@@ -1,28 +1,161 @@
+import re
+from typing import Optional
+
 import numpy as np
 
+from app.services.llm.embeddings import EmbeddingProvider
+from app.services.vectorstore.embedding_cache import EmbeddingCache
+from app.services.vectorstore.index import VectorIndex, build_index, normalize_rows
+from app.utils.cache import LRUTTLCache
+
+
+def normalize_query(query: str) -> str:
+    """
+    Cache key of a query, so trivially different phrasings share an entry.
+    Only used as a key: the embedded text is always the user's original query.
+    """
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def corpus_fingerprint(texts: list[str], model: str = "", dim: int = 0) -> str:
+    """
+    Identify a corpus together with the embeddings it was indexed with, so a
+    persisted index is not reused after the embedding model or dimension changes.
+    """
+    return EmbeddingCache.content_hash(
+        "\n".join(
+            [f"{model}:{dim}"] + [EmbeddingCache.content_hash(text) for text in texts]
+        )
+    )
+
 
 class VectorStoreRetriever:
-    def __init__(self, docs: list, vectors: list, oai_client):
-        self._arr = np.array(vectors)
+    def __init__(
+        self,
+        docs: list,
+        index: VectorIndex,
+        embedder: EmbeddingProvider,
+        query_cache: Optional[LRUTTLCache] = None,
+    ):
+        self.index = index
         self._docs = docs
-        self._client = oai_client
+        self._embedder = embedder
+        self.query_cache = query_cache
 
     @classmethod
-    def from_docs(cls, docs, oai_client):
-        embeddings = oai_client.embeddings.create(
-            model="text-embedding-3-small", input=[doc["page_content"] for doc in docs]
+    def from_docs(
+        cls,
+        docs,
+        embedder: EmbeddingProvider,
+        cache: Optional[EmbeddingCache] = None,
+        query_cache: Optional[LRUTTLCache] = None,
+        index: str = "exact",
+        index_options: Optional[dict] = None,
+    ):
+        texts = [doc["page_content"] for doc in docs]
+        if cache is None:
+            vectors = embedder.embed(texts)
+        else:
+            vectors = cache.get_or_embed(texts, embedder.embed)
+
+        vector_index = build_index(
+            vectors,
+            kind=index,
+            fingerprint=corpus_fingerprint(
+                texts, model=embedder.model, dim=np.shape(vectors)[-1]
+            ),
+            **(index_options or {}),
         )
-        vectors = [emb.embedding for emb in embeddings.data]
-        return cls(docs, vectors, oai_client)
+        return cls(docs, vector_index, embedder, query_cache=query_cache)
+
+    def _cached_query_vectors(self, keys: list[str]) -> dict[str, np.ndarray]:
+        vectors: dict[str, np.ndarray] = {}
+        if self.query_cache is not None:
+            for key in keys:
+                cached = self.query_cache.get(key)
+                if cached is not None:
+                    vectors[key] = cached
+        return vectors
+
+    @staticmethod
+    def _missing_queries(
+        queries: list[str], keys: list[str], vectors: dict[str, np.ndarray]
+    ) -> dict[str, str]:
+        """Uncached keys mapped to the first original query that produced them."""
+        missing: dict[str, str] = {}
+        for query, key in zip(queries, keys):
+            if key not in vectors and key not in missing:
+                missing[key] = query
+        return missing
+
+    def _store_query_vectors(
+        self, vectors: dict[str, np.ndarray], missing: list[str], embedded
+    ) -> None:
+        for key, vector in zip(missing, normalize_rows(embedded)):
+            vectors[key] = vector
+            if self.query_cache is not None:
+                self.query_cache.set(key, vector)
+
+    def embed_queries(self, queries: list[str]) -> np.ndarray:
+        """
+        Embed several queries with a single API request for the uncached ones.
+
+        Returns:
+            np.ndarray: A `(len(queries), dim)` float32 matrix of unit-length rows.
+        """
+        keys = [normalize_query(query) for query in queries]
+        vectors = self._cached_query_vectors(keys)
+        missing = self._missing_queries(queries, keys, vectors)
+        if missing:
+            embedded = self._embedder.embed(list(missing.values()))
+            self._store_query_vectors(vectors, list(missing), embedded)
+        return np.stack([vectors[key] for key in keys])
+
+    async def aembed_queries(self, queries: list[str]) -> np.ndarray:
+        """Async counterpart of `embed_queries`."""
+        keys = [normalize_query(query) for query in queries]
+        vectors = self._cached_query_vectors(keys)
+        missing = self._missing_queries(queries, keys, vectors)
+        if missing:
+            embedded = await self._embedder.aembed(list(missing.values()))
+            self._store_query_vectors(vectors, list(missing), embedded)
+        return np.stack([vectors[key] for key in keys])
+
+    def embed_query(self, query: str) -> np.ndarray:
+        return self.embed_queries([query])[0]
+
+    @property
+    def docs(self) -> list[dict]:
+        return self._docs
+
+    def _search(
+        self, query_vectors: np.ndarray, k: int
+    ) -> list[list[tuple[int, float]]]:
+        return [
+            [(int(idx), float(score)) for idx, score in zip(indices, scores)]
+            for indices, scores in self.index.search(query_vectors, k)
+        ]
+
+    def _results(self, hits: list[tuple[int, float]]) -> list[dict]:
+        return [{**self._docs[idx], "similarity": score} for idx, score in hits]
+
+    def search(self, query: str, k: int = 5) -> list[tuple[int, float]]:
+        """Row indices of the `k` most similar docs with their similarity."""
+        return self._search(self.embed_queries([query]), k)[0]
+
+    async def asearch(self, query: str, k: int = 5) -> list[tuple[int, float]]:
+        return self._search(await self.aembed_queries([query]), k)[0]
 
     def query(self, query: str, k: int = 5) -> list[dict]:
-        embed = self._client.embeddings.create(
-            model="text-embedding-3-small", input=[query]
-        )
-        # "@" is just a matrix multiplication in python
-        scores = np.array(embed.data[0].embedding) @ self._arr.T
-        top_k_idx = np.argpartition(scores, -k)[-k:]
-        top_k_idx_sorted = top_k_idx[np.argsort(-scores[top_k_idx])]
+        return self._results(self.search(query, k))
+
+    async def aquery(self, query: str, k: int = 5) -> list[dict]:
+        return self._results(await self.asearch(query, k))
+
+    def query_many(self, queries: list[str], k: int = 5) -> list[list[dict]]:
+        """Answer a batch of queries with one embeddings request and one GEMM."""
+        if not queries:
+            return []
         return [
-            {**self._docs[idx], "similarity": scores[idx]} for idx in top_k_idx_sorted
+            self._results(hits) for hits in self._search(self.embed_queries(queries), k)
         ]
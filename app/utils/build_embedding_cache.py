@@ -0,0 +1,29 @@
+"""
+Build the FAQ embedding cache (and the IVF index, when configured) ahead of
+time, e.g. as a Docker build step:
+
+    python -m app.utils.build_embedding_cache
+"""
+
+from app.bootstrap.bootstrap import Bootstrap
+from app.config.settings import get_settings
+from app.services.vectorstore.faq import load_faq_docs
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+
+def build_embedding_cache() -> None:
+    settings = get_settings()
+    if not settings.embedding_cache_dir:
+        raise ValueError("EMBEDDING_CACHE_DIR is not configured.")
+
+    docs = load_faq_docs(faq_url=settings.faq_url)
+    Bootstrap.create_retriever(settings=settings, docs=docs)
+    logger.info(
+        f"Embedding cache for {len(docs)} documents written to {settings.embedding_cache_dir}"
+    )
+
+
+if __name__ == "__main__":
+    build_embedding_cache()
@@ -0,0 +1,41 @@
+class QueryPlanError(Exception):
+    """A tool query would run a full table scan."""
+
+    def __init__(self, scans: dict[str, list[str]]):
+        self.scans = scans
+        details = "; ".join(
+            f"{name}: {', '.join(steps)}" for name, steps in scans.items()
+        )
+        super().__init__(f"Queries fall back to table scans: {details}")
+
+
+class AuthenticationError(Exception):
+    """A client token is missing, malformed, expired or badly signed."""
+
+
+class SessionError(Exception):
+    """A chat session cannot be opened or resumed."""
+
+
+class ToolTimeoutError(Exception):
+    """A tool call did not finish within its timeout or the turn's budget."""
+
+    def __init__(
+        self, tool: str, timeout: float, stage: str = "running", bound: str = "timeout"
+    ):
+        self.tool = tool
+        self.timeout = timeout
+        self.stage = stage
+        self.bound = bound
+        super().__init__(
+            f"Tool {tool} exceeded its {bound} of {timeout:.2f}s while {stage}"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "error": "timeout",
+            "tool": self.tool,
+            "timeout_seconds": round(self.timeout, 2),
+            "stage": self.stage,
+            "bound": self.bound,
+        }
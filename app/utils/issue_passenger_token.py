@@ -0,0 +1,29 @@
+"""
+Issue the passenger token a client presents to open a chat WebSocket, signed
+with SESSION_SECRET and valid for PASSENGER_TOKEN_TTL seconds:
+
+    python -m app.utils.issue_passenger_token "3442 587242"
+
+Clients send it as `Authorization: Bearer <token>` or `/chat/ws?auth=<token>`;
+the chat page forwards `/?auth=<token>`.
+"""
+
+import argparse
+
+from app.api.middleware.auth import create_passenger_token
+from app.config.settings import get_settings
+
+
+def issue_passenger_token(passenger_id: str) -> str:
+    settings = get_settings()
+    if not settings.session_secret:
+        raise ValueError(
+            "SESSION_SECRET is not configured; the server would reject the token."
+        )
+    return create_passenger_token(passenger_id, settings.session_secret)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Issue a chat passenger token.")
+    parser.add_argument("passenger_id")
+    print(issue_passenger_token(parser.parse_args().passenger_id))
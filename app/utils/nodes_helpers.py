@@ -1,8 +1,25 @@
+import json
+from typing import Optional
+
 from langchain_core.messages import ToolMessage
 from langchain_core.runnables import RunnableLambda
 
 from langgraph.prebuilt import ToolNode
 
+from app.utils.exceptions import ToolTimeoutError
+from app.utils.tool_execution import ToolExecutor
+from app.utils.tool_results import ToolResultEncoder, with_encoded_results
+
+
+def tool_error_content(error: Exception) -> str:
+    if isinstance(error, ToolTimeoutError):
+        # Structured so the model can tell a slow tool from a wrong call
+        return (
+            f"Error: {json.dumps(error.to_dict())}\n"
+            " the tool is slow right now; do not retry it with the same arguments."
+        )
+    return f"Error: {repr(error)}\n please fix your mistakes."
+
 
 def handle_tool_error(state) -> dict:
     error = state.get("error")
@@ -10,15 +27,27 @@ def handle_tool_error(state) -> dict:
     return {
         "messages": [
             ToolMessage(
-                content=f"Error: {repr(error)}\n please fix your mistakes.",
+                content=tool_error_content(error),
                 tool_call_id=tc["id"],
+                name=tc["name"],
+                status="error",
             )
             for tc in tool_calls
         ]
     }
 
 
-def create_tool_node_with_fallback(tools: list) -> dict:
-    return ToolNode(tools).with_fallbacks(
+def create_tool_node_with_fallback(
+    tools: list,
+    encoder: Optional[ToolResultEncoder] = None,
+    executor: Optional[ToolExecutor] = None,
+) -> dict:
+    tools = with_encoded_results(tools, encoder)
+    if executor is not None:
+        # Encoding counts against the call's timeout
+        tools = executor.wrap(tools)
+    # Errors of a single call are reported on that call; anything escaping the
+    # node fails all of its calls through the fallback
+    return ToolNode(tools, handle_tool_errors=tool_error_content).with_fallbacks(
         [RunnableLambda(handle_tool_error)], exception_key="error"
     )
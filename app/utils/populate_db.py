@@ -5,6 +5,8 @@ import sqlite3
 import pandas as pd
 import requests
 
+from app.services.database.migrations import apply_migrations
+
 db_url = "https://storage.googleapis.com/benchmarks-artifacts/travel-db/travel2.sqlite"
 local_file = "travel2.sqlite"
 # The backup lets us restart for each tutorial section
@@ -59,6 +61,8 @@ def update_dates(file):
     del df
     del tdf
     conn.commit()
+    # to_sql(if_exists="replace") drops the indexes, so recreate them
+    apply_migrations(conn)
     conn.close()
 
     return file
@@ -0,0 +1,47 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from typing import Optional
+
+from app.utils.exceptions import AuthenticationError
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def sign_token(payload: dict, secret: str) -> str:
+    """Return `payload` as a compact HMAC-SHA256 signed token with an issue time."""
+    body = _b64encode(
+        json.dumps({**payload, "iat": int(time.time())}, separators=(",", ":")).encode()
+    )
+    signature = hmac.new(secret.encode(), body.encode(), hashlib.sha256).digest()
+    return f"{body}.{_b64encode(signature)}"
+
+
+def verify_token(token: str, secret: str, max_age: Optional[float] = None) -> dict:
+    """
+    Check the signature and age of a token created by `sign_token`.
+
+    Raises:
+        AuthenticationError: If the token is malformed, tampered with or expired.
+    """
+    try:
+        body, signature = token.split(".", 1)
+        expected = hmac.new(secret.encode(), body.encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64decode(signature), expected):
+            raise AuthenticationError("Invalid token signature.")
+        payload = json.loads(_b64decode(body))
+    except (ValueError, binascii.Error) as e:
+        raise AuthenticationError("Malformed token.") from e
+
+    if max_age is not None and time.time() - payload.get("iat", 0) > max_age:
+        raise AuthenticationError("Token expired.")
+    return payload
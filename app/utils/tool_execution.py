@@ -0,0 +1,319 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from langchain_core.tools import BaseTool
+
+from app.utils.exceptions import ToolTimeoutError
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+# Monotonic deadline of the current turn, shared by every tool it calls
+_turn_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "turn_deadline", default=None
+)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the current turn, or `None` when no deadline is set."""
+    deadline = _turn_deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+@contextmanager
+def turn_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Give the enclosed turn a budget of `seconds`. Nested calls keep the outer
+    deadline, so a turn cannot extend its own budget.
+    """
+    if seconds is None or _turn_deadline.get() is not None:
+        yield
+        return
+    token = _turn_deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _turn_deadline.reset(token)
+
+
+@dataclass(eq=False)
+class _Waiter:
+    wake: Callable[[], None]
+    granted: bool = False
+
+
+class SharedSemaphore:
+    """
+    Counting semaphore shared by threads and event loops, so sync and async
+    calls draw on the same slots. A released slot is handed to the oldest
+    waiter, whichever side it is on.
+    """
+
+    def __init__(self, value: int):
+        self.value = value
+        self._lock = threading.Lock()
+        self._waiters: deque[_Waiter] = deque()
+
+    def _try_acquire(self) -> bool:
+        if self.value > 0 and not self._waiters:
+            self.value -= 1
+            return True
+        return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait up to `timeout` seconds for a slot in the calling thread."""
+        with self._lock:
+            if self._try_acquire():
+                return True
+            event = threading.Event()
+            waiter = _Waiter(event.set)
+            self._waiters.append(waiter)
+        event.wait(timeout)
+        with self._lock:
+            if not waiter.granted:
+                self._waiters.remove(waiter)
+            return waiter.granted
+
+    async def aacquire(self) -> None:
+        """Wait for a slot without blocking the event loop; cancellable."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire():
+                return
+            future = loop.create_future()
+
+            def wake():
+                loop.call_soon_threadsafe(
+                    lambda: future.done() or future.set_result(None)
+                )
+
+            waiter = _Waiter(wake)
+            self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    raise
+            # Handed a slot while being cancelled: pass it on
+            self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                try:
+                    waiter.wake()
+                except RuntimeError:
+                    # The waiter's event loop is closed
+                    continue
+                waiter.granted = True
+                return
+            self.value += 1
+
+
+@dataclass(frozen=True)
+class ToolLimits:
+    max_concurrency: Optional[int] = None
+    timeout: Optional[float] = None
+
+
+@dataclass
+class ExecutionStats:
+    calls: int = 0
+    timeouts: int = 0
+    queued: int = 0
+    queue_seconds: float = 0.0
+
+
+class ToolExecutor:
+    """
+    Bound how tools run: at most `max_concurrency` calls at once overall and
+    `limits[name].max_concurrency` per tool, each finishing within its timeout
+    or the time left in the turn, whichever is shorter.
+
+    Sync and async calls share the same `SharedSemaphore` slots, and waiting
+    for one counts against the timeout. Sync tools run on a dedicated pool so
+    the caller can stop waiting; async tools run as tasks that are cancelled
+    on timeout. Either way a call keeps its slots until it really finishes,
+    so a stuck query cannot be piled on. Timeouts raise `ToolTimeoutError`.
+
+    Args:
+        max_concurrency (int): Maximum tool calls running at once.
+        timeout (Optional[float]): Default per-call timeout in seconds.
+        limits (Optional[dict[str, ToolLimits]]): Overrides by tool name.
+        turn_budget (Optional[float]): Seconds a whole turn may spend, applied
+            by callers through `turn_deadline`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        timeout: Optional[float] = 30.0,
+        limits: Optional[dict[str, ToolLimits]] = None,
+        turn_budget: Optional[float] = None,
+    ):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive.")
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.limits = limits or {}
+        self.turn_budget = turn_budget
+        self.stats = ExecutionStats()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="tool"
+        )
+        self._slots = {None: SharedSemaphore(max_concurrency)}
+        for name, tool_limits in self.limits.items():
+            if tool_limits.max_concurrency:
+                self._slots[name] = SharedSemaphore(tool_limits.max_concurrency)
+
+    def _semaphores(self, name: str) -> list[SharedSemaphore]:
+        return [self._slots[None]] + (
+            [self._slots[name]] if name in self._slots else []
+        )
+
+    @staticmethod
+    def _release(semaphores: list[SharedSemaphore]) -> None:
+        for semaphore in semaphores:
+            semaphore.release()
+
+    def timeout_for(self, name: str) -> tuple[Optional[float], str]:
+        """Effective timeout of a call to `name` and what bounds it."""
+        limits = self.limits.get(name)
+        timeout = limits.timeout if limits and limits.timeout else self.timeout
+        budget = remaining_budget()
+        if budget is not None and (timeout is None or budget < timeout):
+            return budget, "turn budget"
+        return timeout, "timeout"
+
+    def _timed_out(self, name: str, timeout: float, stage: str, bound: str):
+        with self._lock:
+            self.stats.timeouts += 1
+        error = ToolTimeoutError(name, timeout, stage=stage, bound=bound)
+        logger.warning(str(error))
+        return error
+
+    def _record(self, waited: float) -> None:
+        with self._lock:
+            self.stats.calls += 1
+            if waited > 0.001:
+                self.stats.queued += 1
+                self.stats.queue_seconds += waited
+
+    def run(self, name: str, func: Callable, *args, **kwargs):
+        timeout, bound = self.timeout_for(name)
+        if timeout is not None and timeout <= 0:
+            raise self._timed_out(name, 0.0, "queued", bound)
+        started = time.monotonic()
+        acquired = []
+        try:
+            for semaphore in self._semaphores(name):
+                left = (
+                    None if timeout is None else timeout - (time.monotonic() - started)
+                )
+                if (
+                    left is not None
+                    and left <= 0
+                    or not semaphore.acquire(timeout=left)
+                ):
+                    raise self._timed_out(name, timeout, "queued", bound)
+                acquired.append(semaphore)
+        except BaseException:
+            self._release(acquired)
+            raise
+        self._record(time.monotonic() - started)
+
+        context = contextvars.copy_context()
+        future = self._pool.submit(context.run, func, *args, **kwargs)
+        # The slots are freed when the call really ends, not when we stop waiting
+        future.add_done_callback(lambda _: self._release(acquired))
+        left = (
+            None
+            if timeout is None
+            else max(0.0, timeout - (time.monotonic() - started))
+        )
+        try:
+            return future.result(timeout=left)
+        except FutureTimeoutError:
+            raise self._timed_out(name, timeout, "running", bound) from None
+
+    async def arun(self, name: str, coroutine: Callable, *args, **kwargs):
+        timeout, bound = self.timeout_for(name)
+        if timeout is not None and timeout <= 0:
+            raise self._timed_out(name, 0.0, "queued", bound)
+        started = time.monotonic()
+        acquired = []
+        try:
+            async with asyncio.timeout(timeout):
+                for semaphore in self._semaphores(name):
+                    await semaphore.aacquire()
+                    acquired.append(semaphore)
+        except TimeoutError:
+            self._release(acquired)
+            raise self._timed_out(name, timeout, "queued", bound) from None
+        except BaseException:
+            self._release(acquired)
+            raise
+        self._record(time.monotonic() - started)
+
+        task = asyncio.ensure_future(coroutine(*args, **kwargs))
+        # As in `run`: a cancelled task only ends once the work it awaits does
+        task.add_done_callback(lambda _: self._release(acquired))
+        left = (
+            None
+            if timeout is None
+            else max(0.0, timeout - (time.monotonic() - started))
+        )
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), left)
+        except TimeoutError:
+            task.cancel()
+            raise self._timed_out(name, timeout, "running", bound) from None
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+    def wrap(self, tools: list[BaseTool]) -> list[BaseTool]:
+        """Copy each tool so both its sync and async paths run under the limits."""
+
+        def limit_func(name: str, func: Callable) -> Callable:
+            @functools.wraps(func)
+            def run(*args, **kwargs):
+                return self.run(name, func, *args, **kwargs)
+
+            return run
+
+        def limit_coroutine(name: str, coroutine: Callable) -> Callable:
+            @functools.wraps(coroutine)
+            async def run(*args, **kwargs):
+                return await self.arun(name, coroutine, *args, **kwargs)
+
+            return run
+
+        limited = []
+        for tool in tools:
+            update = {}
+            if getattr(tool, "func", None) is not None:
+                update["func"] = limit_func(tool.name, tool.func)
+            if getattr(tool, "coroutine", None) is not None:
+                update["coroutine"] = limit_coroutine(tool.name, tool.coroutine)
+            limited.append(tool.model_copy(update=update) if update else tool)
+        return limited
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
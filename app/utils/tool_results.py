@@ -0,0 +1,192 @@
+import functools
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from langchain_core.tools import BaseTool
+
+from app.services.llm.embeddings import estimate_tokens
+from app.utils.logger import get_logger
+
+logger = get_logger(name=__name__)
+
+# Keys of the paginated payloads returned by the search tools.
+PAGE_KEYS = ("results", "total", "next_cursor", "total_capped")
+SEPARATOR = "|"
+
+
+@dataclass
+class EncodingStats:
+    results: int = 0
+    truncated: int = 0
+    raw_tokens: int = 0
+    encoded_tokens: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.raw_tokens - self.encoded_tokens
+
+    @property
+    def savings(self) -> float:
+        return self.saved_tokens / self.raw_tokens if self.raw_tokens else 0.0
+
+
+def _raw_content(result: Any) -> str:
+    """What ToolNode would put in the ToolMessage without an encoder."""
+    if isinstance(result, str):
+        return result
+    try:
+        return json.dumps(result, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return str(result)
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    text = str(value)
+    return text.replace("\\", "\\\\").replace(SEPARATOR, "\\|").replace("\n", "\\n")
+
+
+def _is_table(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(isinstance(row, dict) for row in value)
+    )
+
+
+class ToolResultEncoder:
+    """
+    Render tool results compactly before they enter the conversation history.
+
+    Lists of dicts become a header line plus one `|`-separated line per row,
+    columns that are null in every row are dropped, columns with the same value
+    in every row are printed once above the table, and rows that do not fit in
+    `max_chars` are replaced by a count. Strings pass through, truncated to the
+    same budget.
+
+    Args:
+        max_chars (int): Size budget of a single encoded result.
+    """
+
+    def __init__(self, max_chars: int = 4000):
+        if max_chars <= 0:
+            raise ValueError("max_chars must be positive.")
+        self.max_chars = max_chars
+        self.stats = EncodingStats()
+        self._lock = threading.Lock()
+
+    def encode(self, result: Any) -> str:
+        encoded, truncated = self._encode(result)
+        raw_tokens = estimate_tokens(_raw_content(result))
+        encoded_tokens = estimate_tokens(encoded)
+        with self._lock:
+            self.stats.results += 1
+            self.stats.truncated += int(truncated)
+            self.stats.raw_tokens += raw_tokens
+            self.stats.encoded_tokens += encoded_tokens
+        logger.info(
+            f"Encoded tool result: ~{raw_tokens} -> ~{encoded_tokens} tokens "
+            f"(cumulative savings {self.stats.savings:.0%})"
+        )
+        return encoded
+
+    def _encode(self, result: Any) -> tuple[str, bool]:
+        if isinstance(result, str):
+            return self._truncate(result)
+        if isinstance(result, dict) and "results" in result:
+            meta = [
+                f"{key}: {_cell(result[key])}"
+                for key in PAGE_KEYS[1:]
+                if result.get(key) is not None
+            ]
+            return self._encode_table(result["results"], meta)
+        if isinstance(result, list) and not result:
+            return "No results.", False
+        if _is_table(result):
+            return self._encode_table(result, [])
+        if isinstance(result, dict):
+            lines = [
+                f"{key}: {_cell(value)}"
+                for key, value in result.items()
+                if value is not None
+            ]
+            return self._truncate("\n".join(lines))
+        return self._truncate(_raw_content(result))
+
+    def _encode_table(self, rows: list[dict], meta: list[str]) -> tuple[str, bool]:
+        if not rows:
+            return "\n".join(meta + ["No results."]), False
+
+        columns: list[str] = []
+        for row in rows:
+            columns.extend(key for key in row if key not in columns)
+        columns = [
+            column
+            for column in columns
+            if any(row.get(column) is not None for row in rows)
+        ]
+
+        lines = list(meta)
+        if len(rows) > 1:
+            constant = [
+                column
+                for column in columns
+                if all(column in row for row in rows)
+                and all(row[column] == rows[0][column] for row in rows)
+            ]
+            lines += [f"{column}: {_cell(rows[0][column])}" for column in constant]
+            columns = [column for column in columns if column not in constant]
+
+        if columns:
+            lines.append(SEPARATOR.join(columns))
+        size = sum(len(line) + 1 for line in lines)
+        for shown, row in enumerate(rows):
+            line = SEPARATOR.join(_cell(row.get(column)) for column in columns)
+            if size + len(line) + 1 > self.max_chars:
+                lines.append(f"[{len(rows) - shown} more rows omitted]")
+                return "\n".join(lines), True
+            lines.append(line)
+            size += len(line) + 1
+        return "\n".join(lines), False
+
+    def _truncate(self, text: str) -> tuple[str, bool]:
+        if len(text) <= self.max_chars:
+            return text, False
+        return text[: self.max_chars] + "\n[truncated]", True
+
+
+def with_encoded_results(
+    tools: list[BaseTool], encoder: Optional[ToolResultEncoder]
+) -> list[BaseTool]:
+    """Copy each tool so both its sync and async paths return encoded content."""
+    if encoder is None:
+        return tools
+
+    def encode_func(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            return encoder.encode(func(*args, **kwargs))
+
+        return run
+
+    def encode_coroutine(coroutine: Callable) -> Callable:
+        @functools.wraps(coroutine)
+        async def run(*args, **kwargs):
+            return encoder.encode(await coroutine(*args, **kwargs))
+
+        return run
+
+    encoded = []
+    for tool in tools:
+        update = {}
+        if getattr(tool, "func", None) is not None:
+            update["func"] = encode_func(tool.func)
+        if getattr(tool, "coroutine", None) is not None:
+            update["coroutine"] = encode_coroutine(tool.coroutine)
+        encoded.append(tool.model_copy(update=update) if update else tool)
+    return encoded
@@ -1,6 +1,13 @@
+from urllib.parse import quote
+
 import pytest
 import websockets
 
+from app.utils.issue_passenger_token import issue_passenger_token
+
+# Pasajero del tutorial; el token se firma con el SESSION_SECRET del servidor
+PASSENGER_ID = "3442 587242"
+
 
 @pytest.mark.asyncio
 async def test_chat_sequence():
@@ -21,7 +28,9 @@ async def test_chat_sequence():
         "interesting - i like the museums, what options are there? ",
         "OK great pick one and book it for my second day there.",
     ]
-    uri = "ws://localhost:8000/chat/ws"  # Ajusta si usas otro puerto o ruta
+    token = quote(issue_passenger_token(PASSENGER_ID))
+    # Ajusta si usas otro puerto o ruta
+    uri = f"ws://localhost:8000/chat/ws?auth={token}"
     async with websockets.connect(uri) as websocket:
         for question in tutorial_questions:
             print(f">>> Enviando: {question}")
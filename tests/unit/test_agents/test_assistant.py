@@ -0,0 +1,166 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+
+from app.agents.base.agent import FALLBACK_RESPONSE, Assistant, RetryPolicy, cache_key
+
+NO_WAIT = RetryPolicy(max_attempts=3, backoff=0)
+
+
+def scripted(*contents):
+    calls = []
+
+    def respond(state):
+        calls.append(len(state["messages"]))
+        return AIMessage(content=contents[min(len(calls), len(contents)) - 1])
+
+    return RunnableLambda(respond), calls
+
+
+@pytest.mark.asyncio
+async def test_async_path_reprompts_empty_output():
+    runnable, calls = scripted("", "Your flight leaves at 10:00.")
+    assistant = Assistant(runnable, retry_policy=NO_WAIT)
+
+    result = await assistant.acall({"messages": [("user", "when?")]})
+
+    assert result["messages"].content == "Your flight leaves at 10:00."
+    assert calls == [1, 2]
+    assert assistant.metrics.attempts == 2
+    assert assistant.metrics.empty_responses == 1
+
+
+def test_reprompting_is_bounded():
+    runnable, calls = scripted("")
+    assistant = Assistant(runnable, retry_policy=NO_WAIT)
+
+    result = assistant({"messages": [("user", "when?")]})
+
+    assert result["messages"].content == FALLBACK_RESPONSE
+    assert len(calls) == 3
+    assert assistant.metrics.exhausted == 1
+
+
+def test_backoff_grows_up_to_the_cap():
+    policy = RetryPolicy(backoff=0.5, backoff_factor=2, max_backoff=1.5)
+
+    assert [policy.delay(a) for a in (1, 2, 3)] == [0.5, 1.0, 1.5]
+
+
+class DictCache:
+    def __init__(self):
+        self.answers = {}
+
+    async def alookup(self, question):
+        return self.answers.get(question)
+
+    async def astore(self, question, answer):
+        self.answers[question] = answer
+
+
+def policy_turn(tool_name, question="Can I bring a dog?"):
+    return {
+        "messages": [
+            HumanMessage(content=question, id="h"),
+            AIMessage(
+                content="", tool_calls=[{"name": tool_name, "args": {}, "id": "c"}]
+            ),
+            ToolMessage(content="Pets allowed.", tool_call_id="c", name=tool_name),
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_only_turns_using_cacheable_tools_are_cached():
+    runnable, calls = scripted("Yes, small pets are allowed.")
+    cache = DictCache()
+    assistant = Assistant(
+        runnable,
+        retry_policy=NO_WAIT,
+        response_cache=cache,
+        cacheable_tools=frozenset({"lookup_policy"}),
+    )
+
+    await assistant.acall(policy_turn("fetch_user_flight_information"))
+    assert cache.answers == {}
+
+    await assistant.acall(policy_turn("lookup_policy"))
+    assert cache.answers == {"Can I bring a dog?": "Yes, small pets are allowed."}
+
+    result = await assistant.acall(
+        {"messages": [HumanMessage(content="Can I bring a dog?")]}
+    )
+
+    assert result["messages"].content == "Yes, small pets are allowed."
+    assert len(calls) == 2
+    assert assistant.metrics.cache_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_answers_quoting_the_passenger_profile_are_not_cached():
+    runnable, _ = scripted("Pets are allowed on your flight LX0112.")
+    cache = DictCache()
+    assistant = Assistant(
+        runnable,
+        retry_policy=NO_WAIT,
+        response_cache=cache,
+        cacheable_tools=frozenset({"lookup_policy"}),
+    )
+    state = {
+        **policy_turn("lookup_policy"),
+        "user_info": "[{'ticket_no': '7240005432906569', 'flight_no': 'LX0112'}]",
+    }
+
+    await assistant.acall(state)
+
+    assert cache.answers == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "question, answer",
+    [
+        (
+            "What is the change fee?",
+            "For your Economy ticket the change fee is CHF 50.",
+        ),
+        (
+            "Can I bring a dog?",
+            "Yes, on your flight on 2024-04-30 small pets fly free.",
+        ),
+        ("How much is it to change my ticket?", "The change fee is CHF 50."),
+        ("¿Puedo cambiar mi vuelo?", "Sí, con un cargo de CHF 50."),
+    ],
+)
+async def test_answers_about_the_passengers_booking_are_not_cached(question, answer):
+    runnable, _ = scripted(answer)
+    cache = DictCache()
+    assistant = Assistant(
+        runnable,
+        retry_policy=NO_WAIT,
+        response_cache=cache,
+        cacheable_tools=frozenset({"lookup_policy"}),
+    )
+    state = {
+        **policy_turn("lookup_policy", question),
+        "user_info": "[{'scheduled_departure': '2024-04-30 12:09:03.561731-04:00', "
+        "'fare_conditions': 'Economy'}]",
+    }
+
+    await assistant.acall(state)
+
+    assert cache.answers == {}
+
+
+def test_follow_up_questions_are_keyed_with_the_previous_exchange():
+    first = [HumanMessage(content="Can I bring a dog?")]
+    follow_up = [
+        HumanMessage(content="Can I change my flight?"),
+        AIMessage(content="Yes, for a fee."),
+        HumanMessage(content="How much is it?"),
+    ]
+
+    assert cache_key({"messages": first}) == "Can I bring a dog?"
+    assert cache_key({"messages": follow_up}) == (
+        "user: Can I change my flight?\nassistant: Yes, for a fee.\nuser: How much is it?"
+    )
@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import StateGraph
+
+from app.agents.base.agent import Assistant
+from app.agents.flights.profile import UserProfile
+from app.agents.supervisor.fast_path import (
+    FLIGHT_TIME,
+    GREETING,
+    THANKS,
+    FastPath,
+    classify,
+    next_flight,
+)
+from app.agents.supervisor.graph import supervisor_graph
+from app.agents.supervisor.state import TravelerAgentState
+
+PASSENGER_ID = "3442 587242"
+FLIGHTS = [
+    {
+        "flight_no": "LX0112",
+        "departure_airport": "CDG",
+        "arrival_airport": "BSL",
+        "scheduled_departure": "2099-01-01 10:00:00.000000+01:00",
+        "scheduled_arrival": "2099-01-01 11:00:00.000000+01:00",
+        "seat_no": "18E",
+    },
+    {
+        "flight_no": "LX0001",
+        "scheduled_departure": "2000-01-01 10:00:00.000000+01:00",
+    },
+]
+
+
+class StaticProfiles:
+    def get(self, passenger_id):
+        return UserProfile(passenger_id, FLIGHTS, str(FLIGHTS))
+
+
+@pytest.mark.parametrize(
+    "text, intent",
+    [
+        ("Hi there!", GREETING),
+        ("hola", GREETING),
+        ("ok, thanks a lot", THANKS),
+        ("What time is my flight?", FLIGHT_TIME),
+        ("When does my flight leave tomorrow", FLIGHT_TIME),
+        ("¿A qué hora sale mi vuelo?", FLIGHT_TIME),
+        ("When should I arrive at the airport for my flight?", None),
+        ("What time does check-in open for my flight?", None),
+        ("When is the baggage drop for my flight?", None),
+        ("Hi, can I change my flight?", None),
+        ("When can I cancel my flight?", None),
+        ("What is the baggage policy?", None),
+    ],
+)
+def test_classify(text, intent):
+    assert classify(text) == intent
+
+
+def test_next_flight_skips_departed_flights():
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert next_flight(FLIGHTS, now)["flight_no"] == "LX0112"
+    assert next_flight(FLIGHTS[1:], now) is None
+
+
+def test_graph_answers_trivial_turns_without_the_model():
+    calls = []
+    assistant = Assistant(
+        RunnableLambda(lambda state: calls.append(1) or AIMessage(content="model"))
+    )
+    fast_path = FastPath(StaticProfiles(), assistant.metrics)
+    graph = supervisor_graph(
+        StateGraph(TravelerAgentState),
+        assistant=assistant,
+        tools=[],
+        extra_nodes={"user_info": lambda state: {"user_info": "[]"}},
+        fast_path=fast_path,
+    )
+    config = {"configurable": {"thread_id": "t", "passenger_id": PASSENGER_ID}}
+
+    def ask(text):
+        return graph.invoke({"messages": [("user", text)]}, config)["messages"][-1]
+
+    assert "LX0112" in ask("what time is my flight?").content
+    assert "18E" in ask("what time is my flight?").content
+    assert ask("What is the baggage policy?").content == "model"
+    assert "welcome" in ask("thanks!").content
+
+    assert len(calls) == 1
+    assert fast_path.metrics.turns == 4
+    assert fast_path.metrics.hit_rate == 0.75
+    assert fast_path.metrics.by_intent == {FLIGHT_TIME: 2, THANKS: 1}
+
+
+def test_flight_question_falls_through_without_profile_flights():
+    profiles = SimpleNamespace(get=lambda pid: UserProfile(pid, [], "[]"))
+    fast_path = FastPath(profiles)
+    state = {"messages": [HumanMessage(content="when is my flight?")]}
+
+    assert fast_path(state, {"configurable": {"passenger_id": PASSENGER_ID}}) == {}
+    assert fast_path.metrics.hits == 0
@@ -0,0 +1,74 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph.message import add_messages
+
+from app.agents.base.history import HistoryManager, split_turns
+
+
+def make_turn(i: int, tool_output: str = "x" * 400) -> list:
+    return [
+        HumanMessage(content=f"question {i}", id=f"h{i}"),
+        AIMessage(
+            content="",
+            id=f"a{i}",
+            tool_calls=[{"name": "search_hotels", "args": {}, "id": f"call{i}"}],
+        ),
+        ToolMessage(
+            content=tool_output,
+            tool_call_id=f"call{i}",
+            name="search_hotels",
+            id=f"t{i}",
+        ),
+        AIMessage(content=f"answer {i}", id=f"r{i}"),
+    ]
+
+
+def history(turns: int) -> list:
+    return [message for i in range(turns) for message in make_turn(i)]
+
+
+def test_old_tool_outputs_are_stubbed_in_place():
+    manager = HistoryManager(max_tokens=10_000, keep_turns=2)
+    messages = history(4)
+
+    update = manager({"messages": messages})
+    merged = add_messages(messages, update["messages"])
+
+    assert len(merged) == len(messages)
+    assert "elided" in merged[2].content and "elided" in merged[6].content
+    assert merged[10].content == "x" * 400
+    assert "summary" not in update
+
+
+def test_turns_over_budget_are_folded_into_the_summary():
+    seen = {}
+
+    def summarize(inputs):
+        seen.update(inputs)
+        return AIMessage(content="user asked about hotels")
+
+    manager = HistoryManager(
+        max_tokens=50, keep_turns=1, summarizer=RunnableLambda(summarize)
+    )
+    messages = history(3)
+
+    update = manager({"messages": messages, "summary": "earlier"})
+    merged = add_messages(messages, update["messages"])
+
+    assert update["summary"] == "user asked about hotels"
+    assert seen["summary"] == "earlier"
+    assert "question 0" in seen["messages"]
+    assert [turn[0].content for turn in split_turns(merged)] == ["question 2"]
+
+
+@pytest.mark.asyncio
+async def test_async_path_drops_turns_without_summarizer():
+    manager = HistoryManager(max_tokens=50, keep_turns=1)
+    messages = history(3)
+
+    update = await manager.acall({"messages": messages})
+    merged = add_messages(messages, update["messages"])
+
+    assert merged == make_turn(2)
+    assert "summary" not in update
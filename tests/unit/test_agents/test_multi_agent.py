@@ -0,0 +1,112 @@
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import StructuredTool
+from langgraph.graph import StateGraph
+
+from app.agents.hotels.agent import create_hotels_agent
+from app.agents.supervisor.agent import create_supervisor_assistant
+from app.agents.supervisor.graph import multi_agent_graph
+from app.agents.supervisor.state import TravelerAgentState
+
+
+class ScriptedModel:
+    """Chat model stand-in that records the bound tools and replays answers."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.bound = []
+        self.calls = 0
+
+    def bind_tools(self, tools):
+        self.bound = [getattr(t, "name", None) or t.__name__ for t in tools]
+
+        def respond(prompt):
+            self.calls += 1
+            return self.answers.pop(0)
+
+        return RunnableLambda(respond)
+
+
+def call(name: str, args: dict, call_id: str) -> AIMessage:
+    return AIMessage(
+        content="", tool_calls=[{"name": name, "args": args, "id": call_id}]
+    )
+
+
+def make_tool(name: str):
+    def run(query: str) -> str:
+        return "ok"
+
+    return StructuredTool.from_function(func=run, name=name, description=name)
+
+
+def build(supervisor_llm, hotels_llm):
+    policy = make_tool("lookup_policy")
+    hotels = [make_tool("search_hotels"), make_tool("book_hotel")]
+    return multi_agent_graph(
+        StateGraph(TravelerAgentState),
+        assistant=create_supervisor_assistant(supervisor_llm, [policy]),
+        tools=[policy],
+        sub_agents=[create_hotels_agent(hotels_llm, hotels)],
+        extra_nodes={"user_info": lambda state: {"user_info": "[]"}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_each_assistant_binds_only_its_tools_and_escalation_is_free():
+    supervisor = ScriptedModel(
+        call(
+            "ToHotelBookingAssistant",
+            {
+                "location": "Basel",
+                "checkin_date": "",
+                "checkout_date": "",
+                "request": "",
+            },
+            "route_1",
+        ),
+        AIMessage(content="Anything else?"),
+    )
+    hotels = ScriptedModel(
+        call("CompleteOrEscalate", {"reason": "user wants a flight"}, "esc_1")
+    )
+    graph = build(supervisor, hotels)
+    config = {"configurable": {"thread_id": "t1"}}
+
+    result = await graph.ainvoke({"messages": [("user", "hotel in Basel")]}, config)
+
+    assert "search_hotels" not in supervisor.bound
+    assert "ToHotelBookingAssistant" in supervisor.bound
+    assert hotels.bound == ["search_hotels", "book_hotel", "CompleteOrEscalate"]
+    assert result["messages"][-1].content == "Anything else?"
+    assert result["dialog_state"] == []
+    # Two supervisor calls and one hotel call: leaving needs no model call
+    assert (supervisor.calls, hotels.calls) == (2, 1)
+
+
+def test_next_turn_goes_straight_to_the_active_sub_agent():
+    supervisor = ScriptedModel(
+        call(
+            "ToHotelBookingAssistant",
+            {
+                "location": "Basel",
+                "checkin_date": "",
+                "checkout_date": "",
+                "request": "",
+            },
+            "route_1",
+        )
+    )
+    hotels = ScriptedModel(
+        AIMessage(content="Which dates?"), AIMessage(content="Booked.")
+    )
+    graph = build(supervisor, hotels)
+    config = {"configurable": {"thread_id": "t2"}}
+
+    graph.invoke({"messages": [("user", "hotel in Basel")]}, config)
+    result = graph.invoke({"messages": [("user", "May 1 to 3")]}, config)
+
+    assert result["messages"][-1].content == "Booked."
+    assert result["dialog_state"] == ["hotels"]
+    assert supervisor.calls == 1
@@ -0,0 +1,53 @@
+from datetime import datetime
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+
+from app.agents.base.agent import Assistant
+from app.agents.base.prompts import build_primary_assistant_prompt, rounded_now
+
+
+def render(prompt, user_info: str):
+    return prompt.invoke(
+        {"messages": [("user", "when is my flight?")], "user_info": user_info}
+    ).to_messages()
+
+
+def test_user_context_trails_a_stable_prefix():
+    prompt = build_primary_assistant_prompt()
+
+    first = render(prompt, "[{'flight_no': 'LX0112'}]")
+    second = render(prompt, "[{'flight_no': 'LX0999'}]")
+
+    assert first[0] == second[0]
+    assert "LX0112" not in first[0].content
+    assert isinstance(first[-1], SystemMessage)
+    assert "LX0112" in first[-1].content
+
+
+def test_time_is_rounded_to_granularity():
+    now = datetime(2024, 5, 1, 10, 7, 42, 123)
+    with patch("app.agents.base.prompts.datetime") as clock:
+        clock.now.return_value = now
+        assert rounded_now(300) == datetime(2024, 5, 1, 10, 5)
+        assert rounded_now(1) == datetime(2024, 5, 1, 10, 7, 42)
+
+
+def test_cached_input_tokens_are_counted():
+    message = AIMessage(
+        content="At 10:00.",
+        usage_metadata={
+            "input_tokens": 1000,
+            "output_tokens": 20,
+            "total_tokens": 1020,
+            "input_token_details": {"cache_read": 800},
+        },
+    )
+    assistant = Assistant(RunnableLambda(lambda state: message))
+
+    assistant({"messages": [("user", "when?")]})
+
+    assert assistant.metrics.input_tokens == 1000
+    assert assistant.metrics.output_tokens == 20
+    assert assistant.metrics.cached_token_ratio == 0.8
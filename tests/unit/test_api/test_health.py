@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.agents.base.agent import AssistantMetrics
+from app.api.routes.health import router
+from app.bootstrap.readiness import Readiness, startup_phase
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(router)
+    app.state.readiness = Readiness()
+    return app
+
+
+def test_ready_reflects_startup_phases(app):
+    client = TestClient(app)
+    readiness = app.state.readiness
+
+    with startup_phase("database", readiness):
+        response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["phases"] == {"database": "running"}
+    assert client.get("/health/live").status_code == 200
+
+    readiness.mark_ready()
+    body = client.get("/health/ready").json()
+    assert body["status"] == "ready"
+    assert body["phases"] == {"database": "ready"}
+    assert set(body["timings"]) == {"database", "total"}
+
+
+def test_failed_startup_fails_both_probes(app):
+    client = TestClient(app)
+    readiness = app.state.readiness
+
+    with pytest.raises(RuntimeError):
+        with startup_phase("retriever", readiness):
+            raise RuntimeError("FAQ unreachable")
+    readiness.fail(RuntimeError("FAQ unreachable"))
+
+    assert client.get("/health/live").status_code == 503
+    body = client.get("/health/ready").json()
+    assert body["status"] == "failed"
+    assert body["phases"] == {"retriever": "failed"}
+
+
+def test_usage_totals_every_assistant(app):
+    client = TestClient(app)
+    assert client.get("/health/usage").status_code == 503
+
+    metrics = {
+        "supervisor": AssistantMetrics(
+            input_tokens=1000, output_tokens=20, cached_input_tokens=800
+        ),
+        "hotels": AssistantMetrics(
+            input_tokens=500, output_tokens=30, cached_input_tokens=100
+        ),
+    }
+    app.state.bootstrap = SimpleNamespace(
+        components=SimpleNamespace(assistant_metrics=metrics)
+    )
+
+    body = client.get("/health/usage").json()
+    assert body["hotels"]["cached_input_tokens"] == 100
+    assert body["total"] == {
+        "input_tokens": 1500,
+        "output_tokens": 50,
+        "cached_input_tokens": 900,
+        "cached_token_ratio": 0.6,
+    }
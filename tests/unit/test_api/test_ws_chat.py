@@ -0,0 +1,134 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.middleware.auth import create_passenger_token
+from app.api.routes.ws_chat import router
+from app.services.sessions.session_manager import SessionManager
+from app.utils.tool_execution import ToolExecutor, remaining_budget
+
+SECRET = "test-secret"
+
+
+class EchoAgent:
+    def __init__(self):
+        self.configs = []
+        self.budgets = []
+
+    async def ainvoke(self, inputs, config):
+        self.configs.append(config["configurable"])
+        self.budgets.append(remaining_budget())
+        return {"messages": [AIMessage(content=f"echo: {inputs['messages']}")]}
+
+
+def make_client(default_passenger_id=None):
+    app = FastAPI()
+    app.include_router(router)
+    agent = EchoAgent()
+    sessions = SessionManager(secret=SECRET, default_passenger_id=default_passenger_id)
+    app.state.bootstrap = SimpleNamespace(
+        components=SimpleNamespace(
+            agent=agent,
+            session_manager=sessions,
+            tool_executor=ToolExecutor(turn_budget=30.0),
+        )
+    )
+    return TestClient(app), agent, sessions
+
+
+def test_connections_get_separate_threads_for_the_token_passenger():
+    client, agent, sessions = make_client()
+    token = create_passenger_token("3442 587242", SECRET)
+
+    for _ in range(2):
+        with client.websocket_connect(f"/chat/ws?auth={token}") as ws:
+            ws.send_text("hi")
+            assert ws.receive_text() == "echo: hi"
+
+    assert [c["passenger_id"] for c in agent.configs] == ["3442 587242"] * 2
+    assert agent.configs[0]["thread_id"] != agent.configs[1]["thread_id"]
+    assert all(0 < budget <= 30.0 for budget in agent.budgets)
+    assert len(sessions) == 0
+
+
+def test_connection_without_token_uses_default_passenger_or_is_rejected():
+    client, agent, _ = make_client(default_passenger_id="3952-666242")
+    with client.websocket_connect("/chat/ws") as ws:
+        ws.send_text("hi")
+        ws.receive_text()
+    assert agent.configs[0]["passenger_id"] == "3952-666242"
+
+    client, _, _ = make_client()
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect("/chat/ws"):
+            pass
+    assert closed.value.code == 4401
+
+
+def test_expired_passenger_token_is_rejected(monkeypatch):
+    client, agent, sessions = make_client()
+    token = create_passenger_token("3442 587242", SECRET)
+    issued = time.time()
+    monkeypatch.setattr(time, "time", lambda: issued + sessions.passenger_token_ttl + 1)
+
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect(f"/chat/ws?auth={token}"):
+            pass
+
+    assert closed.value.code == 4401
+    assert agent.configs == []
+
+
+class StreamingAgent(EchoAgent):
+    async def astream_events(self, inputs, config, version):
+        meta = {"langgraph_node": "assistant"}
+        yield {"event": "on_tool_start", "name": "search_hotels", "data": {"input": {}}}
+        yield {
+            "event": "on_tool_end",
+            "name": "search_hotels",
+            "data": {"output": "ok"},
+        }
+        for delta in ("Hel", "lo"):
+            chunk = AIMessage(content=delta)
+            yield {
+                "event": "on_chat_model_stream",
+                "metadata": meta,
+                "data": {"chunk": chunk},
+            }
+        summary = {"langgraph_node": "manage_history"}
+        chunk = AIMessage(content="summary")
+        yield {
+            "event": "on_chat_model_stream",
+            "metadata": summary,
+            "data": {"chunk": chunk},
+        }
+
+    async def aget_state(self, config):
+        return SimpleNamespace(
+            values={"messages": [AIMessage(content="Hello")]}, next=()
+        )
+
+
+def test_stream_mode_sends_json_frames():
+    client, _, sessions = make_client(default_passenger_id="3952-666242")
+    client.app.state.bootstrap.components.agent = StreamingAgent()
+
+    with client.websocket_connect("/chat/ws?mode=stream") as ws:
+        session = ws.receive_json()
+        ws.send_text("hi")
+        frames = [ws.receive_json() for _ in range(5)]
+
+    assert session["type"] == "session" and session["token"]
+    assert [f["type"] for f in frames] == [
+        "tool_start",
+        "tool_end",
+        "token",
+        "token",
+        "final",
+    ]
+    assert frames[-1] == {"type": "final", "content": "Hello", "pending": []}
@@ -0,0 +1,33 @@
+from app.config.settings import Settings
+
+REQUIRED = {
+    "FAQ_URL": "https://example.com/faq.md",
+    "OPENAI_API_KEY": "sk-test",
+    "DB_PATH": "travel.sqlite",
+    "LLM_MODEL": "gpt-4o-mini",
+}
+
+
+def make_settings(monkeypatch, **env):
+    for name, value in {**REQUIRED, **env}.items():
+        monkeypatch.setenv(name, value)
+    return Settings(_env_file=None)
+
+
+def test_checkpoints_stay_in_memory_by_default(monkeypatch):
+    assert make_settings(monkeypatch).checkpointer == "memory"
+
+
+def test_empty_variables_are_treated_as_unset(monkeypatch):
+    settings = make_settings(monkeypatch, CHECKPOINTER="", POSTGRES_DSN="")
+
+    assert settings.checkpointer == "memory"
+    assert settings.postgres_dsn is None
+
+
+def test_empty_tool_limits_means_no_overrides(monkeypatch):
+    assert make_settings(monkeypatch, TOOL_LIMITS="").tool_limits == {}
+
+
+def test_empty_agent_graph_uses_the_multi_agent_graph(monkeypatch):
+    assert make_settings(monkeypatch, AGENT_GRAPH="").agent_graph == "multi_agent"
@@ -0,0 +1,127 @@
+import asyncio
+import operator
+from typing import Annotated
+
+import pytest
+from langgraph.graph import START, StateGraph
+from typing_extensions import TypedDict
+
+from app.services.database.checkpointer import (
+    CompressedSerializer,
+    DurableCheckpointSaver,
+    SQLiteCheckpointBackend,
+    to_postgres_placeholders,
+)
+from app.services.database.sqlite_pool import SQLitePool
+
+
+class CounterState(TypedDict):
+    steps: Annotated[list[str], operator.add]
+
+
+def build_graph(saver):
+    builder = StateGraph(CounterState)
+    builder.add_node("first", lambda state: {"steps": ["first"]})
+    builder.add_node("second", lambda state: {"steps": ["second"]})
+    builder.add_edge(START, "first")
+    builder.add_edge("first", "second")
+    return builder.compile(checkpointer=saver, interrupt_before=["second"])
+
+
+def make_saver(path, **kwargs):
+    pool = SQLitePool(str(path), size=2)
+    return DurableCheckpointSaver(SQLiteCheckpointBackend(pool), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_state_survives_a_new_saver_instance(tmp_path):
+    path = tmp_path / "checkpoints.sqlite"
+    config = {"configurable": {"thread_id": "t1"}}
+    saver = make_saver(path, flush_interval=60)
+
+    await build_graph(saver).ainvoke({"steps": []}, config)
+    await saver.aclose()
+
+    restarted = make_saver(path)
+    graph = build_graph(restarted)
+    assert (await graph.aget_state(config)).next == ("second",)
+
+    result = await graph.ainvoke(None, config)
+    await restarted.aclose()
+
+    assert result["steps"] == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_retention_keeps_last_checkpoints_and_expires_idle_threads(tmp_path):
+    saver = make_saver(tmp_path / "checkpoints.sqlite", keep_last=2, thread_ttl=0)
+    graph = build_graph(saver)
+    for thread_id in ("a", "b"):
+        config = {"configurable": {"thread_id": thread_id}}
+        await graph.ainvoke({"steps": []}, config)
+        await graph.ainvoke(None, config)
+
+    history = [c async for c in saver.alist({"configurable": {"thread_id": "a"}})]
+    assert len(history) == 2
+
+    expired = await saver.expire_idle_threads()
+    await saver.aclose()
+
+    assert sorted(expired) == ["a", "b"]
+
+
+def test_sync_calls_without_a_running_loop(tmp_path):
+    saver = make_saver(tmp_path / "checkpoints.sqlite")
+    config = {"configurable": {"thread_id": "sync"}}
+
+    build_graph(saver).invoke({"steps": []}, config)
+
+    assert saver.get_tuple(config).checkpoint["channel_values"]["steps"] == ["first"]
+    saver.close()
+
+
+class LoopRecordingBackend(SQLiteCheckpointBackend):
+    def __init__(self, pool):
+        super().__init__(pool)
+        self.loops = set()
+
+    async def _execute_many(self, statements):
+        self.loops.add(asyncio.get_running_loop())
+        await super()._execute_many(statements)
+
+    async def _fetch(self, query, params=()):
+        self.loops.add(asyncio.get_running_loop())
+        return await super()._fetch(query, params)
+
+
+def test_backend_stays_on_one_loop(tmp_path):
+    backend = LoopRecordingBackend(SQLitePool(str(tmp_path / "c.sqlite"), size=2))
+    saver = DurableCheckpointSaver(backend)
+    graph = build_graph(saver)
+    config = {"configurable": {"thread_id": "loops"}}
+
+    graph.invoke({"steps": []}, config)
+    graph.invoke(None, config)
+    # A caller on its own loop is served by the loop the backend is bound to
+    state = asyncio.run(graph.aget_state(config))
+    saver.close()
+
+    assert state.values["steps"] == ["first", "second"]
+    assert len(backend.loops) == 1
+
+
+def test_large_payloads_are_compressed():
+    serde = CompressedSerializer(min_size=64)
+    value = {"messages": ["same text"] * 100}
+
+    typ, data = serde.dumps_typed(value)
+
+    assert typ.endswith("+zlib")
+    assert serde.loads_typed((typ, data)) == value
+    assert serde.dumps_typed("small")[0] != typ
+
+
+def test_postgres_placeholders_are_numbered():
+    assert to_postgres_placeholders("a = ? AND b < ? LIMIT ?") == (
+        "a = $1 AND b < $2 LIMIT $3"
+    )
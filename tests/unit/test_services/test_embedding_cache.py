@@ -0,0 +1,45 @@
+import numpy as np
+
+from app.services.vectorstore.embedding_cache import EmbeddingCache
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0, 0.0] for text in texts]
+
+
+def test_only_new_documents_are_embedded(tmp_path):
+    cache = EmbeddingCache(cache_dir=str(tmp_path), model="test-model")
+    embed = FakeEmbedder()
+
+    first = cache.get_or_embed(["a", "bb"], embed)
+    second = cache.get_or_embed(["a", "bb", "ccc"], embed)
+
+    assert embed.calls == [["a", "bb"], ["ccc"]]
+    assert second.shape == (3, 3)
+    np.testing.assert_array_equal(second[:2], first)
+
+
+def test_unchanged_corpus_is_memory_mapped(tmp_path):
+    cache = EmbeddingCache(cache_dir=str(tmp_path), model="test-model")
+    embed = FakeEmbedder()
+    cache.get_or_embed(["a", "bb"], embed)
+
+    matrix = cache.get_or_embed(["a", "bb"], embed)
+
+    assert len(embed.calls) == 1
+    assert isinstance(matrix, np.memmap)
+    assert matrix.dtype == np.float32
+
+
+def test_model_change_invalidates_cache(tmp_path):
+    embed = FakeEmbedder()
+    EmbeddingCache(cache_dir=str(tmp_path), model="old").get_or_embed(["a"], embed)
+
+    EmbeddingCache(cache_dir=str(tmp_path), model="new").get_or_embed(["a"], embed)
+
+    assert embed.calls == [["a"], ["a"]]
@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import openai
+import pytest
+
+from app.services.llm.embeddings import (
+    HashingEmbeddingProvider,
+    OpenAIEmbeddingProvider,
+    batch_texts,
+)
+from app.services.llm.factory import create_embedding_provider
+
+
+class FlakyEmbeddings:
+    """Fails the first `failures` requests, then returns one-hot vectors."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.batches = []
+
+    def create(self, model: str, input: list[str]):
+        if self.failures:
+            self.failures -= 1
+            raise openai.APIConnectionError(
+                request=httpx.Request("POST", "https://api.openai.com")
+            )
+        self.batches.append(list(input))
+        return SimpleNamespace(
+            data=[SimpleNamespace(embedding=[float(len(text)), 1.0]) for text in input]
+        )
+
+
+def test_batch_texts_respects_size_and_token_limits():
+    texts = ["x" * 40] * 5
+
+    assert [len(b) for b in batch_texts(texts, max_batch_size=2)] == [2, 2, 1]
+    assert [len(b) for b in batch_texts(texts, max_batch_tokens=25)] == [2, 2, 1]
+
+
+def test_openai_provider_batches_concurrently_in_order():
+    embeddings = FlakyEmbeddings()
+    provider = OpenAIEmbeddingProvider(
+        client=SimpleNamespace(embeddings=embeddings),
+        max_batch_size=2,
+        max_concurrency=3,
+    )
+
+    vectors = provider.embed(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    np.testing.assert_array_equal(vectors[:, 0], [1, 2, 3, 4, 5])
+    assert len(embeddings.batches) == 3
+    assert provider.metrics.requests == 3
+    assert provider.metrics.texts == 5
+
+
+def test_openai_provider_retries_transient_errors():
+    embeddings = FlakyEmbeddings(failures=2)
+    provider = OpenAIEmbeddingProvider(
+        client=SimpleNamespace(embeddings=embeddings), backoff=0
+    )
+
+    provider.embed(["a"])
+
+    assert provider.metrics.retries == 2
+
+
+def test_openai_provider_gives_up_after_max_retries():
+    embeddings = FlakyEmbeddings(failures=5)
+    provider = OpenAIEmbeddingProvider(
+        client=SimpleNamespace(embeddings=embeddings), max_retries=1, backoff=0
+    )
+
+    with pytest.raises(openai.APIConnectionError):
+        provider.embed(["a"])
+    assert provider.metrics.failures == 1
+
+
+def test_hashing_provider_is_deterministic_and_normalized():
+    provider = HashingEmbeddingProvider(dim=64)
+
+    first = provider.embed(["refund policy", "baggage"])
+    second = HashingEmbeddingProvider(dim=64).embed(["refund policy", "baggage"])
+
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_allclose(np.linalg.norm(first, axis=1), 1.0, atol=1e-6)
+    assert first[0] @ provider.embed(["refund policies"])[0] > first[1] @ first[0]
+
+
+def test_openai_clients_leave_retries_to_the_provider(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    settings = SimpleNamespace(
+        embedding_provider="openai",
+        embedding_model="text-embedding-3-small",
+        embedding_batch_size=2048,
+        embedding_concurrency=4,
+        embedding_max_retries=3,
+    )
+
+    provider = create_embedding_provider(settings)
+
+    assert provider.max_retries == 3
+    assert provider._client.max_retries == 0
+    assert provider._async_client.max_retries == 0
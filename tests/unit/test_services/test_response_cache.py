@@ -0,0 +1,51 @@
+import pytest
+
+from app.services.llm.embeddings import HashingEmbeddingProvider
+from app.services.vectorstore.response_cache import SemanticResponseCache
+from app.services.vectorstore.vector_store import VectorStoreRetriever
+from app.utils.cache import LRUTTLCache
+
+DOCS = [{"page_content": "Checked baggage allowance is 23 kg."}]
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(**kwargs):
+    retriever = VectorStoreRetriever.from_docs(
+        DOCS, HashingEmbeddingProvider(dim=256), query_cache=LRUTTLCache()
+    )
+    return SemanticResponseCache(retriever, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_paraphrases_hit_and_unrelated_questions_miss():
+    cache = make_cache(threshold=0.8)
+    await cache.astore("What is the baggage allowance?", "23 kg.")
+
+    assert await cache.alookup("what is the  baggage allowance") == "23 kg."
+    assert cache.lookup("How do I request a refund for my ticket?") is None
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+
+def test_entries_expire_and_lru_entry_is_evicted():
+    clock = Clock()
+    cache = make_cache(threshold=0.99, ttl=10, max_entries=2, clock=clock)
+    cache.store("baggage allowance", "23 kg.")
+    cache.store("refund policy", "Refunds within 24h.")
+
+    clock.now = 5
+    assert cache.lookup("baggage allowance") == "23 kg."
+    cache.store("change fees", "50 CHF.")
+
+    assert cache.stats.evictions == 1
+    assert cache.lookup("refund policy") is None
+    assert cache.lookup("baggage allowance") == "23 kg."
+
+    clock.now = 100
+    assert cache.lookup("baggage allowance") is None
+    assert cache.stats.expirations == 1
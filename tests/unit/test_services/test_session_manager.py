@@ -0,0 +1,59 @@
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.services.sessions.session_manager import SessionManager
+from app.utils.exceptions import AuthenticationError, SessionError
+from app.utils.tokens import sign_token, verify_token
+
+SECRET = "test-secret"
+
+
+def test_tokens_reject_tampering_and_expiry():
+    token = sign_token({"sub": "3442 587242"}, SECRET)
+
+    assert verify_token(token, SECRET)["sub"] == "3442 587242"
+    with pytest.raises(AuthenticationError):
+        verify_token(token, "other-secret")
+    with pytest.raises(AuthenticationError):
+        verify_token(token + "x", SECRET)
+    with pytest.raises(AuthenticationError):
+        verify_token(token, SECRET, max_age=-1)
+
+
+@pytest.mark.asyncio
+async def test_each_connection_gets_its_own_thread_and_can_resume():
+    manager = SessionManager(secret=SECRET)
+
+    first = manager.open("3442 587242")
+    second = manager.open("3442 587242")
+    assert first.thread_id != second.thread_id
+    assert len(manager) == 2
+
+    token = manager.token(first)
+    with pytest.raises(SessionError):
+        manager.open("3442 587242", resume_token=token)
+    with pytest.raises(SessionError):
+        manager.open("someone else", resume_token=token)
+
+    await manager.close(first)
+    resumed = manager.open("3442 587242", resume_token=token)
+
+    assert resumed.thread_id == first.thread_id and resumed.resumed
+    assert resumed.config["configurable"]["passenger_id"] == "3442 587242"
+
+
+@pytest.mark.asyncio
+async def test_close_deletes_non_durable_threads():
+    checkpointer = MemorySaver()
+    manager = SessionManager(
+        secret=SECRET, checkpointer=checkpointer, delete_on_close=True, max_sessions=1
+    )
+    session = manager.open("3442 587242")
+    checkpointer.storage[session.thread_id][""]["1"] = (None, None, None)
+
+    with pytest.raises(SessionError):
+        manager.open("3442 587242")
+    await manager.close(session)
+
+    assert session.thread_id not in checkpointer.storage
+    assert len(manager) == 0
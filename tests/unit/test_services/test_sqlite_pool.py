@@ -0,0 +1,54 @@
+import sqlite3
+
+import pytest
+
+from app.services.database.sqlite_pool import SQLitePool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLitePool(str(tmp_path / "travel.sqlite"), size=2, acquire_timeout=0.05)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE hotels (id INTEGER, booked INTEGER)")
+        conn.execute("INSERT INTO hotels VALUES (1, 0)")
+    yield pool
+    pool.close()
+
+
+def test_connections_are_tuned_and_reused(pool):
+    with pool.connection() as conn:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        first = id(conn)
+    with pool.connection() as conn:
+        second = id(conn)
+
+    assert journal_mode == "wal"
+    assert first == second
+    assert pool.stats().created == 1
+
+
+def test_failed_transaction_is_rolled_back(pool):
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.execute("UPDATE hotels SET booked = 1")
+            raise RuntimeError("tool failed")
+
+    with pool.connection() as conn:
+        assert conn.execute("SELECT booked FROM hotels").fetchone()[0] == 0
+    assert pool.stats().in_use == 0
+
+
+def test_exhausted_pool_times_out(pool):
+    with pool.connection(), pool.connection():
+        assert pool.stats().utilization == 1.0
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.connection():
+                pass
+
+    assert pool.stats().waits == 1
+
+
+def test_warm_up_opens_every_connection(pool):
+    assert pool.warm_up() == 2
+    assert pool.stats().created == 2
+    assert pool.stats().in_use == 0
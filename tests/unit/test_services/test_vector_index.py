@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from app.services.llm.embeddings import HashingEmbeddingProvider
+from app.services.vectorstore.index import (
+    ExactIndex,
+    IVFIndex,
+    build_index,
+    normalize_rows,
+)
+from app.services.vectorstore.vector_store import VectorStoreRetriever
+
+
+@pytest.fixture
+def corpus():
+    rng = np.random.default_rng(42)
+    centers = rng.normal(size=(20, 32))
+    rows = centers[rng.integers(0, 20, size=2000)] + 0.1 * rng.normal(size=(2000, 32))
+    return normalize_rows(rows), normalize_rows(rng.normal(size=(50, 32)))
+
+
+def recall(exact, approx, k):
+    hits = sum(len(set(e[0][:k]) & set(a[0][:k])) for e, a in zip(exact, approx))
+    return hits / (len(exact) * k)
+
+
+@pytest.mark.parametrize("quantization", [None, "float16", "int8"])
+def test_ivf_recall_against_exact(corpus, quantization):
+    vectors, queries = corpus
+    exact = ExactIndex(vectors).search(queries, 5)
+    ivf = IVFIndex.build(vectors, nlist=20, nprobe=6, quantization=quantization)
+
+    assert recall(exact, ivf.search(queries, 5), 5) >= 0.9
+
+
+def test_int8_storage_is_smaller(corpus):
+    vectors, _ = corpus
+    ivf = IVFIndex.build(vectors, nlist=20, quantization="int8")
+
+    assert ivf.vectors.dtype == np.int8
+    assert ivf.vectors.nbytes == vectors.nbytes // 4
+
+
+def test_persisted_index_is_reused_only_for_same_corpus(corpus, tmp_path):
+    vectors, queries = corpus
+    path = str(tmp_path / "policy.ivf.npz")
+
+    built = build_index(vectors, kind="ivf", nlist=20, path=path, fingerprint="v1")
+    loaded = build_index(vectors, kind="ivf", nlist=20, path=path, fingerprint="v1")
+    rebuilt = build_index(vectors[:100], kind="ivf", path=path, fingerprint="v2")
+
+    assert loaded.fingerprint == "v1"
+    np.testing.assert_array_equal(loaded.ids, built.ids)
+    assert rebuilt.size == 100
+
+
+def test_persisted_index_of_another_dimension_is_rebuilt(corpus, tmp_path):
+    vectors, _ = corpus
+    path = str(tmp_path / "policy.ivf.npz")
+    build_index(vectors, kind="ivf", nlist=20, path=path, fingerprint="v1")
+
+    wider = normalize_rows(np.hstack([vectors, vectors]))
+    rebuilt = build_index(wider, kind="ivf", nlist=20, path=path, fingerprint="v1")
+
+    assert rebuilt.centroids.shape[1] == 64
+    assert rebuilt.search(wider[:1], k=1)[0][0][0] == 0
+    assert IVFIndex.load(path).centroids.shape[1] == 64
+
+
+def test_changing_the_embedder_invalidates_the_persisted_index(tmp_path):
+    docs = [{"page_content": f"refund and baggage policy {i}"} for i in range(50)]
+    options = {"nlist": 4, "path": str(tmp_path / "policy.ivf.npz")}
+
+    first = VectorStoreRetriever.from_docs(
+        docs, HashingEmbeddingProvider(dim=64), index="ivf", index_options=options
+    )
+    second = VectorStoreRetriever.from_docs(
+        docs, HashingEmbeddingProvider(dim=128), index="ivf", index_options=options
+    )
+
+    assert first.index.fingerprint != second.index.fingerprint
+    assert second.index.centroids.shape[1] == 128
+    assert second.query("refunds", k=1)
+
+
+def test_ivf_on_empty_corpus_falls_back_to_exact():
+    index = build_index(np.empty((0, 8), dtype=np.float32), kind="ivf")
+
+    assert isinstance(index, ExactIndex)
+    assert index.search(np.ones((1, 8), dtype=np.float32), k=3)[0][0].size == 0
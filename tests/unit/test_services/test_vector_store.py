@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.llm.embeddings import OpenAIEmbeddingProvider
+from app.services.vectorstore.hybrid import HybridRetriever
+from app.services.vectorstore.vector_store import VectorStoreRetriever
+from app.utils.cache import LRUTTLCache
+
+VOCABULARY = ["refund", "baggage", "change", "cancel"]
+
+
+class FakeEmbeddings:
+    """Bag-of-words embeddings over a tiny vocabulary."""
+
+    def __init__(self):
+        self.requests = []
+
+    def create(self, model: str, input: list[str]):
+        self.requests.append(list(input))
+        data = [
+            SimpleNamespace(
+                embedding=[float(text.lower().count(word)) for word in VOCABULARY]
+            )
+            for text in input
+        ]
+        return SimpleNamespace(data=data)
+
+
+class FakeAsyncEmbeddings(FakeEmbeddings):
+    async def create(self, model: str, input: list[str]):
+        return super().create(model=model, input=input)
+
+
+def make_retriever(query_cache=None):
+    client = SimpleNamespace(embeddings=FakeEmbeddings())
+    async_client = SimpleNamespace(embeddings=FakeAsyncEmbeddings())
+    docs = [
+        {"page_content": "refund refund policy"},
+        {"page_content": "baggage allowance"},
+        {"page_content": "change or cancel a flight"},
+    ]
+    return (
+        VectorStoreRetriever.from_docs(
+            docs,
+            OpenAIEmbeddingProvider(client=client, async_client=async_client),
+            query_cache=query_cache,
+        ),
+        client,
+    )
+
+
+def test_matrix_is_normalized_float32():
+    retriever, _ = make_retriever()
+
+    assert retriever.index.matrix.dtype == np.float32
+    assert retriever.index.matrix.flags.c_contiguous
+    np.testing.assert_allclose(
+        np.linalg.norm(retriever.index.matrix, axis=1), 1.0, atol=1e-6
+    )
+
+
+def test_query_returns_best_match_first():
+    retriever, _ = make_retriever()
+
+    results = retriever.query("Refund?", k=2)
+
+    assert results[0]["page_content"] == "refund refund policy"
+    assert results[0]["similarity"] >= results[1]["similarity"]
+
+
+def test_query_many_uses_one_request_and_cache():
+    retriever, client = make_retriever(query_cache=LRUTTLCache(max_size=8))
+
+    retriever.query("baggage", k=1)
+    batches = retriever.query_many(["baggage", "cancel", "Cancel "], k=1)
+
+    assert client.embeddings.requests[-1] == ["cancel"]
+    assert [batch[0]["page_content"] for batch in batches] == [
+        "baggage allowance",
+        "change or cancel a flight",
+        "change or cancel a flight",
+    ]
+
+
+def test_original_query_text_is_embedded():
+    retriever, client = make_retriever(query_cache=LRUTTLCache(max_size=8))
+
+    retriever.query_many(["Refund  for LX0112", "refund for lx0112"], k=1)
+
+    # Normalized text is only the cache key
+    assert client.embeddings.requests[-1] == ["Refund  for LX0112"]
+
+
+@pytest.mark.asyncio
+async def test_aquery_matches_query():
+    retriever, _ = make_retriever()
+
+    sync_results = retriever.query("baggage", k=1)
+    async_results = await retriever.aquery("baggage", k=1)
+
+    assert async_results == sync_results
+    assert retriever._embedder._async_client.embeddings.requests == [["baggage"]]
+
+
+def test_hybrid_lexical_fast_path_skips_embeddings():
+    retriever, client = make_retriever()
+    hybrid = HybridRetriever(retriever, lexical_confidence=0.5)
+
+    results = hybrid.query("baggage allowance", k=1)
+
+    assert results[0]["page_content"] == "baggage allowance"
+    assert client.embeddings.requests == [
+        ["refund refund policy", "baggage allowance", "change or cancel a flight"]
+    ]
+    assert hybrid.lexical_hits == 1
+
+
+def test_hybrid_falls_back_to_lexical_when_embeddings_fail():
+    retriever, client = make_retriever()
+    hybrid = HybridRetriever(retriever, lexical_confidence=None)
+
+    def unavailable(**kwargs):
+        raise ConnectionError("embeddings endpoint down")
+
+    client.embeddings.create = unavailable
+    results = hybrid.query("cancel my flight", k=2)
+
+    assert results[0]["page_content"] == "change or cancel a flight"
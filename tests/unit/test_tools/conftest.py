@@ -0,0 +1,71 @@
+import pytest
+
+from app.services.database.migrations import apply_migrations
+from app.services.database.sqlite_pool import SQLitePool
+
+SCHEMA = """
+CREATE TABLE flights (
+    flight_id INTEGER, flight_no TEXT, scheduled_departure TEXT,
+    scheduled_arrival TEXT, departure_airport TEXT, arrival_airport TEXT,
+    status TEXT, aircraft_code TEXT, actual_departure TEXT, actual_arrival TEXT
+);
+CREATE TABLE tickets (ticket_no TEXT, book_ref TEXT, passenger_id TEXT);
+CREATE TABLE ticket_flights (
+    ticket_no TEXT, flight_id INTEGER, fare_conditions TEXT, amount REAL
+);
+CREATE TABLE boarding_passes (
+    ticket_no TEXT, flight_id INTEGER, boarding_no INTEGER, seat_no TEXT
+);
+CREATE TABLE hotels (
+    id INTEGER, name TEXT, location TEXT, price_tier TEXT,
+    checkin_date TEXT, checkout_date TEXT, booked INTEGER
+);
+CREATE TABLE car_rentals (
+    id INTEGER, name TEXT, location TEXT, price_tier TEXT,
+    start_date TEXT, end_date TEXT, booked INTEGER
+);
+CREATE TABLE trip_recommendations (
+    id INTEGER, name TEXT, location TEXT, keywords TEXT, details TEXT, booked INTEGER
+);
+
+INSERT INTO flights VALUES
+    (1, 'LX0112', '2099-01-01 10:00:00.000000+01:00', '2099-01-01 11:00:00.000000+01:00',
+     'CDG', 'BSL', 'Scheduled', '319', NULL, NULL),
+    (2, 'LX0114', '2099-01-08 10:00:00.000000+01:00', '2099-01-08 11:00:00.000000+01:00',
+     'CDG', 'BSL', 'Scheduled', '319', NULL, NULL);
+INSERT INTO tickets VALUES ('7240005432906569', 'C46E9F', '3442 587242');
+INSERT INTO ticket_flights VALUES ('7240005432906569', 1, 'Economy', 100.0);
+INSERT INTO boarding_passes VALUES ('7240005432906569', 1, 1, '18E');
+INSERT INTO hotels VALUES
+    (1, 'Hilton Basel', 'Basel', 'Luxury', '2024-04-22', '2024-04-20', 0),
+    (2, 'Marriott Zurich', 'Zurich', 'Upscale', '2024-04-14', '2024-04-21', 0),
+    (3, 'Hyatt Regency Basel', 'Basel', 'Upper Upscale', '2024-04-02', '2024-04-20', 0);
+INSERT INTO car_rentals VALUES
+    (1, 'Europcar', 'Basel', 'Economy', '2024-04-14', '2024-04-11', 0),
+    (2, 'Avis', 'Basel', 'Luxury', '2024-04-10', '2024-04-20', 0);
+INSERT INTO trip_recommendations VALUES
+    (1, 'Basel Minster', 'Basel', 'landmark, history', 'Visit the historic cathedral.', 0),
+    (2, 'Kunstmuseum Basel', 'Basel', 'art, museum', 'Explore the art museum.', 0),
+    (3, 'Zurich Zoo', 'Zurich', 'wildlife, zoo', 'Visit the zoo.', 0);
+"""
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLitePool(str(tmp_path / "travel.sqlite"), size=4)
+    with pool.connection() as conn:
+        conn.executescript(SCHEMA)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def migrated_pool(pool):
+    with pool.connection() as conn:
+        apply_migrations(conn)
+    return pool
+
+
+@pytest.fixture
+def passenger_config():
+    return {"configurable": {"passenger_id": "3442 587242"}}
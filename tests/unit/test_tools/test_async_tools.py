@@ -0,0 +1,36 @@
+import pytest
+
+from app.agents.flights.tools import create_flight_booking_tools
+from app.agents.hotels.tools import create_hotel_booking_tools
+
+
+@pytest.mark.asyncio
+async def test_async_tools_run_on_the_pool_executor(pool, passenger_config):
+    threads = []
+    original = pool.run
+
+    async def tracking_run(func, *args, **kwargs):
+        threads.append(func.__name__)
+        return await original(func, *args, **kwargs)
+
+    pool.run = tracking_run
+    fetch, *_ = create_flight_booking_tools(pool=pool, use_async=True)
+
+    tickets = await fetch.ainvoke({}, config=passenger_config)
+
+    assert threads == ["fetch_user_flight_information"]
+    assert tickets[0]["ticket_no"] == "7240005432906569"
+
+
+@pytest.mark.asyncio
+async def test_async_and_sync_tools_agree(pool):
+    sync_tools = create_hotel_booking_tools(pool=pool)
+    async_tools = create_hotel_booking_tools(pool=pool, use_async=True)
+
+    expected = sync_tools[0].invoke({"location": "Basel"})
+    result = await async_tools[0].ainvoke({"location": "Basel"})
+
+    assert result == expected
+    assert await async_tools[1].ainvoke({"hotel_id": 2}) == (
+        "Hotel 2 successfully booked."
+    )
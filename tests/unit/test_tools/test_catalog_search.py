@@ -0,0 +1,106 @@
+from app.agents.activities.tools import create_activities_tools
+from app.agents.cars.tools import create_cars_booking_tools
+from app.agents.flights.tools import create_flight_booking_tools
+from app.agents.hotels.tools import create_hotel_booking_tools
+from app.services.database.fts import build_match, catalog_search_query
+from app.services.database.migrations import verify_query_plans
+
+
+def test_hotel_search_matches_prefixes(migrated_pool):
+    search_hotels = create_hotel_booking_tools(pool=migrated_pool)[0]
+
+    results = search_hotels.invoke({"location": "bas"})["results"]
+
+    assert {hotel["name"] for hotel in results} == {
+        "Hilton Basel",
+        "Hyatt Regency Basel",
+    }
+
+
+def test_fts_index_follows_base_table_updates(migrated_pool):
+    with migrated_pool.connection() as conn:
+        conn.execute("UPDATE hotels SET name = 'Grand Zurich' WHERE id = 2")
+        conn.execute(
+            "INSERT INTO hotels VALUES "
+            "(4, 'Sheraton Zurich', 'Zurich', 'Upscale', NULL, NULL, 0)"
+        )
+    search_hotels = create_hotel_booking_tools(pool=migrated_pool)[0]
+
+    assert search_hotels.invoke({"name": "marriott"})["results"] == []
+    zurich = search_hotels.invoke({"name": "zurich"})["results"]
+    assert {hotel["id"] for hotel in zurich} == {2, 4}
+
+
+def test_trip_keywords_match_any_value(migrated_pool):
+    search_trips = create_activities_tools(pool=migrated_pool)[0]
+
+    results = search_trips.invoke({"location": "Basel", "keywords": "museum, zoo"})[
+        "results"
+    ]
+
+    assert [trip["name"] for trip in results] == ["Kunstmuseum Basel"]
+
+
+def test_car_search_combines_text_and_date_filters(migrated_pool):
+    search_cars = create_cars_booking_tools(pool=migrated_pool)[0]
+
+    results = search_cars.invoke({"location": "Basel", "start_date": "2024-04-12"})[
+        "results"
+    ]
+
+    assert [car["name"] for car in results] == ["Europcar"]
+
+
+def test_catalog_search_uses_fts_index(migrated_pool):
+    queries = {
+        table: catalog_search_query(table, build_match({"location": "Basel"}))
+        for table in ("hotels", "car_rentals", "trip_recommendations")
+    }
+
+    with migrated_pool.connection() as conn:
+        verify_query_plans(conn, queries, strict=True)
+
+
+def test_search_pages_through_results_with_cursor(migrated_pool):
+    search_hotels = create_hotel_booking_tools(pool=migrated_pool)[0]
+
+    first = search_hotels.invoke({"limit": 2})
+    second = search_hotels.invoke({"limit": 2, "cursor": first["next_cursor"]})
+
+    assert first["total"] == 3
+    assert [hotel["id"] for hotel in first["results"]] == [1, 2]
+    assert [hotel["id"] for hotel in second["results"]] == [3]
+    assert second["next_cursor"] is None
+    assert set(first["results"][0]) == {
+        "id",
+        "name",
+        "location",
+        "price_tier",
+        "booked",
+    }
+
+
+def test_cursor_from_another_search_is_rejected(migrated_pool):
+    search_flights = create_flight_booking_tools(pool=migrated_pool)[1]
+    page = search_flights.invoke({"departure_airport": "CDG", "limit": 1})
+
+    assert page["total"] == 2
+    result = search_flights.invoke(
+        {"departure_airport": "BSL", "cursor": page["next_cursor"]}
+    )
+
+    assert result.startswith("Error searching flights: The cursor belongs to")
+
+
+def test_malformed_cursor_is_reported_to_the_model(migrated_pool):
+    search_hotels = create_hotel_booking_tools(pool=migrated_pool)[0]
+
+    result = search_hotels.invoke({"cursor": "not-a-cursor"})
+
+    assert result.startswith("Error searching hotels: Invalid cursor.")
+
+
+def test_flight_search_returns_twenty_flights_by_default():
+    search_flights = create_flight_booking_tools(pool=None)[1]
+
+    assert search_flights.args["limit"]["default"] == 20
@@ -0,0 +1,31 @@
+import pytest
+
+from app.bootstrap.bootstrap import QUERY_PLAN_CHECKS
+from app.services.database.migrations import apply_migrations, verify_query_plans
+from app.utils.exceptions import QueryPlanError
+
+
+def test_tool_queries_scan_tables_without_migrations(pool):
+    with pool.connection() as conn:
+        with pytest.raises(QueryPlanError) as error:
+            verify_query_plans(conn, QUERY_PLAN_CHECKS, strict=True)
+
+    assert "fetch_user_flight_information" in error.value.scans
+    assert {"book_hotel", "update_car_rental", "cancel_excursion"} <= set(
+        error.value.scans
+    )
+
+
+def test_table_scans_only_warn_unless_strict(pool, caplog):
+    with pool.connection() as conn:
+        verify_query_plans(conn, QUERY_PLAN_CHECKS)
+
+    assert "fall back to table scans" in caplog.text
+
+
+def test_tool_queries_use_indexes_after_migrations(pool):
+    with pool.connection() as conn:
+        apply_migrations(conn)
+        apply_migrations(conn)
+
+        verify_query_plans(conn, QUERY_PLAN_CHECKS, strict=True)
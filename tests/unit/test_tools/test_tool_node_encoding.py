@@ -0,0 +1,32 @@
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from app.agents.hotels.tools import create_hotel_booking_tools
+from app.utils.nodes_helpers import create_tool_node_with_fallback
+from app.utils.tool_results import ToolResultEncoder
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_async", [False, True])
+async def test_tool_node_returns_encoded_content(migrated_pool, use_async):
+    tools = create_hotel_booking_tools(pool=migrated_pool, use_async=use_async)
+    node = create_tool_node_with_fallback(tools, ToolResultEncoder())
+    message = AIMessage(
+        content="",
+        tool_calls=[
+            {"name": "search_hotels", "args": {"location": "Basel"}, "id": "call_1"}
+        ],
+    )
+
+    if use_async:
+        result = await node.ainvoke({"messages": [message]})
+    else:
+        result = node.invoke({"messages": [message]})
+
+    content = result["messages"][0].content
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(content)
+    assert content.startswith("total: ")
+    assert "Basel" in content
@@ -0,0 +1,42 @@
+from app.agents.flights.profile import UserProfileCache
+from app.agents.flights.tools import create_flight_booking_tools
+
+PASSENGER_ID = "3442 587242"
+TICKET_NO = "7240005432906569"
+
+
+def test_profile_is_rendered_once_and_served_from_cache(pool):
+    cache = UserProfileCache(pool=pool, ttl=60)
+
+    first = cache.get(PASSENGER_ID)
+    second = cache.get(PASSENGER_ID)
+
+    assert first is second
+    assert TICKET_NO in first.text
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_cancel_ticket_invalidates_cached_profile(pool, passenger_config):
+    cache = UserProfileCache(pool=pool, ttl=60)
+    fetch, _, _, cancel = create_flight_booking_tools(pool=pool, profile_cache=cache)
+
+    assert len(fetch.invoke({}, config=passenger_config)) == 1
+
+    result = cancel.invoke({"ticket_no": TICKET_NO}, config=passenger_config)
+
+    assert result == "Ticket successfully cancelled."
+    assert cache.get(PASSENGER_ID).flights == []
+
+
+def test_failed_update_keeps_cached_profile(pool, passenger_config):
+    cache = UserProfileCache(pool=pool, ttl=60)
+    _, _, update, _ = create_flight_booking_tools(pool=pool, profile_cache=cache)
+    profile = cache.get(PASSENGER_ID)
+
+    result = update.invoke(
+        {"ticket_no": TICKET_NO, "new_flight_id": 999}, config=passenger_config
+    )
+
+    assert result == "Invalid new flight ID provided."
+    assert cache.get(PASSENGER_ID) is profile
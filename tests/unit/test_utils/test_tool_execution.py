@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+
+from app.services.database.sqlite_pool import SQLitePool
+from app.utils.exceptions import ToolTimeoutError
+from app.utils.nodes_helpers import create_tool_node_with_fallback
+from app.utils.tool_execution import (
+    ToolExecutor,
+    ToolLimits,
+    remaining_budget,
+    turn_deadline,
+)
+
+
+def test_per_tool_concurrency_is_bounded():
+    executor = ToolExecutor(
+        max_concurrency=8, limits={"slow": ToolLimits(max_concurrency=2)}
+    )
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def slow():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    threads = [
+        threading.Thread(target=executor.run, args=("slow", slow)) for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 2
+    assert executor.stats.calls == 6
+    assert executor.stats.queued >= 4
+
+
+def test_sync_call_times_out_and_keeps_its_slot_until_done():
+    executor = ToolExecutor(max_concurrency=1, timeout=0.05)
+    release = threading.Event()
+
+    with pytest.raises(ToolTimeoutError) as info:
+        executor.run("stuck", release.wait)
+    assert info.value.stage == "running"
+
+    # The stuck thread still holds the only slot
+    with pytest.raises(ToolTimeoutError) as info:
+        executor.run("other", lambda: "ok")
+    assert info.value.stage == "queued"
+
+    release.set()
+    time.sleep(0.01)
+    assert executor.run("other", lambda: "ok") == "ok"
+    assert executor.stats.timeouts == 2
+
+
+@pytest.mark.asyncio
+async def test_turn_budget_caps_the_timeout():
+    executor = ToolExecutor(timeout=10.0)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    with turn_deadline(0.05):
+        with turn_deadline(60):
+            assert remaining_budget() <= 0.05
+        with pytest.raises(ToolTimeoutError) as info:
+            await executor.arun("slow", slow)
+
+    assert info.value.bound == "turn budget"
+    assert remaining_budget() is None
+
+
+@pytest.mark.asyncio
+async def test_tool_node_reports_timeouts_as_structured_errors():
+    async def search_flights(origin: str) -> str:
+        """Search flights."""
+        await asyncio.sleep(1)
+
+    async def lookup_policy(query: str) -> str:
+        """Lookup policy."""
+        return "no refunds"
+
+    tools = [
+        StructuredTool.from_function(coroutine=search_flights),
+        StructuredTool.from_function(coroutine=lookup_policy),
+    ]
+    executor = ToolExecutor(limits={"search_flights": ToolLimits(timeout=0.05)})
+    node = create_tool_node_with_fallback(tools, executor=executor)
+    message = AIMessage(
+        content="",
+        tool_calls=[
+            {"name": "search_flights", "args": {"origin": "ZRH"}, "id": "call_1"},
+            {"name": "lookup_policy", "args": {"query": "refund"}, "id": "call_2"},
+        ],
+    )
+
+    result = await node.ainvoke({"messages": [message]})
+
+    timeout, policy = result["messages"]
+    assert timeout.status == "error"
+    assert '"error": "timeout"' in timeout.content
+    assert '"tool": "search_flights"' in timeout.content
+    assert policy.content == "no refunds"
+
+
+@pytest.mark.asyncio
+async def test_sync_and_async_calls_share_slots():
+    executor = ToolExecutor(
+        max_concurrency=1, timeout=0.05, limits={"sync": ToolLimits(timeout=5)}
+    )
+    release = threading.Event()
+    holder = threading.Thread(target=lambda: executor.run("sync", release.wait, 1))
+    holder.start()
+    time.sleep(0.01)
+
+    async def quick():
+        return "ok"
+
+    with pytest.raises(ToolTimeoutError) as info:
+        await executor.arun("async", quick)
+    assert info.value.stage == "queued"
+
+    release.set()
+    holder.join()
+    await asyncio.sleep(0.01)
+    assert await executor.arun("async", quick) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_async_timeout_keeps_the_slot_until_the_thread_finishes(tmp_path):
+    pool = SQLitePool(str(tmp_path / "db.sqlite"), size=1)
+    executor = ToolExecutor(max_concurrency=1, timeout=0.05)
+    release = threading.Event()
+
+    async def stuck_query():
+        return await pool.run(release.wait, 1)
+
+    with pytest.raises(ToolTimeoutError) as info:
+        await executor.arun("stuck", stuck_query)
+    assert info.value.stage == "running"
+
+    # The query thread still runs, so the sync path finds no free slot either
+    with pytest.raises(ToolTimeoutError) as info:
+        await asyncio.to_thread(executor.run, "other", lambda: "ok")
+    assert info.value.stage == "queued"
+
+    release.set()
+    await asyncio.sleep(0.05)
+    assert await asyncio.to_thread(executor.run, "other", lambda: "ok") == "ok"
+    pool.close()
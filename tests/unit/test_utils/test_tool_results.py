@@ -0,0 +1,42 @@
+from app.utils.tool_results import ToolResultEncoder
+
+ROWS = [
+    {"id": 1, "name": "Hilton Basel", "location": "Basel", "checkin": None},
+    {"id": 2, "name": "Hyatt | Regency", "location": "Basel", "checkin": None},
+]
+
+
+def test_table_drops_null_and_hoists_constant_columns():
+    encoder = ToolResultEncoder()
+
+    encoded = encoder.encode(ROWS)
+
+    assert encoded.splitlines() == [
+        "location: Basel",
+        "id|name",
+        "1|Hilton Basel",
+        "2|Hyatt \\| Regency",
+    ]
+    assert encoder.stats.encoded_tokens < encoder.stats.raw_tokens
+    assert encoder.stats.savings > 0
+
+
+def test_page_metadata_and_size_budget():
+    rows = [{"id": i, "name": f"Hotel {i}"} for i in range(100)]
+    encoder = ToolResultEncoder(max_chars=200)
+
+    encoded = encoder.encode({"results": rows, "total": 100, "next_cursor": "abc"})
+
+    lines = encoded.splitlines()
+    assert lines[:3] == ["total: 100", "next_cursor: abc", "id|name"]
+    assert lines[-1].endswith("more rows omitted]")
+    assert len(encoded) <= 200 + len(lines[-1])
+    assert encoder.stats.truncated == 1
+
+
+def test_strings_and_empty_results():
+    encoder = ToolResultEncoder(max_chars=10)
+
+    assert encoder.encode("short") == "short"
+    assert encoder.encode("x" * 20) == "x" * 10 + "\n[truncated]"
+    assert encoder.encode([]) == "No results."